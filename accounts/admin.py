@@ -1,6 +1,11 @@
 from django.contrib import admin
+from django.http import StreamingHttpResponse
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
+
+from discovery_hub.db import EstimatedCountPaginator
+
+from . import exporter
 from .models import User
 
 @admin.register(User)
@@ -16,5 +21,24 @@ class UserAdmin(BaseUserAdmin):
         (None, {'classes': ('wide',), 'fields': ('email', 'password1', 'password2', 'user_type')}),
     )
     list_display = ('email', 'user_type', 'is_staff', 'is_active')
+    # Each is icontains, served by a trigram index on PostgreSQL (User.Meta.indexes).
     search_fields = ('email', 'first_name', 'last_name')
     ordering = ('email',)
+    # No COUNT(*) over the whole table: estimated for the unfiltered list,
+    # and no "N total" next to search results.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ['export_csv', 'export_jsonl']
+
+    def _export(self, queryset, format):
+        response = StreamingHttpResponse(exporter.export_lines(queryset, format), content_type=exporter.FORMATS[format])
+        response['Content-Disposition'] = f'attachment; filename="{exporter.filename(format)}"'
+        return response
+
+    @admin.action(description=_('Export selected users and TTO profiles (CSV)'))
+    def export_csv(self, request, queryset):
+        return self._export(queryset, 'csv')
+
+    @admin.action(description=_('Export selected users and TTO profiles (JSON Lines)'))
+    def export_jsonl(self, request, queryset):
+        return self._export(queryset, 'jsonl')
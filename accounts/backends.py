@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
+
+from . import hashing
+
+
+class ProfileModelBackend(ModelBackend):
+    """
+    ModelBackend that loads the session user together with their TTOProfile.
+
+    AuthenticationMiddleware resolves ``request.user`` through ``get_user``
+    once per request and caches it, so views and templates reading
+    ``request.user.ttoprofile`` get it from the same single query.
+
+    ``authenticate`` finds the user through ``User.objects.get_by_natural_key``,
+    a case-insensitive lookup on the lower(email) index; ``aauthenticate``
+    hashes in the pool from accounts.hashing instead of on the event loop.
+    Both raise PermissionDenied when the credentials are wrong, so the plain
+    ModelBackend listed after this one (kept for old sessions) doesn't look
+    the user up and hash the password a second time.
+    """
+
+    def _users(self):
+        return get_user_model()._default_manager.select_related('ttoprofile')
+
+    def get_user(self, user_id):
+        user = self._users().filter(pk=user_id).first()
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        user = await self._users().filter(pk=user_id).afirst()
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash once anyway so unknown emails take as long as wrong passwords.
+            UserModel().set_password(password)
+        else:
+            if user.check_password(password) and self.user_can_authenticate(user):
+                return user
+        raise PermissionDenied
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = await UserModel._default_manager.aget_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash once anyway so unknown emails take as long as wrong passwords.
+            await hashing.aset_password(UserModel(), password)
+        else:
+            if await hashing.acheck_password(user, password) and self.user_can_authenticate(user):
+                return user
+        raise PermissionDenied
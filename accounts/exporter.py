@@ -0,0 +1,94 @@
+"""
+Streaming export of users and their TTO profiles, as CSV or JSON Lines.
+
+Rows are read with ``.iterator(chunk_size=...)`` (a server-side cursor on
+PostgreSQL) and encoded one at a time, so memory use doesn't depend on how
+many rows there are. The columns are the ones accounts.importer reads, plus
+id, is_active and date_joined (which it ignores); password hashes are
+never exported.
+
+CSV exports get opened in spreadsheets, so text that would start a formula
+(= + - @) gets a leading apostrophe, which the importer drops again. Tags
+containing a comma are quoted within the tags cell.
+"""
+import csv
+import datetime
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .importer import FORMULA_PREFIXES
+from .models import User
+
+CHUNK_SIZE = 2000
+FORMATS = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson'}
+
+# (column, path from User)
+COLUMNS = (
+    ('id', 'id'),
+    ('email', 'email'),
+    ('first_name', 'first_name'),
+    ('last_name', 'last_name'),
+    ('user_type', 'user_type'),
+    ('is_active', 'is_active'),
+    ('date_joined', 'date_joined'),
+    ('institution_name', 'ttoprofile__institution_name'),
+    ('office_name', 'ttoprofile__office_name'),
+    ('country', 'ttoprofile__country'),
+    ('therapeutic_focus_tags', 'ttoprofile__therapeutic_focus_tags'),
+    ('trl_range_interest_min', 'ttoprofile__trl_range_interest_min'),
+    ('trl_range_interest_max', 'ttoprofile__trl_range_interest_max'),
+)
+HEADER = [column for column, _ in COLUMNS]
+
+
+class _Line:
+    """A csv.writer target that hands back each line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def records(queryset=None, chunk_size=CHUNK_SIZE):
+    """Yield one dict per user, in id order, profile columns empty for non-TTO users."""
+    queryset = User.objects.all() if queryset is None else queryset
+    rows = queryset.order_by('pk').values_list(*(path for _, path in COLUMNS))
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield dict(zip(HEADER, row))
+
+
+def _tag_list(tags):
+    return ', '.join(
+        '"{}"'.format(tag.replace('"', '""')) if ',' in tag or '"' in tag else tag for tag in tags
+    )
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        value = _tag_list(value)
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def export_lines(queryset=None, format='csv', chunk_size=CHUNK_SIZE):
+    """Yield the export as text lines, header first for CSV."""
+    if format == 'csv':
+        writer = csv.writer(_Line())
+        yield writer.writerow(HEADER)
+        for record in records(queryset, chunk_size):
+            yield writer.writerow([_csv_value(value) for value in record.values()])
+    elif format == 'jsonl':
+        for record in records(queryset, chunk_size):
+            yield json.dumps(record, cls=DjangoJSONEncoder) + '\n'
+    else:
+        raise ValueError(f'Unknown export format {format!r}')
+
+
+def filename(format):
+    return f'accounts-{timezone.now():%Y%m%d-%H%M%S}.{format}'
@@ -1,5 +1,10 @@
 from django import forms
-from django.contrib.auth.forms import UserCreationForm, AuthenticationForm, PasswordResetForm
+from django.contrib.auth import aauthenticate
+from django.core.exceptions import ValidationError
+from django.contrib.auth.forms import (
+    UserCreationForm, AuthenticationForm, PasswordResetForm, _unicode_ci_compare,
+)
+from . import hashing
 from .models import User
 
 class UserRegistrationForm(UserCreationForm):
@@ -9,6 +14,13 @@ class UserRegistrationForm(UserCreationForm):
         model = User
         fields = ('email', 'password1', 'password2', 'user_type')
 
+    async def asave(self):
+        """save() for async views; call after validating the form."""
+        user = self.instance
+        await hashing.aset_password(user, self.cleaned_data['password1'])
+        await user.asave()
+        return user
+
 class EmailAuthenticationForm(AuthenticationForm):
     # Field is still named "username" internally; label it clearly as Email.
     def __init__(self, *args, **kwargs):
@@ -16,11 +28,47 @@ class EmailAuthenticationForm(AuthenticationForm):
         self.fields['username'].label = 'Email'
         self.fields['username'].widget.attrs.update({'placeholder': 'you@example.com', 'autofocus': True})
         self.fields['password'].widget.attrs.update({'placeholder': 'password'})
+        self._defer_authentication = False
+
+    def clean(self):
+        if self._defer_authentication:
+            return self.cleaned_data
+        return super().clean()
+
+    async def ais_valid(self):
+        """
+        is_valid() for async views: the fields are validated as usual, then
+        the credentials are checked with aauthenticate(), which hashes off
+        the event loop.
+        """
+        self._defer_authentication = True
+        try:
+            if not self.is_valid():
+                return False
+        finally:
+            self._defer_authentication = False
+        self.user_cache = await aauthenticate(
+            self.request, username=self.cleaned_data['username'], password=self.cleaned_data['password'],
+        )
+        try:
+            if self.user_cache is None:
+                raise self.get_invalid_login_error()
+            self.confirm_login_allowed(self.user_cache)
+        except ValidationError as error:
+            self.add_error(None, error)
+        return self.is_valid()
 
 
 class CustomPasswordResetForm(PasswordResetForm):
     def clean_email(self):
         email = self.cleaned_data.get('email')
-        if not User.objects.filter(email__iexact=email, is_active=True).exists():
+        if not User.objects.with_email(email).filter(is_active=True).exists():
             raise forms.ValidationError("This email is not associated with any account.")
         return email
+
+    def get_users(self, email):
+        # Same as the parent, but through the lower(email) index rather than
+        # an UPPER() comparison that scans the table.
+        for user in User.objects.with_email(email).filter(is_active=True):
+            if user.has_usable_password() and _unicode_ci_compare(email, user.email):
+                yield user
@@ -0,0 +1,60 @@
+"""
+Password hashing off the request path.
+
+A PBKDF2 check costs tens of milliseconds of CPU. Run on the event loop it
+stalls every other connection the worker serves (open notification streams
+included); run through sync_to_async it queues behind, and holds up, all
+the ORM calls sharing that one thread. Instead it goes to a small pool of
+its own: hashlib releases the GIL while hashing, so up to
+PASSWORD_HASHING_WORKERS checks run in parallel and the rest wait their
+turn without taking more cores.
+
+``hash_passwords`` is the unit of work for the process pool in
+accounts.importer; this module imports no models, so it loads in a freshly
+spawned worker.
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASHING_WORKERS, thread_name_prefix='password-hashing',
+                )
+    return _executor
+
+
+async def run(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), functools.partial(func, *args))
+
+
+async def aset_password(user, raw_password):
+    await run(user.set_password, raw_password)
+
+
+async def acheck_password(user, raw_password):
+    """User.acheck_password(), without hashing on the event loop."""
+    is_correct, must_update = await run(verify_password, raw_password, user.password)
+    if is_correct and must_update:
+        await aset_password(user, raw_password)
+        # As in AbstractBaseUser: a hash upgrade isn't a password change.
+        user._password = None
+        await user.asave(update_fields=['password'])
+    return is_correct
+
+
+def hash_passwords(passwords):
+    """make_password() for each of ``passwords``; None gives an unusable one."""
+    return [make_password(password) for password in passwords]
@@ -0,0 +1,260 @@
+"""
+Bulk import of users and their TTO profiles (``manage.py import_accounts``).
+
+Rows are streamed from a CSV or JSON Lines file, so only one batch (and the
+set of emails seen so far) is held in memory however long the file is.
+Passwords are hashed on a process pool (PBKDF2 is the cost of creating a
+user) while the previous batch is being written; each batch is one bulk
+INSERT of users and one of profiles, in its own transaction, so an
+interrupted import keeps the batches already done and can simply be re-run:
+emails that already exist, in any case, are skipped. A row that can't be
+used (including a JSONL line that isn't a JSON object) is counted as
+invalid and the import goes on.
+
+Columns / keys: email (required), password (blank for an unusable one),
+first_name, last_name, user_type (default university), and for university
+users institution_name, office_name, country, therapeutic_focus_tags (a
+comma-separated string, with CSV-style quotes around a tag that contains a
+comma, or in JSONL a list), trl_range_interest_min and
+trl_range_interest_max. In CSV, an apostrophe in front of a value starting
+with = + - @ (how accounts.exporter keeps spreadsheets from running it as
+a formula) is dropped.
+
+bulk_create() skips model signals; run ``rebuild_recommendations`` after a
+large import.
+"""
+import csv
+import json
+import logging
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from .hashing import hash_passwords
+from .models import TTOProfile, User
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+PROFILE_FIELDS = ('institution_name', 'office_name', 'country')
+TRL_FIELDS = ('trl_range_interest_min', 'trl_range_interest_max')
+# Invalid rows are counted; this many are kept for the report.
+MAX_ERRORS = 20
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    profiles: int = 0
+    skipped: int = 0
+    invalid: int = 0
+    seconds: float = 0.0
+    errors: list = field(default_factory=list)
+
+    @property
+    def per_second(self):
+        return self.created / self.seconds if self.seconds else 0.0
+
+
+def peak_memory_kib():
+    """This process's peak resident set size, or None where unknown."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+# Spreadsheets run a cell starting with one of these as a formula.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith("'") and value[1:2] in FORMULA_PREFIXES:
+        return value[1:]
+    return value
+
+
+def read_rows(path, format=None):
+    """
+    Yield ``(line number, record)`` for each row of a .csv or .jsonl file.
+    JSONL records are the line's text, decoded by ``parse`` so that a bad
+    line is reported like any other invalid row.
+    """
+    format = format or ('csv' if path.endswith('.csv') else 'jsonl')
+    with open(path, newline='', encoding='utf-8') as f:
+        if format == 'csv':
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, {key: _csv_cell(value) for key, value in row.items()}
+        else:
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    yield line_number, line
+
+
+def _text(row, key):
+    value = row.get(key)
+    return '' if value is None else str(value).strip()
+
+
+def _trl(row, key):
+    value = _text(row, key)
+    if not value:
+        return None
+    level = int(value)
+    if not 1 <= level <= 9:
+        raise ValueError(f'{key} must be between 1 and 9')
+    return level
+
+
+def _tags(row):
+    tags = row.get('therapeutic_focus_tags') or []
+    if isinstance(tags, str):
+        tags = next(csv.reader([tags], skipinitialspace=True), [])
+    return [tag.strip() for tag in tags if tag and tag.strip()]
+
+
+def parse(row):
+    """
+    ``(User, TTOProfile or None, raw password or None)`` for one record;
+    raises ValueError or ValidationError when it's unusable.
+    """
+    if isinstance(row, str):
+        row = json.loads(row)  # JSONDecodeError is a ValueError
+    if not isinstance(row, dict):
+        raise ValueError(f'expected a JSON object, got {type(row).__name__}')
+    email = User.objects.normalize_email(_text(row, 'email'))
+    validate_email(email)
+    user_type = _text(row, 'user_type') or User.UserType.UNIVERSITY
+    if user_type not in User.UserType.values:
+        raise ValueError(f'unknown user_type {user_type!r}')
+    user = User(
+        username=email, email=email, user_type=user_type,
+        first_name=_text(row, 'first_name'), last_name=_text(row, 'last_name'),
+    )
+    profile = None
+    if user_type == User.UserType.UNIVERSITY:
+        profile = TTOProfile(
+            **{name: _text(row, name) for name in PROFILE_FIELDS},
+            **{name: _trl(row, name) for name in TRL_FIELDS},
+            therapeutic_focus_tags=_tags(row),
+        )
+        low, high = profile.trl_range_interest_min, profile.trl_range_interest_max
+        if low is not None and high is not None and low > high:
+            raise ValueError('trl_range_interest_min is above trl_range_interest_max')
+    return user, profile, _text(row, 'password') or None
+
+
+class Importer:
+    """
+    Feeds batches through the pool and the database. ``workers=0`` hashes in
+    this process (handy in tests and for tiny files).
+    """
+
+    def __init__(self, batch_size=BATCH_SIZE, workers=None):
+        self.batch_size = batch_size
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.result = ImportResult()
+        self._seen = set()
+
+    def _error(self, line, exc):
+        self.result.invalid += 1
+        message = exc.messages[0] if isinstance(exc, ValidationError) else str(exc)
+        if len(self.result.errors) < MAX_ERRORS:
+            self.result.errors.append(f'line {line}: {message}')
+
+    def _batches(self, rows):
+        """Valid, not yet seen records, ``batch_size`` at a time."""
+        batch = []
+        for line, row in rows:
+            try:
+                parsed = parse(row)
+            except (ValueError, ValidationError) as exc:
+                self._error(line, exc)
+                continue
+            key = parsed[0].email.lower()
+            if key in self._seen:
+                self.result.skipped += 1
+                continue
+            self._seen.add(key)
+            batch.append(parsed)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _submit(self, pool, batch):
+        """Start hashing ``batch``'s passwords; returns futures of hash lists."""
+        passwords = [password for _, _, password in batch]
+        if pool is None:
+            done = Future()
+            done.set_result(hash_passwords(passwords))
+            return [done]
+        # One task per worker keeps the pickling overhead per batch small.
+        size = -(-len(passwords) // self.workers)
+        return [pool.submit(hash_passwords, passwords[i:i + size]) for i in range(0, len(passwords), size)]
+
+    def _new(self, batch):
+        """Drop records whose email is already taken, before paying to hash them."""
+        existing = set(
+            User.objects.annotate(email_lower=Lower('email'))
+            .filter(email_lower__in=[user.email.lower() for user, _, _ in batch])
+            .values_list('email_lower', flat=True)
+        )
+        fresh = [record for record in batch if record[0].email.lower() not in existing]
+        self.result.skipped += len(batch) - len(fresh)
+        return fresh
+
+    def _insert(self, batch, hashing):
+        hashes = [encoded for future in hashing for encoded in future.result()]
+        users, profiles = [], []
+        for (user, profile, _), encoded in zip(batch, hashes):
+            user.password = encoded
+            users.append(user)
+            if profile is not None:
+                profiles.append((user, profile))
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            for user, profile in profiles:
+                profile.user_id = user.pk
+            TTOProfile.objects.bulk_create([profile for _, profile in profiles])
+        self.result.created += len(users)
+        self.result.profiles += len(profiles)
+
+    def run(self, rows):
+        start = time.perf_counter()
+        pool = ProcessPoolExecutor(self.workers) if self.workers else None
+        try:
+            pending = None
+            for batch in self._batches(rows):
+                batch = self._new(batch)
+                if not batch:
+                    continue
+                # Hash this batch while the previous one is written.
+                hashing = self._submit(pool, batch)
+                if pending is not None:
+                    self._insert(*pending)
+                    self._log_progress(start)
+                pending = (batch, hashing)
+            if pending is not None:
+                self._insert(*pending)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            self.result.seconds = time.perf_counter() - start
+        return self.result
+
+    def _log_progress(self, start):
+        elapsed = time.perf_counter() - start
+        logger.info('Import: %d accounts in %.1fs (%.0f/s)', self.result.created, elapsed, self.result.created / elapsed)
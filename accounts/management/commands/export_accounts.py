@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.exporter import CHUNK_SIZE, FORMATS, export_lines
+from accounts.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream every user, with their TTO profile, to a CSV or JSON Lines "
+        "file (stdout by default) in constant memory. The output can be fed "
+        "back to import_accounts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', '-o', default='-', help="File to write; '-' for stdout.")
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv')
+        parser.add_argument('--user-type', choices=User.UserType.values,
+                            help='Only export users of this type.')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                            help='Rows fetched per round trip.')
+
+    def handle(self, *args, **options):
+        queryset = User.objects.all()
+        if options['user_type']:
+            queryset = queryset.filter(user_type=options['user_type'])
+        lines = export_lines(queryset, options['format'], options['chunk_size'])
+        if options['output'] == '-':
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        start = time.perf_counter()
+        with open(options['output'], 'w', newline='', encoding='utf-8') as f:
+            f.writelines(lines)
+        self.stderr.write(self.style.SUCCESS(
+            f"Exported to {options['output']} in {time.perf_counter() - start:.2f}s"
+        ))
@@ -0,0 +1,41 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.importer import BATCH_SIZE, Importer, peak_memory_kib, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Create users and their TTO profiles from a CSV or JSON Lines file, "
+        "hashing passwords on a process pool and inserting in batches. "
+        "Emails that already exist are skipped, so an import can be re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='A .csv file with a header row, or a .jsonl file.')
+        parser.add_argument('--format', choices=['csv', 'jsonl'],
+                            help='File format; by default guessed from the extension.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help='Accounts per INSERT/commit.')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Hashing processes; 0 hashes in this process.')
+
+    def handle(self, *args, **options):
+        if not os.path.exists(options['path']):
+            raise CommandError(f"No such file: {options['path']}")
+        importer = Importer(batch_size=options['batch_size'], workers=options['workers'])
+        result = importer.run(read_rows(options['path'], options['format']))
+        for error in result.errors:
+            self.stderr.write(error)
+        summary = (
+            f'Created {result.created} accounts ({result.profiles} TTO profiles) in '
+            f'{result.seconds:.2f}s ({result.per_second:,.0f}/s); '
+            f'skipped {result.skipped} existing or repeated, {result.invalid} invalid'
+        )
+        peak = peak_memory_kib()
+        if peak is not None:
+            summary += f'; peak memory {peak / 1024:.1f} MiB'
+        self.stdout.write(self.style.SUCCESS(summary))
+        if result.profiles:
+            self.stdout.write('Run rebuild_recommendations to score the new profiles.')
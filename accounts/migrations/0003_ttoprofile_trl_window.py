@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:10
+
+import django.contrib.postgres.fields.ranges
+from django.db import migrations, models
+
+import discovery_hub.db
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_ttoprofile'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ttoprofile',
+            index=discovery_hub.db.PortableGistIndex(models.Func(models.F('trl_range_interest_min'), models.F('trl_range_interest_max'), models.Value('[]'), function='int4range', output_field=django.contrib.postgres.fields.ranges.IntegerRangeField()), name='accounts_tto_trl_window_gist'),
+        ),
+        migrations.AddConstraint(
+            model_name='ttoprofile',
+            constraint=models.CheckConstraint(condition=models.Q(('trl_range_interest_min__isnull', True), ('trl_range_interest_max__isnull', True), ('trl_range_interest_min__lte', models.F('trl_range_interest_max')), _connector='OR'), name='accounts_tto_trl_min_lte_max'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:48
+
+from django.contrib.postgres.indexes import OpClass
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations, models
+from django.db.models.functions import Cast, Upper
+
+import discovery_hub.db
+
+
+def trigram_index(field_name, name):
+    return discovery_hub.db.PostgresOnly(AddIndexConcurrently(
+        model_name='user',
+        index=discovery_hub.db.PortableGinIndex(
+            OpClass(Upper(Cast(field_name, models.TextField())), name='gin_trgm_ops'), name=name,
+        ),
+    ))
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run in a transaction; building these
+    # on a large user table mustn't block sign-ups and logins.
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0005_user_email_lower'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        trigram_index('email', 'accounts_user_email_trgm'),
+        trigram_index('first_name', 'accounts_user_first_name_trgm'),
+        trigram_index('last_name', 'accounts_user_last_name_trgm'),
+    ]
@@ -1,6 +1,33 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
+from django.contrib.postgres.fields import IntegerRangeField
 from django.db import models
-from django.contrib.postgres.fields import ArrayField
+from django.db.models import F, Func, Q, Value
+from django.db.models.functions import Lower
+from django.db.backends.postgresql.psycopg_any import NumericRange
+
+from discovery_hub.db import (
+    PortableArrayField, PortableGinIndex, PortableGistIndex, array_facet_counts, icontains_trigram_index,
+    is_postgres,
+)
+
+class UserQuerySet(models.QuerySet):
+    def with_email(self, email):
+        """
+        Case-insensitive email match written as LOWER(email) = lower(value),
+        which the unique functional index serves. (``email__iexact`` compiles
+        to UPPER(...) = UPPER(...) and can't use it.)
+        """
+        return self.alias(email_lower=Lower('email')).filter(email_lower=(email or '').lower())
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
+    def get_by_natural_key(self, username):
+        # ModelBackend.authenticate() resolves the login email through here.
+        return self.with_email(username).get()
+
+    async def aget_by_natural_key(self, username):
+        return await self.with_email(username).aget()
+
 
 class User(AbstractUser):
     class UserType(models.TextChoices):
@@ -8,6 +35,86 @@ class User(AbstractUser):
         COMPANY = 'company', 'Company'
         INVESTOR = 'investor', 'Investor'
 
+    user_type = models.CharField(max_length=20, choices=UserType.choices, default=UserType.UNIVERSITY)
+    email = models.EmailField(unique=True)
+    # Denormalized count for the nav badge; kept in step by pages.notifications.
+    unread_notifications = models.PositiveIntegerField(default=0, editable=False)
+
+    USERNAME_FIELD = 'email'
+    REQUIRED_FIELDS = ['username']  # keep username for admin compatibility
+
+    objects = UserManager()
+
+    class Meta(AbstractUser.Meta):
+        # Emails are unique regardless of case; lookups go through
+        # User.objects.with_email() so they can use this index.
+        constraints = [
+            models.UniqueConstraint(
+                Lower('email'),
+                name='accounts_user_email_lower_uniq',
+                violation_error_message='A user with that email already exists.',
+            ),
+        ]
+        # For the admin's search_fields (email, first and last name).
+        indexes = [
+            icontains_trigram_index('email', 'accounts_user_email_trgm'),
+            icontains_trigram_index('first_name', 'accounts_user_first_name_trgm'),
+            icontains_trigram_index('last_name', 'accounts_user_last_name_trgm'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self.username:
+            self.username = self.email
+        super().save(*args, **kwargs)
+
+    @property
+    def display_name(self):
+        full = f"{self.first_name} {self.last_name}".strip()
+        return full if full else self.email
+
+
+class TTOProfileQuerySet(models.QuerySet):
+    # Both filters compile to && / @> on PostgreSQL and use the GIN index on
+    # therapeutic_focus_tags; see PortableArrayField for the SQLite form.
+    def with_any_tags(self, tags):
+        return self.filter(therapeutic_focus_tags__overlap=list(tags))
+
+    def with_all_tags(self, tags):
+        return self.filter(therapeutic_focus_tags__contains=list(tags))
+
+    def tag_facets(self):
+        """[(tag, number of profiles), ...] for the profiles in this queryset."""
+        return array_facet_counts(self, 'therapeutic_focus_tags')
+
+    def with_trl(self, level):
+        """Profiles whose TRL window contains ``level``."""
+        return self.overlapping_trl(level, level)
+
+    def overlapping_trl(self, low, high):
+        """Profiles whose TRL window overlaps the closed range [low, high]."""
+        if is_postgres(self.db):
+            # Same expression as the GiST index, so this is an index scan.
+            return self.alias(trl_window=trl_window()).filter(
+                trl_window__overlap=NumericRange(low, high, '[]')
+            )
+        return self.filter(
+            Q(trl_range_interest_min__isnull=True) | Q(trl_range_interest_min__lte=high),
+            Q(trl_range_interest_max__isnull=True) | Q(trl_range_interest_max__gte=low),
+        )
+
+
+def trl_window():
+    """
+    The TRL interest window as int4range(min, max, '[]').
+
+    The two integer columns stay the source of truth; PostgreSQL indexes this
+    expression with GiST, so there is no second copy to keep in sync. A NULL
+    bound leaves that side of the window open.
+    """
+    return Func(
+        F('trl_range_interest_min'), F('trl_range_interest_max'), Value('[]'),
+        function='int4range', output_field=IntegerRangeField(),
+    )
 
 
 class TTOProfile(models.Model):
@@ -20,7 +127,7 @@ class TTOProfile(models.Model):
     institution_name = models.CharField(max_length=255, blank=True)
     office_name = models.CharField(max_length=255, blank=True)
     country = models.CharField(max_length=100, blank=True)
-    therapeutic_focus_tags = ArrayField(
+    therapeutic_focus_tags = PortableArrayField(
         models.CharField(max_length=100),
         blank=True,
         default=list,
@@ -35,21 +142,24 @@ class TTOProfile(models.Model):
         help_text="Maximum Technology Readiness Level (TRL) of interest (1-9)"
     )
 
-    def __str__(self):
-        return f"TTO Profile for {self.user.display_name}"
+    objects = TTOProfileQuerySet.as_manager()
 
-    user_type = models.CharField(max_length=20, choices=UserType.choices, default=UserType.UNIVERSITY)
-    email = models.EmailField(unique=True)
+    class Meta:
+        indexes = [
+            PortableGinIndex(fields=['therapeutic_focus_tags'], name='accounts_tto_focus_tags_gin'),
+            PortableGistIndex(trl_window(), name='accounts_tto_trl_window_gist'),
+        ]
+        constraints = [
+            # int4range() rejects lower > upper, so the window index needs this.
+            models.CheckConstraint(
+                condition=(
+                    Q(trl_range_interest_min__isnull=True)
+                    | Q(trl_range_interest_max__isnull=True)
+                    | Q(trl_range_interest_min__lte=F('trl_range_interest_max'))
+                ),
+                name='accounts_tto_trl_min_lte_max',
+            ),
+        ]
 
-    USERNAME_FIELD = 'email'
-    REQUIRED_FIELDS = ['username']  # keep username for admin compatibility
-
-    def save(self, *args, **kwargs):
-        if not self.username:
-            self.username = self.email
-        super().save(*args, **kwargs)
-
-    @property
-    def display_name(self):
-        full = f"{self.first_name} {self.last_name}".strip()
-        return full if full else self.email
+    def __str__(self):
+        return f"TTO Profile for {self.user.display_name}"
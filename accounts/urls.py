@@ -1,12 +1,18 @@
+from django.conf import settings
 from django.urls import path
 from django.contrib.auth import views as auth_views
 from django.contrib.auth.views import LogoutView
-from .views import RegisterView, CustomLoginView
+from .views import RegisterView, CustomLoginView, async_login, async_register
 from .forms import CustomPasswordResetForm
 
+if settings.ASYNC_AUTH_VIEWS:
+    login_view, register_view = async_login, async_register
+else:
+    login_view, register_view = CustomLoginView.as_view(), RegisterView.as_view()
+
 urlpatterns = [
-    path('login/', CustomLoginView.as_view(), name='login'),
-    path('register/', RegisterView.as_view(), name='register'),
+    path('login/', login_view, name='login'),
+    path('register/', register_view, name='register'),
     path('logout/', LogoutView.as_view(), name='logout'),
 
     path('password_reset/',
@@ -1,10 +1,18 @@
-from django.contrib.auth import login as auth_login
+from asgiref.sync import sync_to_async
+from django.contrib.auth import alogin, login as auth_login
 from django.contrib.auth.views import LoginView
+from django.shortcuts import redirect, render
 from django.urls import reverse_lazy
+from django.views.decorators.cache import never_cache
+from django.views.decorators.debug import sensitive_post_parameters
 from django.views.generic import FormView
 from .forms import UserRegistrationForm, EmailAuthenticationForm
 from accounts.models import User
 
+# A new user wasn't authenticated by any backend; with several configured,
+# login() must be told which one to record in the session.
+REGISTRATION_BACKEND = 'accounts.backends.ProfileModelBackend'
+
 class RegisterView(FormView):
     template_name = 'accounts/register.html'
     form_class = UserRegistrationForm
@@ -12,7 +20,7 @@ class RegisterView(FormView):
 
     def form_valid(self, form):
         user = form.save()
-        auth_login(self.request, user)
+        auth_login(self.request, user, backend=REGISTRATION_BACKEND)
         return super().form_valid(form)
 
     def get_initial(self):
@@ -35,7 +43,49 @@ class CustomLoginView(LoginView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         user_type = self.request.GET.get('type')
-        if user_type:
+        # Assigning marks the session modified, which costs a save; skip it
+        # when the value is already there.
+        if user_type and self.request.session.get('selected_user_type') != user_type:
             self.request.session['selected_user_type'] = user_type
         context['selected_user_type'] = user_type
         return context
+
+
+# Async equivalents of the two views above, for ASGI deployments (see
+# settings.ASYNC_AUTH_VIEWS). Password hashing runs in the pool from
+# accounts.hashing rather than on the event loop.
+
+async def _render(request, template_name, context):
+    # Rendering reads request.user (base.html), which may query.
+    return await sync_to_async(render)(request, template_name, context)
+
+
+@sensitive_post_parameters()
+@never_cache
+async def async_login(request):
+    if request.method == 'POST':
+        form = EmailAuthenticationForm(request, data=request.POST)
+        if await form.ais_valid():
+            user = form.get_user()
+            await alogin(request, user)
+            return redirect('company_home' if user.user_type == User.UserType.COMPANY else 'screen1')
+    else:
+        form = EmailAuthenticationForm(request)
+    user_type = request.GET.get('type')
+    if user_type and await request.session.aget('selected_user_type') != user_type:
+        await request.session.aset('selected_user_type', user_type)
+    return await _render(request, CustomLoginView.template_name, {'form': form, 'selected_user_type': user_type})
+
+
+@sensitive_post_parameters()
+async def async_register(request):
+    if request.method == 'POST':
+        form = UserRegistrationForm(request.POST)
+        if await sync_to_async(form.is_valid)():
+            user = await form.asave()
+            await alogin(request, user, backend=REGISTRATION_BACKEND)
+            return redirect(RegisterView.success_url)
+    else:
+        user_type = request.GET.get('type') or await request.session.aget('selected_user_type')
+        form = UserRegistrationForm(initial={'user_type': user_type} if user_type else None)
+    return await _render(request, RegisterView.template_name, {'form': form})
@@ -0,0 +1,134 @@
+"""
+Concurrent logins under ASGI: the sync views against the async ones.
+
+    python -m benchmarks.bench_async_login --logins 200 --concurrency 20
+
+Drives Django's ASGIHandler directly (no server) with ``--concurrency``
+logins in flight at a time, first through CustomLoginView and then through
+async_login, and reports logins/s and per-login latency. A probe coroutine
+sleeping 5 ms at a time measures how late the event loop wakes it, i.e.
+how long something held the loop: that is what every other connection on
+the worker (notification streams included) would wait.
+
+The rows it creates are committed (requests run on other threads) and
+deleted at the end.
+"""
+import argparse
+import asyncio
+import time
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+
+from benchmarks.common import percentile, report, setup
+
+EMAIL = 'bench-login@example.com'
+PASSWORD = 'bench-password'
+PROBE_INTERVAL = 0.005
+
+urlpatterns = []
+
+
+async def request(app, method, path, body=b'', headers=()):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': method, 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'query_string': b'', 'root_path': '', 'client': ('127.0.0.1', 0), 'server': ('localhost', 80),
+        'headers': [(b'host', b'localhost'), *headers],
+    }
+    pending = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    disconnected = asyncio.get_running_loop().create_future()
+
+    async def receive():
+        # After the body the handler waits for a disconnect that never comes.
+        return pending.pop() if pending else await disconnected
+
+    response = {}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+            response['headers'] = message['headers']
+
+    await app(scope, receive, send)
+    return response
+
+
+async def csrf_headers(app):
+    response = await request(app, 'GET', '/accounts/login/')
+    cookie = SimpleCookie()
+    for name, value in response['headers']:
+        if name.lower() == b'set-cookie':
+            cookie.load(value.decode())
+    token = cookie['csrftoken'].value
+    return [
+        (b'cookie', f'csrftoken={token}'.encode()),
+        (b'x-csrftoken', token.encode()),
+        (b'content-type', b'application/x-www-form-urlencoded'),
+    ]
+
+
+async def probe(lags, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append((time.perf_counter() - start - PROBE_INTERVAL) * 1000)
+
+
+async def run(app, path, logins, concurrency):
+    headers = await csrf_headers(app)
+    body = urlencode({'username': EMAIL, 'password': PASSWORD}).encode()
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def login():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await request(app, 'POST', path, body, headers)
+            samples.append((time.perf_counter() - start) * 1000)
+            assert response['status'] == 302, response['status']
+
+    lags = []
+    stop = asyncio.Event()
+    prober = asyncio.ensure_future(probe(lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await prober
+    return samples, logins / elapsed, lags
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=20)
+    args = parser.parse_args()
+
+    setup(threaded=True)
+    from django.conf import settings
+    from django.core.handlers.asgi import ASGIHandler
+    from django.urls import include, path
+    from accounts.models import User
+    from accounts.views import CustomLoginView, async_login
+
+    urlpatterns[:] = [
+        path('bench/sync/', CustomLoginView.as_view()),
+        path('bench/async/', async_login),
+        path('', include('discovery_hub.urls')),
+    ]
+    settings.ROOT_URLCONF = __name__
+    User.objects.create_user(username=EMAIL, email=EMAIL, password=PASSWORD, user_type=User.UserType.COMPANY)
+    app = ASGIHandler()
+    print(f'{args.logins} logins, {args.concurrency} concurrent, '
+          f'{settings.PASSWORD_HASHING_WORKERS} hashing threads')
+    try:
+        for label, url in (('sync CustomLoginView', '/bench/sync/'), ('async_login', '/bench/async/')):
+            samples, rate, lags = asyncio.run(run(app, url, args.logins, args.concurrency))
+            report(f'{label} ({rate:.0f} logins/s)', samples)
+            print(f'{"":<40} loop lag p99={percentile(lags, 99):8.3f}ms max={max(lags):8.3f}ms')
+    finally:
+        User.objects.filter(email=EMAIL).delete()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Company trigram search latency.
+
+    python -m benchmarks.bench_company_search --rows 500000
+
+Target: p99 under 20 ms at 500k companies on PostgreSQL.
+"""
+import argparse
+import random
+
+from benchmarks.common import report, scratch_data, setup, timed
+
+WORDS = [
+    'bio', 'gen', 'quantum', 'neuro', 'cardio', 'thera', 'medi', 'green', 'solar', 'nano',
+    'cell', 'onco', 'immuno', 'data', 'robo', 'vision', 'pharma', 'health', 'logic', 'micro',
+]
+FOCUS = ['AI', 'Patents', 'Biotechnology', 'Oncology', 'Renewable Energy', 'Research', 'Medical Devices']
+QUERIES = ['quantumleap', 'biohelth', 'oncology', 'neurogen', 'pharma', 'renewable', 'robovison']
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+    from django.db import connection
+    from pages.models import Company
+    from pages.search import company_search_text
+
+    rng = random.Random(340)
+    with scratch_data():
+        batch = []
+        for i in range(args.rows):
+            name = f'{rng.choice(WORDS).title()}{rng.choice(WORDS)} {rng.choice(["Inc.", "Corp.", "Labs"])} {i}'
+            focus = rng.sample(FOCUS, 2)
+            batch.append(Company(name=name, focus=focus, search_text=company_search_text(name, focus)))
+            if len(batch) == 5000:
+                Company.objects.bulk_create(batch)
+                batch = []
+        Company.objects.bulk_create(batch)
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE pages_company')
+
+        for query in QUERIES:
+            samples = timed(lambda: list(Company.objects.search(query)[:60]), args.repeat)
+            report(f'search {query!r} ({args.rows} rows)', samples)
+
+
+if __name__ == '__main__':
+    main()
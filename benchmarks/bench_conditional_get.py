@@ -0,0 +1,53 @@
+"""
+Bytes and latency of repeat visits, full 200 vs. 304 revalidation.
+
+    python -m benchmarks.bench_conditional_get
+
+Drives the dashboard and profile views through the test client (no network)
+for one user of each role, first without and then with If-None-Match.
+"""
+import argparse
+
+from benchmarks.common import report, scratch_data, setup, timed
+
+PAGES = {
+    'company': ['screen1', 'screen2', 'screen3', 'company_home', 'company_profile'],
+    'university': ['screen2', 'screen3', 'university_home', 'university_profile'],
+    'investor': ['screen1', 'screen2', 'screen3', 'investor_profile'],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+    from accounts.models import User
+
+    setup_test_environment()
+    with scratch_data():
+        for user_type, names in PAGES.items():
+            User.objects.create_user(
+                username=f'bench-{user_type}', email=f'bench-{user_type}@example.com',
+                password='bench-password', user_type=user_type,
+            )
+            client = Client()
+            client.login(email=f'bench-{user_type}@example.com', password='bench-password')
+            client.get(reverse('screen2'))  # sets the CSRF cookie
+            for name in names:
+                url = reverse(name)
+                full = client.get(url)
+                etag = full['ETag']
+                revalidated = client.get(url, HTTP_IF_NONE_MATCH=etag)
+                assert revalidated.status_code == 304, (name, revalidated.status_code)
+                print(f'{name:<20} 200: {len(full.content):>7} bytes   304: {len(revalidated.content)} bytes')
+                report(f'  {name} 200', timed(lambda: client.get(url), args.repeat))
+                report(f'  {name} 304', timed(lambda: client.get(url, HTTP_IF_NONE_MATCH=etag), args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Memory and throughput of the streaming account export.
+
+    python -m benchmarks.bench_export --sizes 1000 50000
+
+For each size, inserts that many users (half with TTO profiles), runs
+accounts.exporter.export_lines over them as CSV and JSONL, and reports
+rows/s and the peak memory traced while exporting, which should not grow
+with the row count.
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.common import scratch_data, setup
+
+
+def populate(count):
+    from accounts.models import TTOProfile, User
+
+    users = User.objects.bulk_create([
+        User(
+            username=f'export{i}@example.com', email=f'export{i}@example.com', password='!',
+            user_type=User.UserType.UNIVERSITY if i % 2 else User.UserType.COMPANY,
+        )
+        for i in range(count)
+    ], batch_size=5000)
+    TTOProfile.objects.bulk_create([
+        TTOProfile(user=user, institution_name='Bench University', therapeutic_focus_tags=['Oncology', 'Neurology'])
+        for user in users if user.user_type == User.UserType.UNIVERSITY
+    ], batch_size=5000)
+
+
+def measure(format):
+    from accounts.exporter import export_lines
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = sum(len(line) for line in export_lines(format=format))
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 50_000])
+    args = parser.parse_args()
+
+    setup()
+    for count in args.sizes:
+        with scratch_data():
+            populate(count)
+            for format in ('csv', 'jsonl'):
+                elapsed, peak, size = measure(format)
+                print(f'{count:>8} rows {format:<5} {count / elapsed:10,.0f} rows/s '
+                      f'output {size / 2**20:7.1f} MiB  peak traced {peak / 2**20:6.2f} MiB')
+
+
+if __name__ == '__main__':
+    main()
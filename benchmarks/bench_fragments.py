@@ -0,0 +1,34 @@
+"""
+Render time of the s1/s2/s3 role partials, uncached vs. fragment cache.
+
+    python -m benchmarks.bench_fragments
+
+"before" renders the partial template every time, as the plain
+``{% include %}`` did; "after" goes through pages.fragments with a warm
+cache (the default in-process cache unless CACHES says otherwise).
+"""
+import argparse
+
+from benchmarks.common import report, setup, timed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup()
+    from django.template.loader import render_to_string
+    from pages.fragments import PARTIAL_TEMPLATE, invalidate_fragments, render_role_partial
+
+    invalidate_fragments()
+    for screen in ('s1', 's2', 's3'):
+        for role in ('university', 'company', 'investor'):
+            name = PARTIAL_TEMPLATE.format(screen=screen, role=role)
+            report(f'{screen}_{role} before', timed(lambda: render_to_string(name), args.repeat))
+            render_role_partial(screen, role)
+            report(f'{screen}_{role} after', timed(lambda: render_role_partial(screen, role), args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Batch matchmaking throughput: vectorized top-k vs a per-pair Python loop.
+
+    python -m benchmarks.bench_matching --profiles 100000 --projects 100000
+
+The data is synthetic and never touches the database. The per-pair loop is
+timed on a small sample and extrapolated, since running it at full scale
+would take hours.
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import setup
+
+TAGS = [f'Area {i}' for i in range(120)]
+COUNTRIES = ['USA', 'UK', 'Germany', 'France', 'Japan', 'Canada', 'India', '']
+
+
+def synthetic_rows(profiles, projects, seed=340):
+    rng = random.Random(seed)
+    profile_rows = []
+    for i in range(profiles):
+        low = rng.choice([None, *range(1, 8)])
+        high = rng.choice([None, *range(low or 1, 10)])
+        profile_rows.append((i, rng.sample(TAGS, rng.randint(1, 5)), low, high, rng.choice(COUNTRIES)))
+    project_rows = [
+        (j, rng.choice(TAGS), rng.choice([None, *range(1, 10)]), rng.choice(COUNTRIES))
+        for j in range(projects)
+    ]
+    return profile_rows, project_rows
+
+
+def python_loop_top_k(profile_rows, project_rows, k, weights):
+    results = []
+    for _, tags, low, high, country in profile_rows:
+        tags = {t.casefold() for t in tags}
+        scored = []
+        for j, (_, field, trl, project_country) in enumerate(project_rows):
+            score = weights['tags'] * (field.casefold() in tags)
+            if trl is not None and (low is None or low <= trl) and (high is None or trl <= high):
+                score += weights['trl']
+            if country and country == project_country:
+                score += weights['country']
+            scored.append((score, j))
+        scored.sort(reverse=True)
+        results.append(scored[:k])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--profiles', type=int, default=100_000)
+    parser.add_argument('--projects', type=int, default=100_000)
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--loop-sample', type=int, default=50, help='profiles to time with the Python loop')
+    args = parser.parse_args()
+
+    setup()
+    from pages.matching import DEFAULT_WEIGHTS, encode, top_k
+
+    profile_rows, project_rows = synthetic_rows(args.profiles, args.projects)
+
+    start = time.perf_counter()
+    profiles, projects = encode(profile_rows, project_rows)
+    encode_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    top_k(profiles, projects, k=args.k)
+    vector_s = time.perf_counter() - start
+
+    sample = profile_rows[:args.loop_sample]
+    start = time.perf_counter()
+    python_loop_top_k(sample, project_rows, args.k, DEFAULT_WEIGHTS)
+    loop_s = (time.perf_counter() - start) / len(sample) * len(profile_rows)
+
+    pairs = len(profile_rows) * len(project_rows)
+    print(f'{len(profile_rows)} profiles x {len(project_rows)} projects = {pairs:,} pairs, k={args.k}')
+    print(f'encode:                   {encode_s:10.2f}s')
+    print(f'vectorized top-k:         {vector_s:10.2f}s  ({pairs / vector_s / 1e6:,.1f}M pairs/s)')
+    print(f'python loop (estimated):  {loop_s:10.2f}s  ({pairs / loop_s / 1e6:,.1f}M pairs/s)')
+    print(f'speedup:                  {loop_s / vector_s:10.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Queries per request under each session mode.
+
+    python -m benchmarks.bench_session_queries
+
+Logs a user of each role in through the test client and counts the
+queries (and how many hit django_session) for a repeat visit to each
+page, once per SESSION_ENGINE in settings.SESSION_ENGINES.
+"""
+from benchmarks.common import scratch_data, setup
+
+PAGES = {
+    'company': ['screen1', 'screen2', 'company_home', 'company_profile'],
+    'university': ['screen2', 'university_home', 'university_profile'],
+    'investor': ['screen1', 'investor_profile'],
+}
+
+
+def main():
+    setup()
+    from django.conf import settings
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext, override_settings, setup_test_environment
+    from django.urls import reverse
+    from accounts.models import User
+
+    setup_test_environment()
+    with scratch_data():
+        for user_type in PAGES:
+            User.objects.create_user(
+                username=f'bench-{user_type}', email=f'bench-{user_type}@example.com',
+                password='bench-password', user_type=user_type,
+            )
+        for mode, engine in settings.SESSION_ENGINES.items():
+            print(f'SESSION_MODE={mode}')
+            with override_settings(SESSION_ENGINE=engine):
+                for user_type, names in PAGES.items():
+                    client = Client()
+                    client.login(email=f'bench-{user_type}@example.com', password='bench-password')
+                    for name in names:
+                        client.get(reverse(name))
+                        with CaptureQueriesContext(connection) as captured:
+                            client.get(reverse(name))
+                        session = sum('django_session' in q['sql'] for q in captured.captured_queries)
+                        print(f'  {name:<20} queries={len(captured):<3} session={session}')
+
+
+if __name__ == '__main__':
+    main()
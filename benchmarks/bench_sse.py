@@ -0,0 +1,131 @@
+"""
+Idle notification streams per worker.
+
+    python -m benchmarks.bench_sse --streams 10000
+
+Opens ``--streams`` event streams through discovery_hub.asgi.application,
+one logged-in user each, exactly as a browser's EventSource would, then
+publishes one notification to every user and times delivery. Reports memory
+per idle stream and the thread count, which must stay flat as streams open:
+Django's handler would hold a thread (and a database connection) per stream.
+"""
+import argparse
+import asyncio
+import threading
+import time
+import tracemalloc
+from datetime import timedelta
+
+from benchmarks.common import setup
+
+PREFIX = 'bench-sse-'
+
+
+def create_sessions(count):
+    from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+    from django.contrib.sessions.backends.db import SessionStore
+    from django.contrib.sessions.models import Session
+    from django.utils import timezone
+    from accounts.models import User
+
+    users = User.objects.bulk_create(
+        User(username=f'{PREFIX}{n}', email=f'{PREFIX}{n}@example.com', password='!')
+        for n in range(count)
+    )
+    expires = timezone.now() + timedelta(hours=1)
+    sessions = [
+        Session(
+            session_key=f'{PREFIX}{user.pk}',
+            session_data=SessionStore().encode({
+                SESSION_KEY: str(user.pk),
+                BACKEND_SESSION_KEY: 'django.contrib.auth.backends.ModelBackend',
+                HASH_SESSION_KEY: user.get_session_auth_hash(),
+            }),
+            expire_date=expires,
+        )
+        for user in users
+    ]
+    Session.objects.bulk_create(sessions)
+    return {user.pk: session.session_key for user, session in zip(users, sessions)}
+
+
+def delete_sessions():
+    from django.contrib.sessions.models import Session
+    from accounts.models import User
+
+    Session.objects.filter(session_key__startswith=PREFIX).delete()
+    User.objects.filter(username__startswith=PREFIX).delete()
+
+
+def open_stream(app, session_key):
+    from django.conf import settings
+
+    path = '/notifications/stream/'
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'query_string': b'', 'root_path': '', 'client': ('127.0.0.1', 0), 'server': ('localhost', 80),
+        'headers': [
+            (b'host', b'localhost'),
+            (b'cookie', f'{settings.SESSION_COOKIE_NAME}={session_key}'.encode()),
+        ],
+    }
+    incoming, sent = asyncio.Queue(), asyncio.Queue()
+    incoming.put_nowait({'type': 'http.request', 'body': b'', 'more_body': False})
+    task = asyncio.ensure_future(app(scope, incoming.get, sent.put))
+    return task, incoming, sent
+
+
+async def run(app, sessions):
+    from pages.broker import get_broker
+
+    broker = get_broker()
+    count = len(sessions)
+    threads_before = threading.active_count()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+
+    streams = {user_id: open_stream(app, key) for user_id, key in sessions.items()}
+    for _, _, sent in streams.values():
+        start = await sent.get()
+        assert start['status'] == 200, start
+        await sent.get()  # the retry: line
+    while broker.subscriber_count() < count:
+        await asyncio.sleep(0.01)
+
+    per_stream = (tracemalloc.get_traced_memory()[0] - base) / count
+    tracemalloc.stop()
+    print(f'{count} idle streams: {per_stream / 1024:.1f} KiB each, '
+          f'threads {threads_before} -> {threading.active_count()}')
+
+    start = time.perf_counter()
+    for user_id in streams:
+        broker.publish(user_id, {'id': user_id, 'message': 'hello', 'url': '', 'created_at': ''})
+    await asyncio.gather(*(sent.get() for _, _, sent in streams.values()))
+    elapsed = time.perf_counter() - start
+    print(f'fan-out to {count} streams: {elapsed * 1000:.1f} ms ({count / elapsed:,.0f} events/s)')
+
+    for task, incoming, _ in streams.values():
+        incoming.put_nowait({'type': 'http.disconnect'})
+    await asyncio.gather(*(task for task, _, _ in streams.values()))
+    print(f'after disconnect: {broker.subscriber_count()} subscribers, {threading.active_count()} threads')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--streams', type=int, default=10_000)
+    args = parser.parse_args()
+
+    # Sessions are read on executor threads, so they must be committed.
+    setup(threaded=True)
+    from discovery_hub.asgi import application
+
+    sessions = create_sessions(args.streams)
+    try:
+        asyncio.run(run(application, sessions))
+    finally:
+        delete_sessions()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Typeahead lookup latency and throughput.
+
+    python -m benchmarks.bench_typeahead --rows 500000
+
+Builds the prefix index from synthetic companies and projects (no database)
+and times lookups for prefixes of 1-6 characters.
+
+Target: p99 under 2 ms per lookup.
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import report, setup, timed
+
+WORDS = [
+    'bio', 'gen', 'quantum', 'neuro', 'cardio', 'thera', 'medi', 'green', 'solar', 'nano',
+    'cell', 'onco', 'immuno', 'data', 'robo', 'vision', 'pharma', 'health', 'logic', 'micro',
+]
+TAGS = ['AI', 'Patents', 'Biotechnology', 'Oncology', 'Renewable Energy', 'Research', 'Medical Devices']
+PREFIXES = ['b', 'ge', 'qua', 'neur', 'onco', 'health', 'robovision c', 'zzz']
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup()
+    from pages.typeahead import COMPANY, PROJECT, TAG, PrefixIndex
+
+    rng = random.Random(340)
+    entries = []
+    for i in range(args.rows):
+        name = f'{rng.choice(WORDS).title()}{rng.choice(WORDS)} {rng.choice(["Inc.", "Corp.", "Labs"])} {i}'
+        entries.append((COMPANY if i % 2 else PROJECT, i, name))
+    entries += [(TAG, tag, tag) for tag in TAGS]
+
+    index = PrefixIndex()
+    start = time.perf_counter()
+    index.load(entries)
+    print(f'built index over {len(index)} labels in {time.perf_counter() - start:.2f}s')
+
+    for prefix in PREFIXES:
+        report(f'suggest {prefix!r}', timed(lambda: index.suggest(prefix), args.repeat))
+
+    queries = [rng.choice(PREFIXES) for _ in range(args.repeat * 10)]
+    start = time.perf_counter()
+    for query in queries:
+        index.suggest(query)
+    elapsed = time.perf_counter() - start
+    print(f'throughput: {len(queries) / elapsed:,.0f} lookups/s (one thread)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Shared setup for the benchmark scripts.
+
+Run a benchmark from the project root, e.g. ``python -m benchmarks.bench_company_search``.
+Benchmarks use the database from settings (Postgres via .env); set
+DJANGO_ENV=test to run against an in-memory SQLite database instead (a
+temporary file for benchmarks that query from several threads). Rows a
+benchmark creates are written inside ``scratch_data()`` and rolled back.
+"""
+import contextlib
+import os
+import statistics
+import tempfile
+import time
+
+import django
+
+
+def setup(threaded=False):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'discovery_hub.settings')
+    django.setup()
+    from django.conf import settings
+    from django.core.management import call_command
+    if settings.DATABASES['default']['NAME'] == ':memory:':
+        if threaded:
+            # Each thread's connection would get its own in-memory database.
+            settings.DATABASES['default']['NAME'] = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+        call_command('migrate', verbosity=0)
+
+
+@contextlib.contextmanager
+def scratch_data():
+    from django.db import transaction
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label, samples_ms):
+    print(
+        f'{label:<40} n={len(samples_ms):<6} '
+        f'mean={statistics.mean(samples_ms):8.3f}ms '
+        f'p50={percentile(samples_ms, 50):8.3f}ms '
+        f'p99={percentile(samples_ms, 99):8.3f}ms'
+    )
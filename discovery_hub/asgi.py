@@ -3,6 +3,11 @@ ASGI config for discovery_hub project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve it with an ASGI server (e.g. ``uvicorn discovery_hub.asgi:application``)
+for the live notification stream. /notifications/stream/ is answered by
+pages.sse ahead of Django's handler, so an idle stream holds neither a
+thread nor a database connection.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -13,4 +18,13 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'discovery_hub.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from pages.sse import NotificationStreamRouter  # noqa: E402
+from pages.typeahead import typeahead  # noqa: E402
+
+application = NotificationStreamRouter(django_application)
+
+# Build the search typeahead index now rather than on the first request.
+
+typeahead.warm_up()
@@ -0,0 +1,242 @@
+"""
+Database helpers shared by the apps.
+
+Production runs on PostgreSQL, but the test settings swap in an in-memory
+SQLite database. GIN/GiST indexes use the ``Portable*Index`` classes, other
+Postgres-only DDL (triggers, raw SQL) goes through ``PostgresOnly`` in
+migrations, and array columns use ``PortableArrayField``, so the same models
+and migration files apply cleanly to both.
+
+``icontains_trigram_index`` and ``EstimatedCountPaginator`` keep admin
+changelists over large tables fast.
+"""
+import json
+
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.fields.array import ArrayContains, ArrayOverlap
+from django.contrib.postgres.indexes import GinIndex, GistIndex, OpClass
+from django.core.paginator import Paginator
+from django.db import NotSupportedError, connections, models, router
+from django.db.backends.ddl_references import Statement
+from django.db.migrations.operations.base import Operation
+from django.db.models.functions import Cast, Upper
+from django.utils.functional import cached_property
+
+
+def is_postgres(using='default'):
+    return connections[using].vendor == 'postgresql'
+
+
+class PostgresOnlyIndexMixin:
+    """
+    Index that only exists on PostgreSQL; other backends get an empty statement.
+
+    Wrapping AddIndex in a migration is not enough: SQLite rebuilds the whole
+    table for many schema changes and recreates every index in Meta.indexes.
+    """
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return Statement('')
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+    def remove_sql(self, model, schema_editor, **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return Statement('')
+        return super().remove_sql(model, schema_editor, **kwargs)
+
+
+class PortableGinIndex(PostgresOnlyIndexMixin, GinIndex):
+    pass
+
+
+class PortableGistIndex(PostgresOnlyIndexMixin, GistIndex):
+    pass
+
+
+def icontains_trigram_index(field_name, name):
+    """
+    A trigram GIN index that ``<field>__icontains`` (and so an admin
+    ``search_fields`` entry) can use on PostgreSQL. Django compiles that
+    lookup to ``UPPER("field"::text) LIKE UPPER('%q%')``; this indexes the
+    same expression. Needs the pg_trgm extension.
+    """
+    return PortableGinIndex(
+        OpClass(Upper(Cast(field_name, models.TextField())), name='gin_trgm_ops'), name=name,
+    )
+
+
+class PostgresOnly(Operation):
+    """
+    Wrap a migration operation so its SQL only runs on PostgreSQL.
+
+    The project state is always updated, so makemigrations sees no difference.
+    """
+    reduces_to_sql = False
+
+    def __init__(self, operation):
+        self.operation = operation
+
+    @property
+    def reversible(self):
+        return self.operation.reversible
+
+    def deconstruct(self):
+        return self.__class__.__qualname__, [self.operation], {}
+
+    def state_forwards(self, app_label, state):
+        self.operation.state_forwards(app_label, state)
+
+    def _applies(self, app_label, schema_editor):
+        return (
+            schema_editor.connection.vendor == 'postgresql'
+            and router.allow_migrate(schema_editor.connection.alias, app_label)
+        )
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if self._applies(app_label, schema_editor):
+            self.operation.database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if self._applies(app_label, schema_editor):
+            self.operation.database_backwards(app_label, schema_editor, from_state, to_state)
+
+    def describe(self):
+        return '%s (PostgreSQL only)' % self.operation.describe()
+
+    @property
+    def migration_name_fragment(self):
+        return self.operation.migration_name_fragment
+
+
+class PortableArrayField(ArrayField):
+    """
+    An ArrayField that is a native array on PostgreSQL and a JSON-encoded text
+    column everywhere else.
+
+    The ``overlap`` (``&&``) and ``contains`` (``@>``) lookups keep working
+    off PostgreSQL through SQLite's ``json_each``:
+
+        tags && %s  ->  EXISTS (SELECT 1 FROM json_each(tags)
+                                WHERE value IN (SELECT value FROM json_each(%s)))
+        tags @> %s  ->  NOT EXISTS (SELECT 1 FROM json_each(%s)
+                                    WHERE value NOT IN (SELECT value FROM json_each(tags)))
+
+    Those scan every row; only PostgreSQL can use a GIN index for them.
+    """
+
+    def db_type(self, connection):
+        if connection.vendor == 'postgresql':
+            return super().db_type(connection)
+        return 'text'
+
+    def cast_db_type(self, connection):
+        if connection.vendor == 'postgresql':
+            return super().cast_db_type(connection)
+        return 'text'
+
+    def get_placeholder(self, value, compiler, connection):
+        if connection.vendor == 'postgresql':
+            return super().get_placeholder(value, compiler, connection)
+        return '%s'
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        value = super().get_db_prep_value(value, connection, prepared)
+        if connection.vendor != 'postgresql' and isinstance(value, (list, tuple)):
+            return json.dumps(value)
+        return value
+
+    def from_db_value(self, value, expression, connection):
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+
+
+class JSONArrayRHSMixin:
+    # ArrayRHSMixin turns the right-hand list into ARRAY[...]::type; off
+    # PostgreSQL the list is sent as a single JSON parameter instead.
+    def __init__(self, lhs, rhs):
+        self.rhs_items = list(rhs) if isinstance(rhs, (list, tuple)) else None
+        super().__init__(lhs, rhs)
+
+    def process_json_rhs(self, compiler, connection):
+        if self.rhs_items is None:
+            raise NotSupportedError('%s only accepts a list off PostgreSQL.' % self.lookup_name)
+        return '%s', (json.dumps(self.rhs_items),)
+
+
+@PortableArrayField.register_lookup
+class PortableOverlap(JSONArrayRHSMixin, ArrayOverlap):
+    def as_sqlite(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_json_rhs(compiler, connection)
+        sql = 'EXISTS (SELECT 1 FROM json_each(%s) WHERE value IN (SELECT value FROM json_each(%s)))' % (lhs, rhs)
+        return sql, (*lhs_params, *rhs_params)
+
+
+@PortableArrayField.register_lookup
+class PortableContains(JSONArrayRHSMixin, ArrayContains):
+    def as_sqlite(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_json_rhs(compiler, connection)
+        sql = 'NOT EXISTS (SELECT 1 FROM json_each(%s) WHERE value NOT IN (SELECT value FROM json_each(%s)))' % (rhs, lhs)
+        return sql, (*rhs_params, *lhs_params)
+
+
+def array_facet_counts(queryset, field_name):
+    """
+    Count how many rows of ``queryset`` carry each element of an array field,
+    in one GROUP BY over the (already filtered) queryset.
+
+    Returns ``[(value, count), ...]`` ordered by count, then value.
+    """
+    connection = connections[queryset.db]
+    inner_sql, params = queryset.order_by().values(field_name).query.sql_with_params()
+    column = connection.ops.quote_name(field_name)
+    if connection.vendor == 'postgresql':
+        elements = 'unnest(filtered.%s) AS element(value)' % column
+    else:
+        # json_each() rows already expose the array item as "value".
+        elements = 'json_each(filtered.%s) AS element' % column
+    sql = (
+        'SELECT element.value, COUNT(*) AS n FROM (%s) AS filtered, %s '
+        'GROUP BY element.value ORDER BY n DESC, element.value'
+    ) % (inner_sql, elements)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [tuple(row) for row in cursor.fetchall()]
+
+
+def estimated_row_count(model, using='default'):
+    """
+    PostgreSQL's estimate of the rows in ``model``'s table (pg_class.reltuples,
+    refreshed by VACUUM and ANALYZE), or None if the table hasn't been
+    analyzed yet.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [connection.ops.quote_name(model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    return row[0] if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    A Paginator that doesn't COUNT(*) a whole big table. For an unfiltered
+    queryset on PostgreSQL whose table is estimated at more than
+    ``threshold`` rows, ``count`` is that estimate; filtered querysets (e.g.
+    an admin search) and small tables are counted exactly.
+    """
+    threshold = 100_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if isinstance(queryset, models.QuerySet) and not queryset.query.where and is_postgres(queryset.db):
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.threshold:
+                return estimate
+        return super().count
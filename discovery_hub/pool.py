@@ -0,0 +1,55 @@
+"""
+Connection pool support (settings: DB_POOL and the DB_POOL_* variables).
+
+With pooling on, Django's PostgreSQL backend keeps one psycopg_pool
+ConnectionPool per database alias and process, and each request borrows a
+connection for its duration. Needs psycopg 3 with the pool extra.
+
+Settings imports this module, so it must not import models or
+django.db at module level.
+"""
+
+
+def check_connection(connection):
+    """
+    Run on every checkout: a connection the server or a network hop has
+    dropped is discarded and replaced instead of failing the request.
+    """
+    from psycopg_pool import ConnectionPool
+
+    ConnectionPool.check_connection(connection)
+
+
+def pool_stats():
+    """
+    ``{alias: stats or None}``: None where the alias isn't pooled. Wait
+    times are in milliseconds; counters run from process start.
+    """
+    from django.db import connections
+
+    stats = {}
+    for alias in connections:
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is None:
+            stats[alias] = None
+            continue
+        raw = pool.get_stats()
+        queued = raw.get('requests_queued', 0)
+        wait_ms = raw.get('requests_wait_ms', 0)
+        stats[alias] = {
+            'min_size': raw.get('pool_min'),
+            'max_size': raw.get('pool_max'),
+            'size': raw.get('pool_size', 0),
+            'in_use': raw.get('pool_size', 0) - raw.get('pool_available', 0),
+            'available': raw.get('pool_available', 0),
+            'waiting': raw.get('requests_waiting', 0),
+            'requests': raw.get('requests_num', 0),
+            'requests_queued': queued,
+            'wait_ms_total': wait_ms,
+            'wait_ms_mean': wait_ms / queued if queued else 0.0,
+            'timeouts': raw.get('requests_errors', 0),
+            'connections_opened': raw.get('connections_num', 0),
+            'connections_lost': raw.get('connections_lost', 0),
+            'returned_bad': raw.get('returns_bad', 0),
+        }
+    return stats
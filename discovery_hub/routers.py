@@ -0,0 +1,162 @@
+"""
+Read replicas.
+
+Queries go to the primary ('default') unless a view opts in with
+``@replica_reads``: then its reads go to one of settings.DATABASE_REPLICAS,
+the same replica for the whole request. Writes always go to the primary,
+and a request that has written reads from the primary from then on.
+
+Replicas lag behind the primary, so a user who just changed something could
+read the old value back from a replica. ReplicaStickinessMiddleware gives
+them read-your-writes: after a request writes, it sets a cookie that keeps
+the browser's reads on the primary for DATABASE_REPLICA_STICKY_SECONDS.
+Other users may still see slightly old data, for as long as the lag.
+
+Nothing read from a replica may outlive the request: a cache entry or ETag
+keyed by a version bumped after a write would pin the old data until the
+next bump. Values that get cached are built inside ``primary_reads()``,
+and pages.conditional drops the ETag from a page that ``used_replica()``.
+
+Outside a request (commands, workers, background threads) everything uses
+the primary.
+"""
+import contextlib
+import contextvars
+import functools
+import random
+import time
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+STICKY_COOKIE = 'db_primary_until'
+# Never read from a replica: a session written on login must be found on
+# the very next request.
+PRIMARY_ONLY_APPS = {'sessions'}
+
+
+@dataclass
+class RequestState:
+    pinned: bool = False  # the sticky window from an earlier write is open
+    replica_reads: bool = False
+    wrote: bool = False
+    replica: str = None
+
+
+_state = contextvars.ContextVar('db_routing_state', default=None)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if (
+            state is None or not state.replica_reads or state.pinned or state.wrote
+            or model._meta.app_label in PRIMARY_ONLY_APPS
+        ):
+            return None
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas:
+            return None
+        if state.replica is None:
+            state.replica = random.choice(replicas)
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every alias holds the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema by replication.
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+def replica_reads(view):
+    """Let a read-only view's queries go to a replica."""
+    if iscoroutinefunction(view):
+        async def wrapper(request, *args, **kwargs):
+            state = _state.get()
+            if state is not None:
+                state.replica_reads = True
+            return await view(request, *args, **kwargs)
+        markcoroutinefunction(wrapper)
+    else:
+        def wrapper(request, *args, **kwargs):
+            state = _state.get()
+            if state is not None:
+                state.replica_reads = True
+            return view(request, *args, **kwargs)
+    return functools.wraps(view)(wrapper)
+
+
+@contextlib.contextmanager
+def primary_reads():
+    """Send the reads inside the block to the primary, e.g. to build a cached value."""
+    state = _state.get()
+    if state is None or not state.replica_reads:
+        yield
+        return
+    state.replica_reads = False
+    try:
+        yield
+    finally:
+        state.replica_reads = True
+
+
+def used_replica():
+    """Whether this request has read anything from a replica."""
+    state = _state.get()
+    return state is not None and state.replica is not None
+
+
+def _sticky(request):
+    try:
+        return float(request.COOKIES.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def _finish(state, response):
+    if state.wrote:
+        window = settings.DATABASE_REPLICA_STICKY_SECONDS
+        response.set_cookie(
+            STICKY_COOKIE, f'{time.time() + window:.3f}', max_age=window, httponly=True, samesite='Lax',
+        )
+    return response
+
+
+class ReplicaStickinessMiddleware:
+    """Tracks writes per request and keeps recent writers' reads on the primary."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RequestState(pinned=_sticky(request))
+        token = _state.set(state)
+        try:
+            return _finish(state, self.get_response(request))
+        finally:
+            _state.reset(token)
+
+    async def __acall__(self, request):
+        state = RequestState(pinned=_sticky(request))
+        token = _state.set(state)
+        try:
+            return _finish(state, await self.get_response(request))
+        finally:
+            _state.reset(token)
@@ -18,6 +18,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost, so the session saved on the way out counts as a write.
+    'discovery_hub.routers.ReplicaStickinessMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -38,6 +40,7 @@ TEMPLATES = [{
             'django.template.context_processors.request',
             'django.contrib.auth.context_processors.auth',
             'django.contrib.messages.context_processors.messages',
+            'pages.context_processors.notification_stream',
         ],
     },
 }]
@@ -55,15 +58,111 @@ DATABASES = {
     }
 }
 
+# DB_POOL=true shares a psycopg 3 connection pool between a process's
+# threads instead of keeping one persistent connection per thread; each
+# connection is checked on checkout. Stats: /diagnostics/db-pool/. Needs
+# Django 5.1+ and psycopg-pool 3.2+ (for the check callback).
+if os.getenv('DB_POOL', 'False').lower() == 'true':
+    from discovery_hub.pool import check_connection
+
+    DATABASES['default']['CONN_MAX_AGE'] = 0  # the pool owns connection lifetime
+    DATABASES['default']['OPTIONS'] = {'pool': {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+        # Seconds a request waits for a free connection before erroring.
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+        'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '600')),
+        'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', '3600')),
+        'check': check_connection,
+    }}
+
+# Read replicas (see discovery_hub.routers): DB_REPLICA_HOSTS=host1,host2
+# adds aliases replica1, replica2 with the primary's credentials. Views
+# marked @replica_reads read from one of them, except for users who wrote
+# within the last DB_REPLICA_STICKY_SECONDS.
+DATABASE_REPLICAS = []
+for number, host in enumerate([h.strip() for h in os.getenv('DB_REPLICA_HOSTS', '').split(',') if h.strip()], 1):
+    DATABASES[f'replica{number}'] = {**DATABASES['default'], 'HOST': host, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(f'replica{number}')
+DATABASE_ROUTERS = ['discovery_hub.routers.ReplicaRouter']
+DATABASE_REPLICA_STICKY_SECONDS = float(os.getenv('DB_REPLICA_STICKY_SECONDS', '10'))
+
 # Use in-memory SQLite database for testing to avoid permission issues and for speed.
 if 'test' in sys.argv or 'test' == os.environ.get('DJANGO_ENV'):
-    DATABASES['default'] = {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': ':memory:',
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        },
+        # Routed to only by tests that set DATABASE_REPLICAS = ['replica'].
+        # A separate database, not a mirror: it sees none of the primary's
+        # rows, like a replica that hasn't caught up.
+        'replica': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        },
     }
+    DATABASE_REPLICAS = []
+
+# The cache version counters in pages.cache (behind ETags, facet counts and
+# the profile pages) and cached_db sessions must be seen by every worker
+# process, or an invalidation in one never reaches the others. REDIS_URL
+# shares them; without it each process has its own LocMem cache, which is
+# only correct with a single worker (e.g. runserver). `check --deploy`
+# fails without a shared cache.
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'discovery_hub',
+        },
+        'sessions': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'sessions',
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'sessions': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'sessions',
+        },
+    }
+
+# Where sessions live. 'db' reads the session row on every request;
+# 'cached_db' serves reads from the 'sessions' cache and writes through to
+# the database (only safe with a single worker unless REDIS_URL is set);
+# 'signed_cookies' keeps the session in the cookie and never touches the
+# database.
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_ENGINES[os.getenv('SESSION_MODE', 'db')]
+SESSION_CACHE_ALIAS = 'sessions'
 
 AUTH_USER_MODEL = 'accounts.User'
 
+# ProfileModelBackend fetches the session user with their TTOProfile in one
+# query. ModelBackend stays listed so sessions created before the switch
+# (which record it by path) remain valid.
+AUTHENTICATION_BACKENDS = [
+    'accounts.backends.ProfileModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# Serve login and registration with the async views (for ASGI deployments),
+# which hash passwords in a pool of this many threads.
+ASYNC_AUTH_VIEWS = os.getenv('ASYNC_AUTH_VIEWS', 'False').lower() == 'true'
+PASSWORD_HASHING_WORKERS = int(os.getenv('PASSWORD_HASHING_WORKERS', str(min(4, os.cpu_count() or 1))))
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME':'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME':'django.contrib.auth.password_validation.MinimumLengthValidator','OPTIONS':{'min_length':8}},
@@ -85,5 +184,26 @@ LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'screen1'
 LOGOUT_REDIRECT_URL = 'login'
 
-# For development, print password reset emails to the console.
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+# Mail is queued in the database (pages.outbox) and delivered by
+# `manage.py send_outbox` through OUTBOX_DELIVERY_BACKEND. For development
+# the worker prints to the console; set EMAIL_DELIVERY_BACKEND to
+# django.core.mail.backends.smtp.EmailBackend and the EMAIL_* values for SMTP.
+EMAIL_BACKEND = 'pages.outbox.OutboxBackend'
+OUTBOX_DELIVERY_BACKEND = os.getenv('EMAIL_DELIVERY_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = os.getenv('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', '25'))
+EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'False').lower() == 'true'
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'webmaster@localhost')
+
+# Seconds to collect profile/project changes before refreshing recommendations
+# in one batch (see pages.recommendations). 0 refreshes immediately on commit.
+RECOMMENDATIONS_REFRESH_DELAY = float(os.getenv('RECOMMENDATIONS_REFRESH_DELAY', '2'))
+
+# Pub/sub backend for the notification stream (see pages.broker). The
+# in-process broker only reaches streams served by the same worker; use
+# pages.broker.RedisBroker with NOTIFICATION_BROKER_OPTIONS = {'url': ...}
+# when running several.
+NOTIFICATION_BROKER = os.getenv('NOTIFICATION_BROKER', 'pages.broker.InProcessBroker')
+NOTIFICATION_BROKER_OPTIONS = {'url': os.getenv('NOTIFICATION_BROKER_URL')} if os.getenv('NOTIFICATION_BROKER_URL') else {}
@@ -2,9 +2,12 @@ from django.contrib import admin
 from django.urls import path, include
 from django.contrib.auth.views import LogoutView
 
+from .views import db_pool_stats
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('pages.urls')),
     path('accounts/', include('accounts.urls')),
     path('logout/', LogoutView.as_view(next_page='welcome'), name='logout'),
+    path('diagnostics/db-pool/', db_pool_stats, name='db_pool_stats'),
 ]
@@ -0,0 +1,14 @@
+import os
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+
+from .pool import pool_stats
+
+
+@never_cache
+@staff_member_required
+def db_pool_stats(request):
+    """Connection pool usage for this process, per database alias."""
+    return JsonResponse({'pid': os.getpid(), 'pools': pool_stats()})
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'discovery_hub.settings')
 
 application = get_wsgi_application()
+
+# Build the search typeahead index now rather than on the first request.
+from pages.typeahead import typeahead  # noqa: E402
+
+typeahead.warm_up()
@@ -0,0 +1,168 @@
+"""
+Pub/sub for pushing notifications to open SSE streams.
+
+Publishers are ordinary (sync) request or worker code; subscribers are
+open SSE streams, all on the ASGI event loop. Each subscription is just a
+bounded asyncio.Queue, so an idle connection costs a few KiB (see
+benchmarks/bench_sse.py) and no thread.
+
+The backend is chosen by settings.NOTIFICATION_BROKER. InProcessBroker only
+reaches streams served by the same process, which is enough for a single
+worker and for tests; RedisBroker relays through Redis pub/sub so every
+worker sees every publish.
+"""
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+# A stream that falls this far behind loses its oldest events.
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class Subscription:
+    """One open stream's inbox. ``await get()`` the next payload."""
+    __slots__ = ('loop', 'queue')
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+
+    def put(self, message):
+        # Runs on the subscriber's loop.
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    async def get(self):
+        # Safe to cancel (e.g. by asyncio.wait_for): nothing is lost.
+        return json.loads(await self.queue.get())
+
+
+class Broker:
+    """
+    Interface: ``publish`` from any thread; ``subscribe`` from async code,
+    as ``async with broker.subscribe(user_id) as subscription``.
+    """
+
+    def publish(self, user_id, payload):
+        raise NotImplementedError
+
+    def subscribe(self, user_id):
+        raise NotImplementedError
+
+
+class _Subscribe:
+    def __init__(self, broker, user_id):
+        self.broker = broker
+        self.user_id = user_id
+        self.subscription = None
+
+    async def __aenter__(self):
+        self.subscription = Subscription(asyncio.get_running_loop())
+        self.broker._add(self.user_id, self.subscription)
+        return self.subscription
+
+    async def __aexit__(self, *exc_info):
+        self.broker._remove(self.user_id, self.subscription)
+
+
+class InProcessBroker(Broker):
+    def __init__(self, **options):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def publish(self, user_id, payload):
+        return self._deliver_local(user_id, json.dumps(payload))
+
+    def _deliver_local(self, user_id, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+        delivered = 0
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, message)
+            except RuntimeError:
+                continue  # its loop has shut down
+            delivered += 1
+        return delivered
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def subscribe(self, user_id):
+        return _Subscribe(self, user_id)
+
+    def _add(self, user_id, subscription):
+        with self._lock:
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+
+    def _remove(self, user_id, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[user_id]
+
+
+class RedisBroker(InProcessBroker):
+    """
+    Relays publishes through one Redis channel. Each process keeps a single
+    Redis subscription and fans messages out to its own streams in memory.
+    Needs the ``redis`` package and NOTIFICATION_BROKER_OPTIONS = {'url': ...}.
+    """
+    CHANNEL = 'discovery_hub:notifications'
+
+    def __init__(self, url='redis://localhost:6379/0', **options):
+        super().__init__()
+        try:
+            import redis
+        except ImportError as exc:
+            raise ImproperlyConfigured('RedisBroker requires the redis package.') from exc
+        self._url = url
+        self._client = redis.Redis.from_url(url)
+        self._listener = None
+
+    def publish(self, user_id, payload):
+        return self._client.publish(self.CHANNEL, json.dumps({'user': user_id, 'payload': payload}))
+
+    async def _listen(self):
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self._url)
+        async with client.pubsub() as pubsub:
+            await pubsub.subscribe(self.CHANNEL)
+            async for message in pubsub.listen():
+                if message['type'] == 'message':
+                    data = json.loads(message['data'])
+                    self._deliver_local(data['user'], json.dumps(data['payload']))
+
+    def _add(self, user_id, subscription):
+        if self._listener is None or self._listener.done():
+            self._listener = subscription.loop.create_task(self._listen())
+        super()._add(user_id, subscription)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                backend = import_string(settings.NOTIFICATION_BROKER)
+                _broker = backend(**getattr(settings, 'NOTIFICATION_BROKER_OPTIONS', {}))
+    return _broker
+
+
+def reset_broker():
+    global _broker
+    with _broker_lock:
+        _broker = None
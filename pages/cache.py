@@ -0,0 +1,105 @@
+"""
+Version-counter cache invalidation.
+
+Each kind of data ("projects", ...) has a counter in the cache. Keys built
+with ``versioned_key`` embed the current counter, so bumping it on save
+orphans every cached entry for that data at once; they age out on their own.
+The counters only work if every worker process reads the same ones, so with
+more than one worker the default cache must be shared (REDIS_URL; see
+pages.checks).
+
+``get_or_build`` adds stampede protection on top: entries carry a soft
+expiry, and once it passes (or the key is new) only the caller that wins a
+short-lived lock rebuilds the value. Everyone else keeps serving the stale
+copy, or waits briefly for the winner when there is none. Values are built
+from the primary database, never a lagging replica, since they're stored
+under the current version.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+
+from discovery_hub.routers import primary_reads
+
+
+def _counter_key(name):
+    return f'pages:version:{name}'
+
+
+def get_version(name):
+    version = cache.get(_counter_key(name))
+    if version is None:
+        # Counters start from the clock, so one that was evicted restarts
+        # above every value it had before. add() lets concurrent first
+        # readers agree on a single value.
+        cache.add(_counter_key(name), time.time_ns() // 1000, timeout=None)
+        version = cache.get(_counter_key(name))
+    return version
+
+
+def bump_version(name):
+    try:
+        return cache.incr(_counter_key(name))
+    except ValueError:
+        # No counter (never read, or evicted): a fresh one is already newer.
+        return get_version(name)
+
+
+def versioned_key(name, *parts):
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'pages:{name}:v{get_version(name)}:{digest}'
+
+
+PROFILE_CACHE_TIMEOUT = 60 * 15
+# How long stale entries stay around to be served while one caller rebuilds.
+STALE_GRACE = 60
+LOCK_TIMEOUT = 10
+LOCK_WAIT = 0.5
+LOCK_POLL = 0.02
+
+
+def get_or_build(key, build, timeout, grace=STALE_GRACE):
+    """``cache.get(key)``, calling ``build()`` on a miss at most once across callers."""
+    entry = cache.get(key)
+    if entry is not None:
+        expires, value = entry
+        if time.time() < expires or not cache.add(f'{key}:lock', 1, LOCK_TIMEOUT):
+            return value
+        return _rebuild(key, build, timeout, grace)
+
+    if cache.add(f'{key}:lock', 1, LOCK_TIMEOUT):
+        return _rebuild(key, build, timeout, grace)
+    # Someone else is building it; give them a moment before doing it too.
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[1]
+    with primary_reads():
+        return build()
+
+
+def _rebuild(key, build, timeout, grace):
+    try:
+        with primary_reads():
+            value = build()
+        cache.set(key, (time.time() + timeout, value), timeout + grace)
+        return value
+    finally:
+        cache.delete(f'{key}:lock')
+
+
+def profile_version_name(user_id):
+    return f'profile:{user_id}'
+
+
+def recommendations_version_name(user_id):
+    return f'recommendations:{user_id}'
+
+
+def profile_data(user, page, build, timeout=PROFILE_CACHE_TIMEOUT):
+    """``build(user)`` for ``page``, cached per user until the profile's version is bumped."""
+    key = versioned_key(profile_version_name(user.pk), page)
+    return get_or_build(key, lambda: build(user), timeout)
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Backends that keep their data inside one process.
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    pages.cache invalidates by bumping version counters in the default
+    cache. In a per-process cache a bump never reaches the other workers,
+    which keep answering 304 (and serving cached data) for the old version.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Error(
+        f'The default cache ({backend}) is local to each process.',
+        hint='Set REDIS_URL so every worker shares the cache version counters.',
+        id='pages.E001',
+    )]
@@ -0,0 +1,100 @@
+"""
+ETags for conditional GETs on the dashboard and profile pages.
+
+An ETag is a digest of everything the rendered page depends on: the user
+and role, the version counters from pages.cache for the data shown
+(including the user's profile, since the nav shows their name), the query
+string, the template sources and the CSRF cookie (the page embeds a token
+for the logout form). Computing it costs a few cache reads and no
+rendering, so an unchanged page is answered with a bodiless 304.
+
+There is no Last-Modified: most of the data has no timestamp (users, TTO
+profiles) or can change by deletion, which a max(updated_at) never shows.
+
+A page rendered from a read replica gets no ETag: the replica may not yet
+have the write that bumped the version, and a client holding the new ETag
+would be answered 304 on the old data until the next bump.
+"""
+import functools
+import hashlib
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from discovery_hub.routers import used_replica
+
+from .cache import get_version, profile_version_name, recommendations_version_name
+from .fragments import template_version
+
+
+def page_etag(request, role, templates, versions):
+    """
+    The ETag for a page that ``role`` users see, or None to skip the check
+    (wrong role, or flash messages waiting to be shown).
+    """
+    user = request.user
+    if getattr(user, 'user_type', None) != role or len(get_messages(request)):
+        return None
+    parts = [
+        user.pk,
+        role,
+        # The nav badge; the counter lives on the already-loaded user row.
+        user.unread_notifications,
+        request.get_full_path(),
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+        *(template_version(name) for name in ('base.html', *templates)),
+        *(get_version(name) for name in (profile_version_name(user.pk), *versions)),
+    ]
+    return hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def conditional_page(etag_func):
+    """
+    ``condition()`` plus ``Cache-Control: private, no-cache`` so browsers
+    keep the page but revalidate it on every visit.
+    """
+    def decorator(view):
+        conditional_view = condition(etag_func=etag_func)(view)
+
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            if used_replica() and response.has_header('ETag'):
+                del response['ETag']
+            if response.status_code in (200, 304) and response.has_header('ETag'):
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapper
+    return decorator
+
+
+def screen_etag(screen, roles):
+    def etag(request, *args, **kwargs):
+        role = getattr(request.user, 'user_type', None)
+        if role not in roles:
+            return None
+        return page_etag(
+            request, role,
+            [f'pages/screen{screen}.html', f'pages/partials/s{screen}_{role}.html'],
+            ['fragments'],
+        )
+    return etag
+
+
+def company_home_etag(request, *args, **kwargs):
+    return page_etag(request, 'company', ['pages/company_home.html'], ['projects'])
+
+
+def university_home_etag(request, *args, **kwargs):
+    return page_etag(
+        request, 'university', ['pages/university_home.html'],
+        ['companies', recommendations_version_name(request.user.pk)],
+    )
+
+
+def profile_etag(role):
+    def etag(request, *args, **kwargs):
+        return page_etag(request, role, [f'pages/{role}_profile.html'], [])
+    return etag
@@ -0,0 +1,6 @@
+from django.core.handlers.asgi import ASGIRequest
+
+
+def notification_stream(request):
+    """Offer the live notification stream only where it can be served (ASGI)."""
+    return {'notification_stream': isinstance(request, ASGIRequest)}
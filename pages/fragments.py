@@ -0,0 +1,49 @@
+"""
+Cached role partials for the s1/s2/s3 dashboard screens.
+
+``pages/partials/s{1,2,3}_{role}.html`` are the same for every user of a
+role, so each is rendered once and served from the cache. Keys combine the
+screen, the role, a digest of the partial's source (so a deploy that edits
+a template never serves the old markup) and the 'fragments' version counter
+that ``invalidate_fragments`` bumps.
+
+Partials are rendered without the request or user: anything per-user
+belongs in the screen template around them.
+"""
+import functools
+import hashlib
+
+from django.core.cache import cache
+from django.template.loader import get_template, render_to_string
+
+from .cache import bump_version, versioned_key
+
+PARTIAL_TEMPLATE = 'pages/partials/{screen}_{role}.html'
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+@functools.lru_cache(maxsize=None)
+def template_version(template_name):
+    source = get_template(template_name).template.source
+    return hashlib.md5(source.encode(), usedforsecurity=False).hexdigest()[:12]
+
+
+def fragment_key(screen, role):
+    template_name = PARTIAL_TEMPLATE.format(screen=screen, role=role)
+    return versioned_key('fragments', screen, role, template_version(template_name))
+
+
+def render_role_partial(screen, role):
+    """The rendered partial for ``screen`` and ``role``, from the cache when possible."""
+    key = fragment_key(screen, role)
+    html = cache.get(key)
+    if html is None:
+        html = render_to_string(PARTIAL_TEMPLATE.format(screen=screen, role=role))
+        cache.set(key, html, FRAGMENT_CACHE_TIMEOUT)
+    return html
+
+
+def invalidate_fragments():
+    """Drop every cached partial, e.g. after changing data a partial displays."""
+    template_version.cache_clear()
+    bump_version('fragments')
@@ -0,0 +1,97 @@
+"""
+Static centered interval tree over closed intervals.
+
+Used to match many projects against TTO TRL windows in one pass instead of
+running one range query per project.
+"""
+import bisect
+
+NEG_INF = float('-inf')
+POS_INF = float('inf')
+
+
+class _Node:
+    __slots__ = ('center', 'by_low', 'lows', 'by_high', 'highs', 'left', 'right')
+
+    def __init__(self, center, intervals, left, right):
+        self.center = center
+        # Intervals containing ``center``, sorted both ways so a query only
+        # walks the ones that actually overlap.
+        self.by_low = sorted(intervals, key=lambda iv: iv[0])
+        self.lows = [iv[0] for iv in self.by_low]
+        self.by_high = sorted(intervals, key=lambda iv: iv[1])
+        self.highs = [iv[1] for iv in self.by_high]
+        self.left = left
+        self.right = right
+
+
+class IntervalTree:
+    """
+    Build once from ``(low, high, payload)`` triples; ``None`` bounds are open.
+
+    ``overlap(low, high)`` returns the payloads of every interval that
+    intersects [low, high] in O(log n + k).
+    """
+
+    def __init__(self, intervals):
+        normalized = [
+            (NEG_INF if low is None else low, POS_INF if high is None else high, payload)
+            for low, high, payload in intervals
+        ]
+        self._size = len(normalized)
+        self._root = self._build(normalized)
+
+    def __len__(self):
+        return self._size
+
+    @classmethod
+    def _build(cls, intervals):
+        if not intervals:
+            return None
+        endpoints = sorted(
+            point for low, high, _ in intervals for point in (low, high)
+            if point not in (NEG_INF, POS_INF)
+        )
+        center = endpoints[len(endpoints) // 2] if endpoints else 0
+        left, here, right = [], [], []
+        for interval in intervals:
+            if interval[1] < center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        return _Node(center, here, cls._build(left), cls._build(right))
+
+    def overlap(self, low, high):
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if high < node.center:
+                # Only intervals starting at or before ``high`` can reach back.
+                end = bisect.bisect_right(node.lows, high)
+                found.extend(iv[2] for iv in node.by_low[:end])
+                stack.append(node.left)
+            elif low > node.center:
+                start = bisect.bisect_left(node.highs, low)
+                found.extend(iv[2] for iv in node.by_high[start:])
+                stack.append(node.right)
+            else:
+                found.extend(iv[2] for iv in node.by_low)
+                stack.append(node.left)
+                stack.append(node.right)
+        return found
+
+    def stab(self, point):
+        return self.overlap(point, point)
+
+    def overlap_many(self, ranges):
+        """
+        ``{(low, high): payloads}`` for a batch of query ranges. Duplicate
+        ranges are answered once, which matters for TRL: there are only nine
+        levels no matter how many projects are being matched.
+        """
+        return {key: self.overlap(*key) for key in set(ranges)}
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from pages.fragments import invalidate_fragments
+
+
+class Command(BaseCommand):
+    help = (
+        "Drop the cached s1/s2/s3 role partials. Template edits are picked up "
+        "on their own; run this after changing data a partial displays."
+    )
+
+    def handle(self, *args, **options):
+        invalidate_fragments()
+        self.stdout.write(self.style.SUCCESS('Invalidated cached role partials'))
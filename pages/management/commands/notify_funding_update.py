@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from pages.notifications import FAN_OUT_BATCH_SIZE, fan_out, recipients_for_tags
+
+
+class Command(BaseCommand):
+    help = (
+        "Notify every university user whose TTO profile shares a therapeutic "
+        "focus tag with a new funding update."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('message', help='Notification text.')
+        parser.add_argument('--tag', action='append', dest='tags', default=[],
+                            help='Therapeutic focus tag to match (repeatable).')
+        parser.add_argument('--url', default='', help='Link shown with the notification.')
+        parser.add_argument('--batch-size', type=int, default=FAN_OUT_BATCH_SIZE,
+                            help='Recipients per INSERT/commit.')
+
+    def handle(self, *args, **options):
+        if not options['tags']:
+            raise CommandError('Give at least one --tag.')
+        result = fan_out(
+            recipients_for_tags(options['tags']), options['message'],
+            url=options['url'], batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Sent {result.recipients} notifications in {result.seconds:.2f}s '
+            f'({result.per_second:,.0f}/s)'
+        ))
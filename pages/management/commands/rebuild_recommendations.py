@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from pages.recommendations import RECOMMENDATIONS_PER_USER, rebuild_all
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute every user's project recommendations from scratch. Normal "
+        "edits are picked up incrementally; run this after bulk imports that "
+        "bypass model signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('-k', type=int, default=RECOMMENDATIONS_PER_USER,
+                            help='Recommendations to keep per user.')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        rebuild_all(options['k'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt recommendations in {time.perf_counter() - start:.2f}s'
+        ))
@@ -0,0 +1,43 @@
+import statistics
+
+from django.core.management.base import BaseCommand
+
+from pages.outbox import BATCH_SIZE, Worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver queued email (pages.outbox) over one reused connection, "
+        "retrying failures with backoff. Runs until interrupted unless --once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Deliver everything currently due, then exit.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Seconds to sleep when nothing is due.')
+
+    def handle(self, *args, **options):
+        worker = Worker(batch_size=options['batch_size'])
+        try:
+            if options['once']:
+                while worker.run_once():
+                    pass
+                worker.close()
+            else:
+                worker.run(interval=options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.report(worker)
+
+    def report(self, worker):
+        summary = f'Sent {worker.sent}, gave up on {worker.failed}, over {worker.connections_opened} connection(s)'
+        if worker.latencies:
+            ordered = sorted(worker.latencies)
+            summary += (
+                f'; delivery latency over the last {len(ordered)}: '
+                f'p50={statistics.median(ordered):.3f}s max={ordered[-1]:.3f}s'
+            )
+        self.stdout.write(self.style.SUCCESS(summary))
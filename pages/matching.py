@@ -0,0 +1,211 @@
+"""
+Matching between company-facing projects and university TTO profiles.
+
+Two tools live here:
+
+* TRL window lookups through an in-memory interval tree, for "which TTOs
+  could take a project at this readiness level".
+* A vectorized scorer that ranks every project for every TTO profile. Both
+  sides are encoded once as NumPy arrays and scored block by block, so the
+  cost is a handful of array operations per block instead of a Python loop
+  over every (profile, project) pair.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from accounts.models import TTOProfile
+
+from .intervals import IntervalTree
+from .models import Project
+
+# How much each signal contributes to a match score (the maximum score is 1.0).
+DEFAULT_WEIGHTS = {'tags': 0.6, 'trl': 0.3, 'country': 0.1}
+
+# Upper bound on the size of the per-block score matrix, in bytes.
+BLOCK_BYTES = 64 * 1024 * 1024
+
+
+def build_trl_tree(profiles=None):
+    """An IntervalTree of TTO profile ids keyed by their TRL interest window."""
+    if profiles is None:
+        profiles = TTOProfile.objects.all()
+    rows = profiles.values_list('trl_range_interest_min', 'trl_range_interest_max', 'pk')
+    return IntervalTree(rows.iterator(chunk_size=2000))
+
+
+def match_projects_by_trl(projects, tree=None):
+    """
+    ``{project_id: [profile_id, ...]}`` for every project with a TRL, using one
+    read of the profile table instead of one range query per project.
+    """
+    if tree is None:
+        tree = build_trl_tree()
+    projects = [(project.pk, project.trl) for project in projects if project.trl is not None]
+    hits = tree.overlap_many((trl, trl) for _, trl in projects)
+    return {pk: hits[(trl, trl)] for pk, trl in projects}
+
+
+def _normalize(term):
+    return (term or '').strip().casefold()
+
+
+class Vocabulary:
+    """Maps normalized terms (tags, fields, countries) to column indexes."""
+
+    def __init__(self):
+        self.index = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def add(self, term):
+        term = _normalize(term)
+        if not term:
+            return -1
+        return self.index.setdefault(term, len(self.index))
+
+    def get(self, term):
+        return self.index.get(_normalize(term), -1)
+
+
+@dataclass
+class EncodedSide:
+    """One side of the match as arrays, row ``i`` describing ``ids[i]``."""
+    ids: np.ndarray       # int64, (n,)
+    terms: np.ndarray     # float32 multi-hot, (n, vocabulary size)
+    trl_low: np.ndarray   # float32, (n,); -inf when open
+    trl_high: np.ndarray  # float32, (n,); +inf when open
+    country: np.ndarray   # int32 vocabulary index, (n,); -1 when blank
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def _multi_hot(rows, vocabulary):
+    matrix = np.zeros((len(rows), max(len(vocabulary), 1)), dtype=np.float32)
+    for i, terms in enumerate(rows):
+        columns = [c for c in (vocabulary.get(t) for t in terms) if c >= 0]
+        matrix[i, columns] = 1.0
+    return matrix
+
+
+def _bounds(values, missing):
+    return np.array([missing if v is None else v for v in values], dtype=np.float32)
+
+
+def encode(profile_rows, project_rows):
+    """
+    Encode plain rows into a (profiles, projects) pair of EncodedSide.
+
+    ``profile_rows``: ``(id, tags, trl_min, trl_max, country)``
+    ``project_rows``: ``(id, field, trl, country)``
+    """
+    profile_rows, project_rows = list(profile_rows), list(project_rows)
+    terms, countries = Vocabulary(), Vocabulary()
+    for _, tags, _, _, country in profile_rows:
+        for tag in tags:
+            terms.add(tag)
+        countries.add(country)
+    for _, field, _, country in project_rows:
+        terms.add(field)
+        countries.add(country)
+
+    profiles = EncodedSide(
+        ids=np.array([row[0] for row in profile_rows], dtype=np.int64),
+        terms=_multi_hot([row[1] for row in profile_rows], terms),
+        trl_low=_bounds([row[2] for row in profile_rows], -np.inf),
+        trl_high=_bounds([row[3] for row in profile_rows], np.inf),
+        country=np.array([countries.get(row[4]) for row in profile_rows], dtype=np.int32),
+    )
+    project_trl = [row[2] for row in project_rows]
+    projects = EncodedSide(
+        ids=np.array([row[0] for row in project_rows], dtype=np.int64),
+        terms=_multi_hot([[row[1]] for row in project_rows], terms),
+        # A project sits at a single level; an unknown TRL never matches a window.
+        trl_low=_bounds(project_trl, np.nan),
+        trl_high=_bounds(project_trl, np.nan),
+        country=np.array([countries.get(row[3]) for row in project_rows], dtype=np.int32),
+    )
+    return profiles, projects
+
+
+def load_encoded(profiles=None, projects=None):
+    """Encode TTO profiles and projects straight from the database."""
+    if profiles is None:
+        profiles = TTOProfile.objects.all()
+    if projects is None:
+        projects = Project.objects.all()
+    profile_rows = profiles.order_by('pk').values_list(
+        'pk', 'therapeutic_focus_tags', 'trl_range_interest_min', 'trl_range_interest_max', 'country'
+    ).iterator(chunk_size=2000)
+    project_rows = projects.order_by('pk').values_list(
+        'pk', 'field', 'trl', 'country'
+    ).iterator(chunk_size=2000)
+    return encode(profile_rows, project_rows)
+
+
+def score_block(profiles, projects, rows, weights=DEFAULT_WEIGHTS):
+    """Score matrix (len(rows), len(projects)) for a slice of profiles."""
+    terms = profiles.terms[rows]
+    # Share of the project's terms the profile covers.
+    project_term_counts = np.maximum(projects.terms.sum(axis=1), 1.0)
+    scores = (terms @ projects.terms.T) / project_term_counts
+    scores *= weights['tags']
+
+    # NaN (unknown project TRL) compares False on both sides.
+    in_window = (profiles.trl_low[rows, None] <= projects.trl_low[None, :]) & (
+        projects.trl_high[None, :] <= profiles.trl_high[rows, None]
+    )
+    scores += weights['trl'] * in_window
+
+    country = profiles.country[rows, None]
+    same_country = (country == projects.country[None, :]) & (country >= 0)
+    scores += weights['country'] * same_country
+    return scores
+
+
+def top_k(profiles, projects, k=10, weights=DEFAULT_WEIGHTS, block_rows=None):
+    """
+    Best ``k`` projects for every profile.
+
+    Returns ``(indexes, scores)``, both shaped (len(profiles), k'), where
+    k' = min(k, len(projects)) and row ``i`` is sorted best first. Indexes
+    point into ``projects.ids``. Profiles are scored in blocks so the
+    temporary score matrix stays under BLOCK_BYTES.
+    """
+    n, m = len(profiles), len(projects)
+    k = min(k, m)
+    indexes = np.zeros((n, k), dtype=np.int64)
+    scores = np.zeros((n, k), dtype=np.float32)
+    if n == 0 or k == 0:
+        return indexes, scores
+    if block_rows is None:
+        block_rows = max(1, BLOCK_BYTES // (m * 4))
+
+    for start in range(0, n, block_rows):
+        rows = slice(start, min(start + block_rows, n))
+        block = score_block(profiles, projects, rows, weights)
+        if k < m:
+            candidates = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(m), block.shape).copy()
+        candidate_scores = np.take_along_axis(block, candidates, axis=1)
+        # Best first; equal scores are ordered by project index.
+        order = np.lexsort((candidates, -candidate_scores), axis=1)
+        indexes[rows] = np.take_along_axis(candidates, order, axis=1)
+        scores[rows] = np.take_along_axis(candidate_scores, order, axis=1)
+    return indexes, scores
+
+
+def top_project_matches(k=10, profiles=None, projects=None, weights=DEFAULT_WEIGHTS):
+    """``{profile_id: [(project_id, score), ...]}`` for every TTO profile."""
+    encoded_profiles, encoded_projects = load_encoded(profiles, projects)
+    indexes, scores = top_k(encoded_profiles, encoded_projects, k, weights)
+    project_ids = encoded_projects.ids
+    return {
+        int(profile_id): [
+            (int(project_ids[j]), float(score)) for j, score in zip(row, row_scores) if score > 0
+        ]
+        for profile_id, row, row_scores in zip(encoded_profiles.ids, indexes, scores)
+    }
@@ -0,0 +1,59 @@
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+import discovery_hub.db
+
+SEARCH_VECTOR_TRIGGER = """
+CREATE FUNCTION pages_project_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER pages_project_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON pages_project
+    FOR EACH ROW EXECUTE FUNCTION pages_project_search_vector_update();
+"""
+
+DROP_SEARCH_VECTOR_TRIGGER = """
+DROP TRIGGER IF EXISTS pages_project_search_vector_trigger ON pages_project;
+DROP FUNCTION IF EXISTS pages_project_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Project',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('field', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=discovery_hub.db.PortableGinIndex(fields=['search_vector'], name='pages_project_search_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['field', 'id'], name='pages_project_field_idx'),
+        ),
+        discovery_hub.db.PostgresOnly(migrations.RunSQL(SEARCH_VECTOR_TRIGGER, DROP_SEARCH_VECTOR_TRIGGER)),
+    ]
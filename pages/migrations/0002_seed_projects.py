@@ -0,0 +1,37 @@
+from django.db import migrations
+
+# The projects that used to be hardcoded in pages.views.company_home.
+SEED_PROJECTS = [
+    ('AI-Powered Chatbot for Customer Service', 'Artificial Intelligence', 'Developing a chatbot using natural language processing to enhance customer support experience.'),
+    ('Sustainable Energy Management System', 'Renewable Energy', 'A system to monitor and optimize energy consumption for commercial buildings using IoT.'),
+    ('Blockchain for Supply Chain Traceability', 'Blockchain', 'Implementing a decentralized ledger to track products from origin to consumer.'),
+    ('Personalized Learning Platform', 'Education Technology', 'An adaptive platform that customizes learning paths based on student performance and preferences.'),
+    ('Predictive Maintenance for Industrial Machinery', 'Manufacturing', 'Using machine learning to predict equipment failures and optimize maintenance schedules.'),
+    ('Smart City Traffic Management', 'Urban Planning', 'Developing an intelligent system to alleviate traffic congestion using real-time data.'),
+]
+
+
+def seed_projects(apps, schema_editor):
+    Project = apps.get_model('pages', 'Project')
+    Project.objects.using(schema_editor.connection.alias).bulk_create(
+        Project(title=title, field=field, description=description)
+        for title, field, description in SEED_PROJECTS
+    )
+
+
+def unseed_projects(apps, schema_editor):
+    Project = apps.get_model('pages', 'Project')
+    Project.objects.using(schema_editor.connection.alias).filter(
+        title__in=[title for title, _, _ in SEED_PROJECTS]
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_projects, unseed_projects),
+    ]
@@ -0,0 +1,34 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+import discovery_hub.db
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0002_seed_projects'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name='Company',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('focus', models.JSONField(blank=True, default=list, help_text="Focus areas (e.g., 'AI', 'Patents')")),
+                ('search_text', models.TextField(blank=True, editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'companies',
+                'ordering': ['name', 'id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=discovery_hub.db.PortableGinIndex(fields=['search_text'], name='pages_company_search_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
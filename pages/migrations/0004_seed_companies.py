@@ -0,0 +1,38 @@
+from django.db import migrations
+
+from pages.search import company_search_text
+
+# The companies that used to be hardcoded in pages.views.university_home.
+SEED_COMPANIES = [
+    ('Tech Innovators Inc.', ['AI', 'Machine Learning']),
+    ('BioHealth Corp.', ['Biotechnology', 'Patents']),
+    ('GreenEnergy Solutions', ['Renewable Energy', 'Research']),
+    ('QuantumLeap Computing', ['Quantum Computing', 'Patents']),
+]
+
+
+def seed_companies(apps, schema_editor):
+    Company = apps.get_model('pages', 'Company')
+    # Historical models don't run Company.save(), so fill search_text here.
+    Company.objects.using(schema_editor.connection.alias).bulk_create(
+        Company(name=name, focus=focus, search_text=company_search_text(name, focus))
+        for name, focus in SEED_COMPANIES
+    )
+
+
+def unseed_companies(apps, schema_editor):
+    Company = apps.get_model('pages', 'Company')
+    Company.objects.using(schema_editor.connection.alias).filter(
+        name__in=[name for name, _ in SEED_COMPANIES]
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0003_company'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_companies, unseed_companies),
+    ]
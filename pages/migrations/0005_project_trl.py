@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0004_seed_companies'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='trl',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Technology Readiness Level (TRL) of the project (1-9)', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0005_project_trl'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='country',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+    ]
@@ -1,3 +1,248 @@
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVectorField, TrigramWordSimilarity,
+)
 from django.db import models
+from django.db.models import Case, Count, F, FloatField, Q, Value, When
+from django.db.models.functions import Cast
+from django.utils import timezone
 
-# Create your models here.
+from accounts.models import TTOProfile
+from discovery_hub.db import PortableGinIndex, is_postgres
+from . import search
+
+
+class ProjectQuerySet(models.QuerySet):
+    def search(self, query):
+        if not query:
+            return self
+        if is_postgres(self.db):
+            # search_vector is kept up to date by a trigger (see migration 0001),
+            # so this is a single GIN index lookup plus ranking of the hits.
+            search_query = SearchQuery(query, config='english', search_type='websearch')
+            return (
+                self.filter(search_vector=search_query)
+                .annotate(rank=SearchRank(F('search_vector'), search_query))
+                .order_by('-rank', 'id')
+            )
+        # SQLite (test settings) has no tsvector support; fall back to substring matching.
+        return self.filter(Q(title__icontains=query) | Q(description__icontains=query))
+
+    def in_field(self, field):
+        return self.filter(field=field) if field else self
+
+    def facet_counts(self, dimensions=('field', 'trl', 'country')):
+        """
+        ``{dimension: [(value, count), ...]}`` for the rows in this queryset,
+        from one round trip: a GROUP BY per dimension glued with UNION ALL.
+        Blank values are left out.
+        """
+        base = self.order_by()
+        parts = [
+            base.annotate(facet=Value(dimension), value=Cast(dimension, models.CharField()))
+            .values('facet', 'value')
+            .annotate(n=Count('pk'))
+            .order_by()
+            for dimension in dimensions
+        ]
+        facets = {dimension: [] for dimension in dimensions}
+        for row in parts[0].union(*parts[1:], all=True):
+            if row['value'] not in (None, ''):
+                facets[row['facet']].append((row['value'], row['n']))
+        for dimension, counts in facets.items():
+            # Sort the TRL levels numerically, everything else by name.
+            key = (lambda item: int(item[0])) if dimension == 'trl' else (lambda item: item[0])
+            counts.sort(key=key)
+        return facets
+
+
+class Project(models.Model):
+    title = models.CharField(max_length=255)
+    field = models.CharField(max_length=100)
+    description = models.TextField(blank=True)
+    trl = models.PositiveSmallIntegerField(
+        blank=True, null=True,
+        help_text="Technology Readiness Level (TRL) of the project (1-9)"
+    )
+    country = models.CharField(max_length=100, blank=True)
+    # Weighted title (A) + description (B) tsvector, maintained by a database
+    # trigger on PostgreSQL. Always NULL on SQLite.
+    search_vector = SearchVectorField(null=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ProjectQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            PortableGinIndex(fields=['search_vector'], name='pages_project_search_gin'),
+            models.Index(fields=['field', 'id'], name='pages_project_field_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    def matching_profiles(self):
+        """TTO profiles whose TRL window contains this project's TRL."""
+        if self.trl is None:
+            return TTOProfile.objects.none()
+        return TTOProfile.objects.with_trl(self.trl)
+
+
+class CompanyQuerySet(models.QuerySet):
+    # Cap on rows the in-process fallback will rank; it only backs the SQLite test config.
+    FALLBACK_LIMIT = 500
+
+    def search(self, query):
+        if not query:
+            return self
+        if is_postgres(self.db):
+            # Both predicates are served by the trigram GIN index on search_text:
+            # LIKE for exact substrings, %> (word_similarity) for misspellings.
+            # search_text is stored lowercased, so a plain LIKE on the bare
+            # column is enough (icontains would wrap it in UPPER() and miss the index).
+            needle = search.normalize(query)
+            return (
+                self.filter(Q(search_text__contains=needle) | Q(search_text__trigram_word_similar=needle))
+                .annotate(similarity=TrigramWordSimilarity(query, 'search_text'))
+                .order_by('-similarity', 'id')
+            )
+        ranked = search.rank_by_word_similarity(
+            query, self.values_list('pk', 'search_text'), limit=self.FALLBACK_LIMIT
+        )
+        if not ranked:
+            return self.none()
+        return (
+            self.filter(pk__in=[pk for pk, _ in ranked])
+            .annotate(similarity=Case(
+                *[When(pk=pk, then=Value(score)) for pk, score in ranked],
+                output_field=FloatField(),
+            ))
+            .order_by('-similarity', 'id')
+        )
+
+
+class Company(models.Model):
+    name = models.CharField(max_length=255)
+    focus = models.JSONField(default=list, blank=True, help_text="Focus areas (e.g., 'AI', 'Patents')")
+    # Lowercased name + focus areas; the trigram index is built on this column.
+    search_text = models.TextField(blank=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = CompanyQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['name', 'id']
+        verbose_name_plural = 'companies'
+        indexes = [
+            PortableGinIndex(fields=['search_text'], name='pages_company_search_trgm', opclasses=['gin_trgm_ops']),
+            # Matches Meta.ordering, for keyset pagination of the unfiltered directory.
+            models.Index(fields=['name', 'id'], name='pages_company_name_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.search_text = search.company_search_text(self.name, self.focus)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.name
+
+
+class RecommendationQuerySet(models.QuerySet):
+    def for_user(self, user):
+        # Served by the (user, rank) unique index.
+        return self.filter(user=user).select_related('project').order_by('rank')
+
+
+class Recommendation(models.Model):
+    """
+    A precomputed project recommendation for a user, maintained by
+    pages.recommendations as profiles and projects change.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='recommendations')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = RecommendationQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['user', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'rank'], name='pages_recommendation_user_rank'),
+        ]
+
+    def __str__(self):
+        return f"#{self.rank} {self.project} for {self.user}"
+
+
+class Notification(models.Model):
+    """
+    A message for one user. Create and mark them through
+    pages.notifications, which keeps User.unread_notifications in step.
+    """
+    # No index of its own: the inbox index below starts with recipient.
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications', db_index=False,
+    )
+    message = models.CharField(max_length=500)
+    url = models.CharField(max_length=500, blank=True)
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # Serves both "unread, newest first" and "read, newest first" per user.
+            models.Index(fields=['recipient', 'is_read', '-created_at', '-id'], name='pages_notif_inbox_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.message} -> {self.recipient}"
+
+
+class OutgoingEmail(models.Model):
+    """
+    A queued email. pages.outbox.OutboxBackend writes these instead of
+    sending; the send_outbox worker delivers them and records the outcome.
+    """
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        SENT = 'sent', 'Sent'
+        FAILED = 'failed', 'Failed'
+
+    subject = models.CharField(max_length=998)
+    body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    cc = models.JSONField(default=list)
+    bcc = models.JSONField(default=list)
+    reply_to = models.JSONField(default=list)
+    headers = models.JSONField(default=dict)
+    # [[content, mimetype], ...], e.g. the HTML part of a password reset.
+    alternatives = models.JSONField(default=list)
+
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['next_attempt_at', 'id']
+        indexes = [
+            # The worker's "what is due" scan.
+            models.Index(fields=['status', 'next_attempt_at'], name='pages_outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
+
+    @property
+    def delivery_latency(self):
+        """Queue-to-delivery time, once sent."""
+        return self.sent_at - self.created_at if self.sent_at else None
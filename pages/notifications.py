@@ -0,0 +1,164 @@
+"""
+Creating and reading notifications.
+
+Every change to a Notification's read state goes through here so that
+User.unread_notifications, which the nav badge shows without a query,
+stays equal to the user's unread rows. The counter is only ever moved by
+the number of rows an UPDATE actually touched, so concurrent requests
+can't drive it out of step.
+
+New notifications are also published (after commit) to the user's open
+notification streams; see pages.broker and ``event_stream``.
+
+``fan_out`` sends one message to many users (e.g. every TTO office
+interested in a funding call's therapeutic areas): recipient ids are
+streamed from one query and each chunk is written with one bulk INSERT and
+one counter UPDATE.
+"""
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from functools import partial
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from accounts.models import TTOProfile, User
+
+from .broker import get_broker
+from .models import Notification
+from .pagination import paginate
+
+logger = logging.getLogger(__name__)
+
+UNREAD_LIMIT = 50
+READ_PER_PAGE = 20
+# Idle streams get a comment line this often so proxies keep them open.
+STREAM_HEARTBEAT = 15
+# How long browsers wait before reconnecting a dropped stream.
+STREAM_RETRY_MS = 5000
+FAN_OUT_BATCH_SIZE = 5000
+
+
+def _adjust_unread(user_id, delta):
+    User.objects.filter(pk=user_id).update(
+        unread_notifications=Greatest(F('unread_notifications') + delta, 0)
+    )
+
+
+def payload(notification):
+    return {
+        'id': notification.pk,
+        'message': notification.message,
+        'url': notification.url,
+        'created_at': notification.created_at.isoformat(),
+    }
+
+
+def notify(recipient, message, url=''):
+    with transaction.atomic():
+        notification = Notification.objects.create(recipient=recipient, message=message, url=url)
+        _adjust_unread(recipient.pk, 1)
+        transaction.on_commit(partial(get_broker().publish, recipient.pk, payload(notification)))
+    return notification
+
+
+@dataclass
+class FanOutResult:
+    recipients: int
+    seconds: float
+
+    @property
+    def per_second(self):
+        return self.recipients / self.seconds if self.seconds else 0.0
+
+
+def recipients_for_tags(tags):
+    """User ids of TTO profiles sharing any of ``tags``, via the GIN index."""
+    return TTOProfile.objects.with_any_tags(tags).order_by().values_list('user_id', flat=True)
+
+
+def _chunks(ids, size):
+    chunk = []
+    for user_id in ids:
+        chunk.append(user_id)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def fan_out(recipient_ids, message, url='', batch_size=FAN_OUT_BATCH_SIZE):
+    """
+    Notify every user in ``recipient_ids``: distinct ids, or a values_list
+    queryset, which is read with a streaming cursor. Each chunk commits on
+    its own.
+    """
+    if hasattr(recipient_ids, 'iterator'):
+        recipient_ids = recipient_ids.iterator(chunk_size=batch_size)
+    broker = get_broker()
+    start = time.perf_counter()
+    sent = 0
+    for chunk in _chunks(recipient_ids, batch_size):
+        with transaction.atomic():
+            created = Notification.objects.bulk_create(
+                [Notification(recipient_id=user_id, message=message, url=url) for user_id in chunk],
+                batch_size=batch_size,
+            )
+            User.objects.filter(pk__in=chunk).update(unread_notifications=F('unread_notifications') + 1)
+            transaction.on_commit(partial(_publish_all, broker, created))
+        sent += len(chunk)
+        elapsed = time.perf_counter() - start
+        logger.info('Fan-out: %d notifications in %.1fs (%.0f/s)', sent, elapsed, sent / elapsed)
+    return FanOutResult(sent, time.perf_counter() - start)
+
+
+def _publish_all(broker, notifications):
+    for notification in notifications:
+        broker.publish(notification.recipient_id, payload(notification))
+
+
+def unread(user, limit=UNREAD_LIMIT):
+    """The newest ``limit`` unread notifications; the badge has the full count."""
+    return list(Notification.objects.filter(recipient=user, is_read=False)[:limit])
+
+
+def read(user, after=None, per_page=READ_PER_PAGE):
+    """One keyset page of read notifications, newest first."""
+    return paginate(Notification.objects.filter(recipient=user, is_read=True), after, per_page)
+
+
+def mark_read(user, notification_ids):
+    with transaction.atomic():
+        changed = Notification.objects.filter(
+            recipient=user, pk__in=notification_ids, is_read=False,
+        ).update(is_read=True)
+        if changed:
+            _adjust_unread(user.pk, -changed)
+    return changed
+
+
+def mark_all_read(user):
+    """One UPDATE over the user's unread rows, however many there are."""
+    with transaction.atomic():
+        changed = Notification.objects.filter(recipient=user, is_read=False).update(is_read=True)
+        if changed:
+            _adjust_unread(user.pk, -changed)
+    return changed
+
+
+async def event_stream(user_id, heartbeat=STREAM_HEARTBEAT):
+    """Server-sent events for ``user_id``'s new notifications, until the client goes away."""
+    yield f'retry: {STREAM_RETRY_MS}\n\n'
+    async with get_broker().subscribe(user_id) as subscription:
+        while True:
+            try:
+                data = await asyncio.wait_for(subscription.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ': keep-alive\n\n'
+                continue
+            yield f'id: {data["id"]}\nevent: notification\ndata: {json.dumps(data)}\n\n'
@@ -0,0 +1,174 @@
+"""
+Database-backed outgoing mail.
+
+With EMAIL_BACKEND = 'pages.outbox.OutboxBackend', send_mail() and friends
+(the password reset form included) only INSERT an OutgoingEmail row, inside
+the request's transaction. ``manage.py send_outbox`` delivers the rows
+through OUTBOX_DELIVERY_BACKEND (normally SMTP), keeping one connection
+open across batches, and retries failures with exponential backoff.
+
+A worker claims a batch in a short transaction by moving the rows'
+next_attempt_at CLAIM_TIMEOUT ahead (a lease: other workers see them as not
+due), then sends with no transaction open and records each outcome in its
+own UPDATE. A slow mail server never holds row locks or a transaction open
+on the database.
+
+Delivery is at least once: a worker that dies after the server accepted a
+message but before recording it will send that message again once the
+lease runs out. Attachments are not supported.
+"""
+import logging
+import time
+from collections import deque
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 6
+BACKOFF_BASE = 30  # seconds; doubles per failed attempt
+BACKOFF_MAX = 60 * 60
+# How long a claimed row is left to its worker; past that it is due again.
+CLAIM_TIMEOUT = 10 * 60
+# Deliveries kept in Worker.latencies for the latency report.
+LATENCY_SAMPLES = 10_000
+RESULT_FIELDS = ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at']
+
+
+class OutboxBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        rows = []
+        for message in email_messages:
+            if message.attachments:
+                raise ValueError('The outbox does not support attachments.')
+            rows.append(OutgoingEmail(
+                subject=message.subject,
+                body=message.body,
+                from_email=message.from_email or settings.DEFAULT_FROM_EMAIL,
+                to=list(message.to),
+                cc=list(message.cc),
+                bcc=list(message.bcc),
+                reply_to=list(message.reply_to),
+                headers=dict(message.extra_headers),
+                alternatives=[list(alternative) for alternative in getattr(message, 'alternatives', [])],
+            ))
+        OutgoingEmail.objects.bulk_create(rows)
+        return len(rows)
+
+
+def to_message(row, connection=None):
+    message = EmailMultiAlternatives(
+        subject=row.subject, body=row.body, from_email=row.from_email,
+        to=row.to, cc=row.cc, bcc=row.bcc, reply_to=row.reply_to,
+        headers=row.headers, connection=connection,
+    )
+    for content, mimetype in row.alternatives:
+        message.attach_alternative(content, mimetype)
+    return message
+
+
+def backoff(attempts):
+    """Seconds to wait after the ``attempts``-th failure."""
+    return min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+
+
+class Worker:
+    """
+    Delivers due rows in batches over one long-lived delivery connection,
+    reopened only after it fails. ``latencies`` holds the queue-to-delivery
+    seconds of the last LATENCY_SAMPLES deliveries, for reporting.
+    """
+
+    def __init__(self, batch_size=BATCH_SIZE, backend=None):
+        self.batch_size = batch_size
+        self.connection = get_connection(
+            backend or getattr(settings, 'OUTBOX_DELIVERY_BACKEND', None), fail_silently=False,
+        )
+        self.opened = False
+        self.connections_opened = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.sent = 0
+        self.failed = 0
+
+    def _ensure_open(self):
+        if not self.opened:
+            self.connection.open()
+            self.opened = True
+            self.connections_opened += 1
+
+    def _reset(self):
+        try:
+            self.connection.close()
+        except Exception:
+            pass
+        self.opened = False
+
+    def close(self):
+        if self.opened:
+            self._reset()
+
+    def claim(self):
+        """Lease a batch of due rows to this worker and commit."""
+        now = timezone.now()
+        with transaction.atomic():
+            # skip_locked: workers claiming at the same moment (PostgreSQL)
+            # take different rows instead of waiting on each other.
+            rows = list(
+                OutgoingEmail.objects.select_for_update(skip_locked=True)
+                .filter(status=OutgoingEmail.Status.PENDING, next_attempt_at__lte=now)
+                .order_by('next_attempt_at', 'id')[:self.batch_size]
+            )
+            OutgoingEmail.objects.filter(pk__in=[row.pk for row in rows]).update(
+                next_attempt_at=now + timedelta(seconds=CLAIM_TIMEOUT),
+            )
+        return rows
+
+    def run_once(self):
+        """Deliver one batch of due rows; returns how many were attempted."""
+        rows = self.claim()
+        for row in rows:
+            self._deliver(row)
+            # Recorded as soon as it's known, so a crash later in the batch
+            # doesn't send this one again.
+            row.save(update_fields=RESULT_FIELDS)
+        return len(rows)
+
+    def _deliver(self, row):
+        row.attempts += 1
+        try:
+            self._ensure_open()
+            self.connection.send_messages([to_message(row, self.connection)])
+        except Exception as exc:
+            # The session state is unknown after a failure; start afresh.
+            self._reset()
+            row.last_error = f'{type(exc).__name__}: {exc}'
+            if row.attempts >= MAX_ATTEMPTS:
+                row.status = OutgoingEmail.Status.FAILED
+                self.failed += 1
+                logger.error('Giving up on email %s after %d attempts: %s', row.pk, row.attempts, row.last_error)
+            else:
+                row.next_attempt_at = timezone.now() + timedelta(seconds=backoff(row.attempts))
+                logger.warning('Email %s failed (attempt %d), retrying: %s', row.pk, row.attempts, row.last_error)
+            return
+        row.status = OutgoingEmail.Status.SENT
+        row.sent_at = timezone.now()
+        row.last_error = ''
+        self.sent += 1
+        self.latencies.append(row.delivery_latency.total_seconds())
+
+    def run(self, interval=1.0, stop=lambda: False):
+        """Poll until ``stop()``; sleeps ``interval`` seconds whenever nothing was due."""
+        try:
+            while not stop():
+                if not self.run_once():
+                    time.sleep(interval)
+        finally:
+            self.close()
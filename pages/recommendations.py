@@ -0,0 +1,168 @@
+"""
+Incremental maintenance of the Recommendation table.
+
+Model signals (see pages.signals) report which TTO profiles and projects
+changed. Changes are collected in a queue and applied in one batch after
+RECOMMENDATIONS_REFRESH_DELAY seconds, so a burst of saves costs one
+refresh. A batch only rescores the profiles whose top list can actually
+change:
+
+* profiles that were saved;
+* profiles that currently recommend a changed project;
+* profiles for which a changed project now beats their lowest-ranked
+  recommendation (or that have free slots);
+* after project deletes, the users that were recommended a deleted
+  project (collected before the rows cascade away).
+
+``rescore`` locks the profiles it rewrites, so two refreshes of the same
+user (the timer thread and an on-commit flush, or two processes) take
+turns instead of inserting over each other's ranks.
+"""
+import logging
+import threading
+from functools import partial
+
+import numpy as np
+from django.conf import settings
+from django.db import connections, transaction
+
+from accounts.models import TTOProfile
+
+from . import matching
+from .cache import bump_version, recommendations_version_name
+from .models import Project, Recommendation
+
+logger = logging.getLogger(__name__)
+
+RECOMMENDATIONS_PER_USER = 10
+
+
+def refresh(profile_ids=(), project_ids=(), refill_users=(), removed_users=(),
+            k=RECOMMENDATIONS_PER_USER):
+    """Apply one batch of changes. Returns the number of profiles rescored."""
+    if removed_users:
+        Recommendation.objects.filter(user_id__in=removed_users).delete()
+        _bump_versions(removed_users)
+
+    affected = set(TTOProfile.objects.filter(pk__in=profile_ids).values_list('pk', flat=True))
+    if project_ids:
+        affected |= _profiles_affected_by_projects(project_ids, k)
+    if refill_users:
+        affected |= set(TTOProfile.objects.filter(user_id__in=refill_users).values_list('pk', flat=True))
+    if affected:
+        rescore(TTOProfile.objects.filter(pk__in=affected), k)
+    return len(affected)
+
+
+def _profiles_affected_by_projects(project_ids, k):
+    # Profiles already recommending one of the projects: its score may have dropped.
+    affected = set(
+        TTOProfile.objects.filter(user__recommendations__project_id__in=project_ids)
+        .values_list('pk', flat=True)
+    )
+    profiles, projects = matching.load_encoded(projects=Project.objects.filter(pk__in=project_ids))
+    if not len(profiles) or not len(projects):
+        return affected
+
+    # Score to beat per profile: its k-th recommendation, or 0 with free slots.
+    full = dict(
+        Recommendation.objects.filter(rank=k, user__ttoprofile__isnull=False)
+        .values_list('user__ttoprofile', 'score')
+    )
+    thresholds = np.array([full.get(int(pk), 0.0) for pk in profiles.ids], dtype=np.float32)
+    best = np.zeros(len(profiles), dtype=np.float32)
+    block_rows = max(1, matching.BLOCK_BYTES // (len(projects) * 4))
+    for start in range(0, len(profiles), block_rows):
+        rows = slice(start, min(start + block_rows, len(profiles)))
+        best[rows] = matching.score_block(profiles, projects, rows).max(axis=1)
+    affected |= {int(pk) for pk in profiles.ids[best > thresholds]}
+    return affected
+
+
+def rescore(profiles, k=RECOMMENDATIONS_PER_USER):
+    """Recompute and replace the recommendation rows of ``profiles``."""
+    with transaction.atomic():
+        # Locked in pk order so concurrent refreshes can't deadlock; whoever
+        # waits scores from the data the other one committed.
+        user_by_profile = dict(profiles.select_for_update().order_by('pk').values_list('pk', 'user_id'))
+        encoded_profiles, encoded_projects = matching.load_encoded(profiles=profiles)
+        indexes, scores = matching.top_k(encoded_profiles, encoded_projects, k)
+        user_ids = [user_by_profile[int(pk)] for pk in encoded_profiles.ids]
+        rows = [
+            Recommendation(user_id=user_id, project_id=int(encoded_projects.ids[j]), score=float(score), rank=rank)
+            for user_id, row, row_scores in zip(user_ids, indexes, scores)
+            for rank, (j, score) in enumerate(zip(row, row_scores), start=1)
+            if score > 0
+        ]
+        Recommendation.objects.filter(user_id__in=user_ids).delete()
+        Recommendation.objects.bulk_create(rows, batch_size=1000)
+        transaction.on_commit(partial(_bump_versions, user_ids))
+
+
+def _bump_versions(user_ids):
+    # Invalidates the ETag of each user's dashboard (see pages.conditional).
+    for user_id in user_ids:
+        bump_version(recommendations_version_name(user_id))
+
+
+def rebuild_all(k=RECOMMENDATIONS_PER_USER):
+    """Recompute every profile's recommendations from scratch."""
+    with transaction.atomic():
+        Recommendation.objects.filter(user__ttoprofile__isnull=True).delete()
+        rescore(TTOProfile.objects.all(), k)
+
+
+class RefreshQueue:
+    """Coalesces change notifications and runs ``refresh`` once per quiet period."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timer = None
+        self._reset()
+
+    def _reset(self):
+        self.profile_ids = set()
+        self.project_ids = set()
+        self.refill_users = set()
+        self.removed_users = set()
+
+    def add(self, profile_ids=(), project_ids=(), refill_users=(), removed_users=()):
+        delay = getattr(settings, 'RECOMMENDATIONS_REFRESH_DELAY', 2.0)
+        with self._lock:
+            self.profile_ids.update(profile_ids)
+            self.project_ids.update(project_ids)
+            self.refill_users.update(refill_users)
+            self.removed_users.update(removed_users)
+            if delay and self._timer is None:
+                self._timer = threading.Timer(delay, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+        if not delay:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            batch = dict(
+                profile_ids=self.profile_ids,
+                project_ids=self.project_ids,
+                refill_users=self.refill_users,
+                removed_users=self.removed_users,
+            )
+            self._reset()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if any(batch.values()):
+            refresh(**batch)
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        except Exception:
+            logger.exception('Recommendation refresh failed')
+        finally:
+            # Timer threads get their own connections; don't leak them.
+            connections.close_all()
+
+
+queue = RefreshQueue()
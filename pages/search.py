@@ -0,0 +1,81 @@
+"""
+In-process trigram matching.
+
+Mirrors the pg_trgm functions used by the company search so the SQLite test
+database (and anything else without pg_trgm) ranks results the same way.
+"""
+import re
+
+# pg_trgm's default pg_trgm.word_similarity_threshold.
+WORD_SIMILARITY_THRESHOLD = 0.6
+
+_WORD_RE = re.compile(r'[^\W_]+')
+
+
+def normalize(text):
+    return ' '.join(_WORD_RE.findall((text or '').lower()))
+
+
+def word_trigrams(word):
+    # pg_trgm pads every word with two spaces in front and one behind.
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def trigrams(text):
+    result = set()
+    for word in normalize(text).split():
+        result |= word_trigrams(word)
+    return result
+
+
+def similarity(a, b):
+    ta, tb = trigrams(a), trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+
+def word_similarity(query, text):
+    """
+    Approximate pg_trgm's word_similarity(query, text): the share of the
+    query's trigrams found in the best-matching run of words in ``text``.
+    """
+    query_trgms = trigrams(query)
+    if not query_trgms:
+        return 0.0
+    words = normalize(text).split()
+    # The whole text is the widest extent, so its overlap bounds every other one.
+    best = len(query_trgms & trigrams(text))
+    if best in (0, len(query_trgms)):
+        return best / len(query_trgms)
+    best = 0
+    for start in range(len(words)):
+        extent = set()
+        for word in words[start:]:
+            extent |= word_trigrams(word)
+            best = max(best, len(query_trgms & extent))
+            if best == len(query_trgms):
+                return 1.0
+    return best / len(query_trgms)
+
+
+def company_search_text(name, focus):
+    """The denormalized text the company trigram index is built on."""
+    return normalize(' '.join([name, *focus]))
+
+
+def rank_by_word_similarity(query, rows, threshold=WORD_SIMILARITY_THRESHOLD, limit=None):
+    """
+    Score ``(pk, text)`` rows against ``query`` and return ``(pk, score)``
+    pairs, best first. Substring hits always match, like the ILIKE half of the
+    Postgres query.
+    """
+    needle = normalize(query)
+    scored = []
+    for pk, text in rows:
+        score = word_similarity(needle, text)
+        if score >= threshold or (needle and needle in text):
+            scored.append((pk, score))
+    scored.sort(key=lambda item: (-item[1], item[0]))
+    return scored[:limit] if limit else scored
@@ -0,0 +1,94 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from accounts.models import TTOProfile, User
+
+from .cache import bump_version, profile_version_name
+from .models import Company, Project, Recommendation
+from .recommendations import queue
+from .typeahead import COMPANY, PROJECT, company_entries, project_entries, typeahead
+
+
+# Queue after commit so the refresh never sees (or misses) uncommitted rows.
+
+@receiver(post_save, sender=TTOProfile, dispatch_uid='recommendations_profile_saved')
+def profile_saved(sender, instance, **kwargs):
+    transaction.on_commit(partial(queue.add, profile_ids=[instance.pk]))
+
+
+@receiver(post_delete, sender=TTOProfile, dispatch_uid='recommendations_profile_deleted')
+def profile_deleted(sender, instance, **kwargs):
+    transaction.on_commit(partial(queue.add, removed_users=[instance.user_id]))
+
+
+@receiver(post_save, sender=Project, dispatch_uid='recommendations_project_saved')
+def project_saved(sender, instance, **kwargs):
+    transaction.on_commit(partial(queue.add, project_ids=[instance.pk]))
+
+
+@receiver(pre_delete, sender=Project, dispatch_uid='recommendations_project_deleted')
+def project_deleting(sender, instance, **kwargs):
+    # Before CASCADE removes the project's Recommendation rows: only the
+    # users they belong to lose a slot that needs refilling.
+    user_ids = list(Recommendation.objects.filter(project=instance).values_list('user_id', flat=True))
+    if user_ids:
+        transaction.on_commit(partial(queue.add, refill_users=user_ids))
+
+
+@receiver(post_save, sender=Project, dispatch_uid='cache_project_saved')
+@receiver(post_delete, sender=Project, dispatch_uid='cache_project_deleted')
+def project_changed(sender, **kwargs):
+    # Bump now so this transaction sees its own change, and again after
+    # commit in case another request re-cached the old rows in between.
+    bump_version('projects')
+    transaction.on_commit(partial(bump_version, 'projects'))
+
+
+@receiver(post_save, sender=Company, dispatch_uid='typeahead_company_saved')
+def company_saved_typeahead(sender, instance, **kwargs):
+    transaction.on_commit(partial(typeahead.update, (COMPANY, instance.pk), company_entries(instance)))
+
+
+@receiver(post_delete, sender=Company, dispatch_uid='typeahead_company_deleted')
+def company_deleted_typeahead(sender, instance, **kwargs):
+    transaction.on_commit(partial(typeahead.update, (COMPANY, instance.pk), []))
+
+
+@receiver(post_save, sender=Project, dispatch_uid='typeahead_project_saved')
+def project_saved_typeahead(sender, instance, **kwargs):
+    transaction.on_commit(partial(typeahead.update, (PROJECT, instance.pk), project_entries(instance)))
+
+
+@receiver(post_delete, sender=Project, dispatch_uid='typeahead_project_deleted')
+def project_deleted_typeahead(sender, instance, **kwargs):
+    transaction.on_commit(partial(typeahead.update, (PROJECT, instance.pk), []))
+
+
+def _bump_profile(user_id):
+    # As for projects: once for this transaction, once after commit.
+    bump_version(profile_version_name(user_id))
+    transaction.on_commit(partial(bump_version, profile_version_name(user_id)))
+
+
+@receiver(post_save, sender=User, dispatch_uid='cache_user_saved')
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # Logging in only touches last_login, which no profile shows.
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    _bump_profile(instance.pk)
+
+
+@receiver(post_save, sender=TTOProfile, dispatch_uid='cache_profile_saved')
+@receiver(post_delete, sender=TTOProfile, dispatch_uid='cache_profile_deleted')
+def tto_profile_changed(sender, instance, **kwargs):
+    _bump_profile(instance.user_id)
+
+
+@receiver(post_save, sender=Company, dispatch_uid='cache_company_saved')
+@receiver(post_delete, sender=Company, dispatch_uid='cache_company_deleted')
+def company_changed(sender, **kwargs):
+    bump_version('companies')
+    transaction.on_commit(partial(bump_version, 'companies'))
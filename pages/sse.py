@@ -0,0 +1,112 @@
+"""
+The notification event stream as a bare ASGI app.
+
+Inside Django's ASGIHandler every request runs in its own
+ThreadSensitiveContext, and the session lookup behind login_required gets a
+thread created for that context. The thread, and the database connection it
+opened, live as long as the response, which for an endless stream means as
+long as the client stays connected: one thread and one connection per open
+tab.
+
+discovery_hub.asgi therefore sends STREAM_PATH here, past Django's handler.
+The session is resolved once on the loop's shared executor
+(``thread_sensitive=False``), that thread's connections are closed, and the
+stream itself (pages.notifications.event_stream) runs on the event loop
+alone.
+"""
+import asyncio
+from importlib import import_module
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.db import connections
+from django.http import HttpRequest, parse_cookie
+from django.shortcuts import resolve_url
+from django.urls import reverse
+
+from .notifications import event_stream
+
+HEADERS = [
+    (b'content-type', b'text/event-stream'),
+    (b'cache-control', b'no-cache'),
+    (b'x-accel-buffering', b'no'),
+]
+
+
+def authenticated_user_id(session_key):
+    """The pk of the user logged in to ``session_key``, or None."""
+    if not session_key:
+        return None
+    try:
+        request = HttpRequest()
+        request.session = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+        user = get_user(request)
+        return user.pk if user.is_authenticated else None
+    finally:
+        # A shared executor thread: don't leave it holding a connection.
+        connections.close_all()
+
+
+def _cookies(scope):
+    for name, value in scope['headers']:
+        if name == b'cookie':
+            return parse_cookie(value.decode('latin-1'))
+    return {}
+
+
+async def _respond(send, status, headers=()):
+    await send({'type': 'http.response.start', 'status': status, 'headers': list(headers)})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def _pump(user_id, send):
+    async for chunk in event_stream(user_id):
+        await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+
+
+async def _disconnected(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def serve(scope, receive, send):
+    if scope['method'] not in ('GET', 'HEAD'):
+        await _respond(send, 405, [(b'allow', b'GET, HEAD')])
+        return
+    user_id = await sync_to_async(authenticated_user_id, thread_sensitive=False)(
+        _cookies(scope).get(settings.SESSION_COOKIE_NAME)
+    )
+    if user_id is None:
+        location = f"{resolve_url(settings.LOGIN_URL)}?{urlencode({'next': scope['path']})}"
+        await _respond(send, 302, [(b'location', location.encode())])
+        return
+
+    await send({'type': 'http.response.start', 'status': 200, 'headers': HEADERS})
+    pump = asyncio.ensure_future(_pump(user_id, send))
+    watch = asyncio.ensure_future(_disconnected(receive))
+    try:
+        await asyncio.wait({pump, watch}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        # Cancelling the pump unsubscribes the stream from the broker.
+        for task in (pump, watch):
+            task.cancel()
+        await asyncio.gather(pump, watch, return_exceptions=True)
+
+
+class NotificationStreamRouter:
+    """Serves the notification stream itself and hands every other request to ``application``."""
+
+    def __init__(self, application):
+        self.application = application
+        self._path = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            if self._path is None:
+                self._path = reverse('notification_stream')
+            path = scope['path'].removeprefix(scope.get('root_path', ''))
+            if path == self._path:
+                return await serve(scope, receive, send)
+        return await self.application(scope, receive, send)
@@ -0,0 +1,16 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from accounts.models import User
+from pages.fragments import render_role_partial
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def role_partial(context, screen):
+    """``{% role_partial "s1" %}``: the current user's role partial for ``screen``, cached per role."""
+    role = getattr(context['request'].user, 'user_type', None)
+    if role not in User.UserType.values:
+        return mark_safe('<p>No role specific content yet.</p>')
+    return mark_safe(render_role_partial(screen, role))
@@ -0,0 +1,223 @@
+"""
+In-memory prefix index for the search-box typeahead.
+
+Every company name, project title and tag is normalized (pages.search) and
+stored once per word it contains, so "gen" finds "Neuro Gen Labs" as well as
+"Genomics". The keys live in one sorted list; a lookup is a bisect to the
+first key >= the prefix followed by a short scan, with no database access.
+
+The WSGI/ASGI entry points start loading the index in the background when
+a server process starts (``warm_up``; AppConfig.ready() is no place for
+queries), and otherwise it loads on first use. The signals in pages.signals
+keep it current: they replace the entries of a saved row and drop those of
+a deleted one. Every write bumps the 'typeahead' cache version, whichever
+process makes it and whether or not that process has the index loaded; a
+process that sees a version it didn't make reloads in the background and
+keeps answering from the old index meanwhile.
+"""
+import bisect
+import logging
+import threading
+
+from django.db import connections
+
+from .cache import bump_version, get_version
+from .search import normalize
+
+logger = logging.getLogger(__name__)
+
+SUGGESTION_LIMIT = 8
+# Very short prefixes match thousands of keys; rank only the first ones.
+MAX_CANDIDATES = 200
+
+COMPANY = 'company'
+PROJECT = 'project'
+TAG = 'tag'
+
+
+def _suffixes(text):
+    """'neuro gen labs' -> [(0, 'neuro gen labs'), (1, 'gen labs'), (2, 'labs')]."""
+    words = normalize(text).split()
+    return [(position, ' '.join(words[position:])) for position in range(len(words))]
+
+
+def company_entries(company):
+    return [(COMPANY, company.pk, company.name)] + [(TAG, tag, tag) for tag in company.focus or ()]
+
+
+def project_entries(project):
+    return [(PROJECT, project.pk, project.title), (TAG, project.field, project.field)]
+
+
+class PrefixIndex:
+    """
+    Sorted ``(key, position, kind, ident)`` tuples plus a label per
+    ``(kind, ident)``. Tags are shared between rows and reference counted.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = []
+        self._labels = {}
+        self._refs = {}
+
+    def __len__(self):
+        return len(self._labels)
+
+    def _add(self, kind, ident, label):
+        item = (kind, ident)
+        self._refs[item] = self._refs.get(item, 0) + 1
+        if self._refs[item] > 1:
+            return []
+        self._labels[item] = label
+        return [(key, position, kind, ident) for position, key in _suffixes(label)]
+
+    def _discard(self, kind, ident):
+        item = (kind, ident)
+        if item not in self._refs:
+            return
+        self._refs[item] -= 1
+        if self._refs[item]:
+            return
+        del self._refs[item]
+        label = self._labels.pop(item)
+        for position, key in _suffixes(label):
+            entry = (key, position, kind, ident)
+            i = bisect.bisect_left(self._keys, entry)
+            if i < len(self._keys) and self._keys[i] == entry:
+                del self._keys[i]
+
+    def load(self, entries):
+        """Replace the whole index with ``(kind, ident, label)`` triples."""
+        fresh = PrefixIndex()
+        keys = [key for kind, ident, label in entries if label for key in fresh._add(kind, ident, label)]
+        keys.sort()
+        with self._lock:
+            self._keys, self._labels, self._refs = keys, fresh._labels, fresh._refs
+
+    def replace(self, old, new):
+        """Swap one row's ``old`` entries for its ``new`` ones."""
+        with self._lock:
+            for kind, ident, _ in old:
+                self._discard(kind, ident)
+            for kind, ident, label in new:
+                if label:
+                    for entry in self._add(kind, ident, label):
+                        bisect.insort(self._keys, entry)
+
+    def suggest(self, prefix, kinds=None, limit=SUGGESTION_LIMIT):
+        """
+        Up to ``limit`` ``(kind, ident, label)`` matches for ``prefix``,
+        labels that start with it first, then shorter labels.
+        """
+        needle = normalize(prefix)
+        if not needle:
+            return []
+        with self._lock:
+            keys, labels = self._keys, self._labels
+            found = {}
+            i = bisect.bisect_left(keys, (needle,))
+            while i < len(keys) and len(found) < MAX_CANDIDATES:
+                key, position, kind, ident = keys[i]
+                if not key.startswith(needle):
+                    break
+                if kinds is None or kind in kinds:
+                    item = (kind, ident)
+                    found[item] = min(found.get(item, position), position)
+                i += 1
+            ranked = sorted(
+                found.items(),
+                key=lambda pair: (pair[1] > 0, len(labels[pair[0]]), labels[pair[0]]),
+            )
+            return [(kind, ident, labels[(kind, ident)]) for (kind, ident), _ in ranked[:limit]]
+
+
+class Typeahead:
+    """The process-wide index, loaded lazily and reloaded when another process writes."""
+
+    VERSION_KEY = 'typeahead'
+
+    def __init__(self):
+        self.index = PrefixIndex()
+        self._lock = threading.Lock()
+        self._version = None
+        self._reloading = False
+        self._rows = {}
+
+    def _load(self):
+        from .models import Company, Project
+
+        rows = {}
+        for company in Company.objects.only('pk', 'name', 'focus').iterator(chunk_size=2000):
+            rows[(COMPANY, company.pk)] = company_entries(company)
+        for project in Project.objects.only('pk', 'title', 'field').iterator(chunk_size=2000):
+            rows[(PROJECT, project.pk)] = project_entries(project)
+        self.index.load([entry for entries in rows.values() for entry in entries])
+        self._rows = rows
+
+    def ensure_loaded(self):
+        version = get_version(self.VERSION_KEY)
+        if self._version is None:
+            with self._lock:
+                if self._version is None:
+                    self._load()
+                    self._version = version
+        elif version != self._version and not self._reloading:
+            self._reloading = True
+            threading.Thread(target=self._reload_in_background, args=(version,), daemon=True).start()
+
+    def warm_up(self):
+        """Load the index in a background thread, e.g. as a server process starts."""
+        thread = threading.Thread(target=self._warm_up, daemon=True)
+        thread.start()
+        return thread
+
+    def _warm_up(self):
+        try:
+            self.ensure_loaded()
+        except Exception:
+            logger.exception('Typeahead warm-up failed')
+        finally:
+            connections.close_all()
+
+    def _reload_in_background(self, version):
+        try:
+            with self._lock:
+                self._load()
+                self._version = version
+        except Exception:
+            logger.exception('Typeahead reload failed')
+        finally:
+            self._reloading = False
+            connections.close_all()
+
+    def reset(self):
+        with self._lock:
+            self.index = PrefixIndex()
+            self._rows = {}
+            self._version = None
+
+    def suggest(self, prefix, kinds=None, limit=SUGGESTION_LIMIT):
+        self.ensure_loaded()
+        return self.index.suggest(prefix, kinds, limit)
+
+    def update(self, row, entries):
+        """Called after commit with a row's current entries (empty once deleted)."""
+        # Under the lock, so an update racing the first load is applied
+        # after it rather than lost.
+        with self._lock:
+            # Tell every other process, even if this one hasn't loaded yet.
+            version = bump_version(self.VERSION_KEY)
+            if self._version is None:
+                # The first lookup here reads the table, this row included.
+                return
+            self.index.replace(self._rows.pop(row, []), entries)
+            if entries:
+                self._rows[row] = entries
+            # This process is current, unless another one wrote since it
+            # last looked; then leave the old version so it reloads.
+            if version == self._version + 1:
+                self._version = version
+
+
+typeahead = Typeahead()
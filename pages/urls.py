@@ -7,10 +7,13 @@ urlpatterns = [
     path('screen2/', views.screen2, name='screen2'),
     path('screen3/', views.screen3, name='screen3'),
     path('notifications/', views.notifications, name='notifications'), # added for notifications page, 
+    path('notifications/read/', views.mark_notifications_read, name='mark_notifications_read'),
+    path('notifications/stream/', views.notification_stream, name='notification_stream'),
     # URL for the Company Home Page (Dashboard)
     path('company/home/', views.company_home, name='company_home'),
     path('university/home/', views.university_home, name='university_home'),
     path('company/profile/', views.company_profile, name='company_profile'),
     path('investor/profile/', views.investor_profile, name='investor_profile'),
     path('university/profile/', views.university_profile, name='university_profile'),
+    path('search/suggest/', views.suggest, name='suggest'),
 ]
@@ -1,11 +1,36 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_POST
 from accounts.models import User
+from discovery_hub.routers import primary_reads, replica_reads
+from . import notifications as notification_service
+from .cache import profile_data, versioned_key
+from .conditional import (
+    company_home_etag, conditional_page, profile_etag, screen_etag, university_home_etag,
+)
+from .models import Company, Project, Recommendation
+from .pagination import page_url, paginate
+from .typeahead import COMPANY, PROJECT, TAG, typeahead
+
+PROJECTS_PER_PAGE = 12
+COMPANIES_PER_PAGE = 20
+# Facet counts are also invalidated whenever a project is saved or deleted.
+FACET_CACHE_TIMEOUT = 300
+# Universities are sent from screen1 to their own dashboard.
+ALL_ROLES = set(User.UserType.values)
+SCREEN1_ROLES = ALL_ROLES - {User.UserType.UNIVERSITY}
+SUGGESTION_KINDS = {
+    COMPANY: {COMPANY, TAG},
+    PROJECT: {PROJECT, TAG},
+}
 
 def welcome(request):
     return render(request, 'welcome.html')
 
 @login_required
+@conditional_page(screen_etag(1, SCREEN1_ROLES))
 def screen1(request):
     if request.user.user_type == User.UserType.UNIVERSITY:
         return redirect('university_home')
@@ -13,33 +38,49 @@ def screen1(request):
     return render(request, 'pages/screen1.html', {'role': role})
 
 @login_required
+@conditional_page(screen_etag(2, ALL_ROLES))
 def screen2(request):
     role = request.user.user_type.title() if hasattr(request.user, 'user_type') else 'User'
     return render(request, 'pages/screen2.html', {'role': role})
 
 @login_required
+@conditional_page(screen_etag(3, ALL_ROLES))
 def screen3(request):
     role = request.user.user_type.title() if hasattr(request.user, 'user_type') else 'User'
     return render(request, 'pages/screen3.html', {'role': role})
 
 @login_required
 def notifications(request): # added for notifications page
-    # This is dummy data for now.
-    current_notifications = [
-        "Your profile was updated.",
-        "You have a new message from Admin.",
-    ]
-    previous_notifications = [
-        "Your password was changed a week ago.",
-        "Welcome to the platform!",
-    ]
+    unread = notification_service.unread(request.user)
+    previous = notification_service.read(request.user, request.GET.get('after'))
     context = {
-        'current_notifications': current_notifications,
-        'previous_notifications': previous_notifications,
+        'current_notifications': unread,
+        'unread_count': request.user.unread_notifications,
+        'previous_notifications': previous,
+        'next_page_url': page_url(request, previous.next_token) if previous.has_next else '',
+        'first_page_url': page_url(request, None),
     }
     return render(request, 'pages/notifications.html', context)
 
+
+def notification_stream(request):
+    # discovery_hub.asgi serves this path with pages.sse before a request
+    # gets here: through Django's handler every open stream would keep a
+    # thread and a database connection. Anything that does reach the view
+    # (WSGI, an ASGI app without the route) gets 204, which tells
+    # EventSource not to reconnect.
+    return HttpResponse(status=204)
+
+
+@login_required
+@require_POST
+def mark_notifications_read(request):
+    notification_service.mark_all_read(request.user)
+    return redirect('notifications')
+
 @login_required
+@conditional_page(university_home_etag)
+@replica_reads
 def university_home(request):
     # Restrict access to only university users
     if request.user.user_type != User.UserType.UNIVERSITY:
@@ -55,76 +96,78 @@ def university_home(request):
         {'title': 'CRISPR Gene Editing Applications', 'field': 'Biology', 'status': 'Ongoing'},
         {'title': 'Sustainable Urban Development', 'field': 'Architecture', 'status': 'Completed'},
     ]
-    all_companies = [
-        {'name': 'Tech Innovators Inc.', 'focus': ['AI', 'Machine Learning']},
-        {'name': 'BioHealth Corp.', 'focus': ['Biotechnology', 'Patents']},
-        {'name': 'GreenEnergy Solutions', 'focus': ['Renewable Energy', 'Research']},
-        {'name': 'QuantumLeap Computing', 'focus': ['Quantum Computing', 'Patents']},
-    ]
 
-    # Search logic for companies
+    # Search logic for companies: trigram similarity, so misspelled queries still match
     query = request.GET.get('q', '')
-    companies = all_companies
-    if query:
-        companies = [c for c in all_companies if query.lower() in c['name'].lower() or any(query.lower() in f.lower() for f in c['focus'])]
+    companies = paginate(Company.objects.search(query), request.GET.get('after'), COMPANIES_PER_PAGE)
+
+    # Precomputed by pages.recommendations; a single indexed lookup by user.
+    recommendations = Recommendation.objects.for_user(request.user)
 
     context = {
         'university_name': request.user.username.title(),
         'funding_updates': funding_updates,
         'research_projects': research_projects,
+        'recommendations': recommendations,
         'companies': companies,
+        'next_page_url': page_url(request, companies.next_token) if companies.has_next else '',
+        'first_page_url': page_url(request, None),
         'current_query': query,
     }
     return render(request, 'pages/university_home.html', context)
 
 
 @login_required
+@conditional_page(company_home_etag)
+@replica_reads
 def company_home(request):
     # Restrict access to only company users
     if request.user.user_type != User.UserType.COMPANY:
         return redirect('screen1') # Redirect if not a company user
 
-    # Placeholder for Project objects.
-    # In a real application, you would import and query your Project model here.
-    all_projects = [
-        {'id': 1, 'title': 'AI-Powered Chatbot for Customer Service', 'field': 'Artificial Intelligence', 'description': 'Developing a chatbot using natural language processing to enhance customer support experience.'},
-        {'id': 2, 'title': 'Sustainable Energy Management System', 'field': 'Renewable Energy', 'description': 'A system to monitor and optimize energy consumption for commercial buildings using IoT.'},
-        {'id': 3, 'title': 'Blockchain for Supply Chain Traceability', 'field': 'Blockchain', 'description': 'Implementing a decentralized ledger to track products from origin to consumer.'},
-        {'id': 4, 'title': 'Personalized Learning Platform', 'field': 'Education Technology', 'description': 'An adaptive platform that customizes learning paths based on student performance and preferences.'},
-        {'id': 5, 'title': 'Predictive Maintenance for Industrial Machinery', 'field': 'Manufacturing', 'description': 'Using machine learning to predict equipment failures and optimize maintenance schedules.'},
-        {'id': 6, 'title': 'Smart City Traffic Management', 'field': 'Urban Planning', 'description': 'Developing an intelligent system to alleviate traffic congestion using real-time data.'},
-    ]
-
-    projects = all_projects
     query = request.GET.get('q')
     field_filter = request.GET.get('field', '')
 
-    if query:
-        projects = [p for p in projects if query.lower() in p['title'].lower() or query.lower() in p['description'].lower()]
-    if field_filter:
-        projects = [p for p in projects if p['field'] == field_filter]
+    # One indexed query: full-text match on the search vector plus the field filter,
+    # continuing after the ?after= cursor instead of using OFFSET.
+    projects = paginate(
+        Project.objects.search(query).in_field(field_filter),
+        request.GET.get('after'),
+        PROJECTS_PER_PAGE,
+    )
 
-    # Get all unique fields for the filter dropdown
-    available_fields = sorted(list(set([p['field'] for p in all_projects])))
+    # Counts for the filter dropdown, over the search results but ignoring the
+    # field filter itself so the other options stay visible.
+    facets_key = versioned_key('projects', 'facets', query or '')
+    facets = cache.get(facets_key)
+    if facets is None:
+        # Counted on the primary: a replica's lagging counts would stay
+        # cached under the new version.
+        with primary_reads():
+            facets = Project.objects.search(query).facet_counts()
+        cache.set(facets_key, facets, FACET_CACHE_TIMEOUT)
+    field_facets = facets['field']
+    if field_filter and field_filter not in dict(field_facets):
+        field_facets = sorted([*field_facets, (field_filter, 0)])
+    available_fields = [field for field, _ in field_facets]
 
     context = {
         'projects': projects,
         'current_query': query if query else '',
         'current_field': field_filter,
         'available_fields': available_fields,
+        'field_facets': field_facets,
+        'facets': facets,
+        'next_page_url': page_url(request, projects.next_token) if projects.has_next else '',
+        'first_page_url': page_url(request, None),
     }
     return render(request, 'pages/company_home.html', context)
 
 
-@login_required
-def company_profile(request):
-    # Restrict access to only company users
-    if request.user.user_type != User.UserType.COMPANY:
-        return redirect('screen1') # Redirect if not a company user
-
+def _company_profile_data(user):
     # This is dummy data for now, inspired by LinkedIn company profiles.
-    company_data = {
-        'name': request.user.username.title(),
+    return {
+        'name': user.username.title(),
         'tagline': 'Innovating for a better future, one line of code at a time.',
         'about': 'We are a forward-thinking technology company specializing in custom software solutions that drive business growth. Our mission is to empower our clients through innovative technology and expert consulting. We believe in creating partnerships, not just products.',
         'website': 'https://example.com',
@@ -158,22 +201,27 @@ def company_profile(request):
             },
         ]
     }
-    
+
+
+@login_required
+@conditional_page(profile_etag('company'))
+@replica_reads
+def company_profile(request):
+    # Restrict access to only company users
+    if request.user.user_type != User.UserType.COMPANY:
+        return redirect('screen1') # Redirect if not a company user
+
+    # Cached per user; pages.signals bumps the version when the profile changes.
     context = {
-        'company': company_data,
+        'company': profile_data(request.user, 'company', _company_profile_data),
     }
     return render(request, 'pages/company_profile.html', context)
 
 
-@login_required
-def investor_profile(request):
-    # Restrict access to only investor users
-    if request.user.user_type != User.UserType.INVESTOR:
-        return redirect('screen1') # Redirect if not an investor user
-
+def _investor_profile_data(user):
     # This is dummy data for now, inspired by LinkedIn/AngelList profiles.
-    investor_data = {
-        'name': request.user.display_name,
+    return {
+        'name': user.display_name,
         'title': 'Managing Partner',
         'firm': 'Venture Capital Partners',
         'location': 'Silicon Valley, CA',
@@ -199,22 +247,29 @@ def investor_profile(request):
             },
         ],
     }
-    
+
+
+@login_required
+@conditional_page(profile_etag('investor'))
+@replica_reads
+def investor_profile(request):
+    # Restrict access to only investor users
+    if request.user.user_type != User.UserType.INVESTOR:
+        return redirect('screen1') # Redirect if not an investor user
+
+    # Cached per user; pages.signals bumps the version when the profile changes.
     context = {
-        'investor': investor_data,
+        'investor': profile_data(request.user, 'investor', _investor_profile_data),
     }
     return render(request, 'pages/investor_profile.html', context)
 
 
-@login_required
-def university_profile(request):
-    # Restrict access to only university users
-    if request.user.user_type != User.UserType.UNIVERSITY:
-        return redirect('screen1') # Redirect if not a university user
-
-    # This is dummy data for now.
-    university_data = {
-        'name': request.user.username.title(),
+def _university_profile_data(user):
+    # Loaded with the user by accounts.backends.ProfileModelBackend.
+    profile = getattr(user, 'ttoprofile', None)
+    # This is dummy data for now, apart from the institution name.
+    return {
+        'name': profile.institution_name if profile and profile.institution_name else user.username.title(),
         'location': 'Innovation City, Knowledge State',
         'about': 'A leading institution for higher education and research, committed to academic excellence and fostering innovation. We have a rich history of producing leaders and pioneers in various fields.',
         'website': 'https://university.example.edu',
@@ -238,8 +293,30 @@ def university_profile(request):
             },
         ],
     }
-    
+
+
+@login_required
+@conditional_page(profile_etag('university'))
+@replica_reads
+def university_profile(request):
+    # Restrict access to only university users
+    if request.user.user_type != User.UserType.UNIVERSITY:
+        return redirect('screen1') # Redirect if not a university user
+
+    # Cached per user; pages.signals bumps the version when the profile changes.
     context = {
-        'university': university_data,
+        'university': profile_data(request.user, 'university', _university_profile_data),
     }
     return render(request, 'pages/university_profile.html', context)
+
+
+@login_required
+def suggest(request):
+    """Typeahead for the search boxes, answered from the in-memory prefix index."""
+    query = request.GET.get('q', '')
+    kinds = SUGGESTION_KINDS.get(request.GET.get('type'))
+    suggestions = typeahead.suggest(query, kinds)
+    return JsonResponse({
+        'query': query,
+        'results': [{'type': kind, 'id': ident, 'label': label} for kind, ident, label in suggestions],
+    })
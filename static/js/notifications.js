@@ -0,0 +1,15 @@
+// Keeps the nav badge current from the notification event stream.
+(function () {
+  var link = document.querySelector("a[data-stream-url]");
+  if (!link || !window.EventSource) {
+    return;
+  }
+  var badge = link.querySelector(".badge");
+  var source = new EventSource(link.dataset.streamUrl);
+
+  source.addEventListener("notification", function () {
+    var count = parseInt(badge.textContent, 10) || 0;
+    badge.textContent = count + 1;
+    badge.hidden = false;
+  });
+})();
@@ -0,0 +1,41 @@
+// Fills the <datalist> of any input with data-suggest-url from the typeahead endpoint.
+(function () {
+  function attach(input) {
+    var list = document.getElementById(input.getAttribute("list"));
+    var url = input.dataset.suggestUrl;
+    var timer = null;
+    var latest = "";
+
+    input.addEventListener("input", function () {
+      clearTimeout(timer);
+      var query = input.value.trim();
+      if (!query) {
+        list.innerHTML = "";
+        return;
+      }
+      timer = setTimeout(function () {
+        latest = query;
+        fetch(url + (url.indexOf("?") < 0 ? "?" : "&") + "q=" + encodeURIComponent(query), {
+          credentials: "same-origin",
+        })
+          .then(function (response) { return response.json(); })
+          .then(function (data) {
+            if (data.query !== latest) {
+              return; // a newer request is on its way
+            }
+            list.innerHTML = "";
+            data.results.forEach(function (result) {
+              var option = document.createElement("option");
+              option.value = result.label;
+              list.appendChild(option);
+            });
+          })
+          .catch(function () {});
+      }, 80);
+    });
+  }
+
+  document.addEventListener("DOMContentLoaded", function () {
+    document.querySelectorAll("input[data-suggest-url]").forEach(attach);
+  });
+})();
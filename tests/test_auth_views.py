@@ -0,0 +1,120 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import authenticate, base_user
+from django.contrib.auth.hashers import verify_password
+from django.contrib.auth.signals import user_login_failed
+from django.test import TestCase, override_settings
+from django.urls import include, path, reverse
+
+from accounts.models import User
+from accounts.views import async_login, async_register
+
+REGISTRATION = {
+    'email': 'new.user@example.com',
+    'password1': 'Str0ng-enough-pass',
+    'password2': 'Str0ng-enough-pass',
+    'user_type': User.UserType.UNIVERSITY,
+}
+
+
+class RegisterViewTests(TestCase):
+    def test_register_creates_and_logs_in_user(self):
+        response = self.client.post(reverse('register'), REGISTRATION)
+        self.assertRedirects(response, reverse('screen1'), fetch_redirect_response=False)
+        user = User.objects.get(email=REGISTRATION['email'])
+        self.assertTrue(user.check_password(REGISTRATION['password1']))
+        self.assertEqual(int(self.client.session['_auth_user_id']), user.pk)
+
+
+class AuthenticateTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(username='ada', email='ada@example.com', password='password123')
+
+    def hashes(self, email, password):
+        with mock.patch.object(base_user, 'check_password', wraps=base_user.check_password) as check, \
+                mock.patch.object(base_user, 'make_password', wraps=base_user.make_password) as make:
+            user = authenticate(email=email, password=password)
+        return user, check.call_count + make.call_count
+
+    def test_login(self):
+        user, hashes = self.hashes('ADA@example.com', 'password123')
+        self.assertEqual(user.email, 'ada@example.com')
+        self.assertEqual(hashes, 1)
+
+    def test_failed_login_hashes_once(self):
+        # ModelBackend, listed after ProfileModelBackend, isn't tried again.
+        self.assertEqual(self.hashes('ada@example.com', 'wrong'), (None, 1))
+        self.assertEqual(self.hashes('nobody@example.com', 'password123'), (None, 1))
+
+
+urlpatterns = [
+    path('accounts/login/', async_login, name='login'),
+    path('accounts/register/', async_register, name='register'),
+    path('', include('discovery_hub.urls')),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncAuthViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='companyuser',
+            email='company@example.com',
+            password='password123',
+            user_type=User.UserType.COMPANY
+        )
+
+    async def test_login(self):
+        response = await self.async_client.post(
+            reverse('login'), {'username': 'Company@Example.com', 'password': 'password123'},
+        )
+        self.assertRedirects(response, reverse('company_home'), fetch_redirect_response=False)
+        response = await self.async_client.get(reverse('company_home'))
+        self.assertEqual(response.status_code, 200)
+
+    async def test_wrong_password(self):
+        failures = []
+
+        def record(sender, credentials, **kwargs):
+            failures.append(credentials['username'])
+
+        user_login_failed.connect(record)
+        self.addCleanup(user_login_failed.disconnect, record)
+        response = await self.async_client.post(
+            reverse('login'), {'username': 'company@example.com', 'password': 'wrong'},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].non_field_errors())
+        self.assertEqual(failures, ['company@example.com'])
+
+    async def test_hashing_runs_in_the_pool(self):
+        threads = []
+
+        def verify(*args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return verify_password(*args, **kwargs)
+
+        with mock.patch('accounts.hashing.verify_password', side_effect=verify):
+            await self.async_client.post(
+                reverse('login'), {'username': 'company@example.com', 'password': 'password123'},
+            )
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads[0].startswith('password-hashing'))
+
+    async def test_login_page_remembers_type(self):
+        response = await self.async_client.get(reverse('login'), {'type': 'investor'})
+        self.assertContains(response, 'Log In as Investor')
+        self.assertEqual(await self.async_client.session.aget('selected_user_type'), 'investor')
+
+    async def test_register(self):
+        response = await self.async_client.post(reverse('register'), REGISTRATION)
+        self.assertRedirects(response, reverse('screen1'), fetch_redirect_response=False)
+        user = await User.objects.aget(email=REGISTRATION['email'])
+        self.assertTrue(await user.acheck_password(REGISTRATION['password1']))
+        self.assertEqual(int(await self.async_client.session.aget('_auth_user_id')), user.pk)
+
+    async def test_register_rejects_taken_email(self):
+        response = await self.async_client.post(reverse('register'), {**REGISTRATION, 'email': 'COMPANY@example.com'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].errors)
@@ -0,0 +1,45 @@
+from django.test import TestCase
+from django.urls import reverse
+from accounts.models import User
+from pages.models import Company
+from pages import search
+
+
+class TrigramTests(TestCase):
+    def test_trigrams_match_pg_trgm_padding(self):
+        self.assertEqual(search.trigrams('Cat'), {'  c', ' ca', 'cat', 'at '})
+
+    def test_word_similarity_tolerates_typos(self):
+        self.assertGreaterEqual(search.word_similarity('quantumleep', 'quantumleap computing'), 0.6)
+        self.assertLess(search.word_similarity('oncology', 'quantumleap computing'), 0.6)
+
+
+class CompanySearchTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(
+            username='uniuser',
+            email='uni@example.com',
+            password='password123',
+            user_type=User.UserType.UNIVERSITY
+        )
+        self.client.login(email='uni@example.com', password='password123')
+        self.url = reverse('university_home')
+
+    def test_search_text_is_kept_in_sync(self):
+        company = Company.objects.create(name='NeuroGen Labs', focus=['Neurology'])
+        self.assertEqual(company.search_text, 'neurogen labs neurology')
+
+    def test_misspelled_query_still_matches(self):
+        response = self.client.get(self.url, {'q': 'Quantm Leap'})
+        self.assertEqual([c.name for c in response.context['companies']], ['QuantumLeap Computing'])
+
+    def test_focus_area_matches(self):
+        response = self.client.get(self.url, {'q': 'patents'})
+        self.assertEqual(
+            {c.name for c in response.context['companies']},
+            {'BioHealth Corp.', 'QuantumLeap Computing'},
+        )
+
+    def test_empty_query_lists_all_companies(self):
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.context['companies']), Company.objects.count())
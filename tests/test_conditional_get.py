@@ -0,0 +1,95 @@
+from django.core.cache import cache
+from django.core.checks import run_checks
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+from pages.models import Company, Project
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def login(self, user_type):
+        user = User.objects.create_user(
+            username=f'{user_type}user',
+            email=f'{user_type}@example.com',
+            password='password123',
+            user_type=user_type
+        )
+        self.client.login(email=f'{user_type}@example.com', password='password123')
+        # The first page sets the CSRF cookie, which is part of every ETag.
+        self.client.get(reverse('screen2'))
+        return user
+
+    def revalidate(self, url, etag, **params):
+        return self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+
+    def test_every_page_answers_304_when_unchanged(self):
+        pages = {
+            User.UserType.COMPANY: ['screen1', 'screen2', 'screen3', 'company_home', 'company_profile'],
+            User.UserType.UNIVERSITY: ['screen2', 'screen3', 'university_home', 'university_profile'],
+            User.UserType.INVESTOR: ['screen1', 'investor_profile'],
+        }
+        for user_type, names in pages.items():
+            self.login(user_type)
+            for name in names:
+                with self.subTest(name=name, user_type=user_type):
+                    response = self.client.get(reverse(name))
+                    self.assertEqual(response.status_code, 200)
+                    self.assertIn('no-cache', response['Cache-Control'])
+                    response = self.revalidate(reverse(name), response['ETag'])
+                    self.assertEqual(response.status_code, 304)
+                    self.assertEqual(response.content, b'')
+
+    def test_project_change_invalidates_company_home(self):
+        self.login(User.UserType.COMPANY)
+        url = reverse('company_home')
+        etag = self.client.get(url)['ETag']
+        Project.objects.create(title='New Project', field='Physics', description='')
+        self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+    def test_query_string_is_part_of_the_etag(self):
+        self.login(User.UserType.COMPANY)
+        url = reverse('company_home')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.revalidate(url, etag, q='energy').status_code, 200)
+
+    def test_company_change_invalidates_university_home(self):
+        self.login(User.UserType.UNIVERSITY)
+        url = reverse('university_home')
+        etag = self.client.get(url)['ETag']
+        Company.objects.create(name='Fresh Ventures', focus=['AI'])
+        self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+    def test_user_change_invalidates_profile(self):
+        user = self.login(User.UserType.INVESTOR)
+        url = reverse('investor_profile')
+        etag = self.client.get(url)['ETag']
+        user.first_name = 'Ada'
+        user.save()
+        self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+    def test_wrong_role_still_redirects(self):
+        self.login(User.UserType.UNIVERSITY)
+        response = self.client.get(reverse('screen1'))
+        self.assertRedirects(response, reverse('university_home'))
+        self.assertFalse(response.has_header('ETag'))
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    def errors(self):
+        return [error.id for error in run_checks(include_deployment_checks=True) if error.id.startswith('pages.')]
+
+    def test_process_local_cache_fails_deploy_check(self):
+        self.assertEqual(self.errors(), ['pages.E001'])
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://cache:6379/0',
+    }})
+    def test_shared_cache_passes(self):
+        self.assertEqual(self.errors(), [])
+
+    def test_not_a_development_check(self):
+        self.assertFalse([error for error in run_checks() if error.id.startswith('pages.')])
@@ -0,0 +1,51 @@
+from unittest import mock
+
+from django.db import connections
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import User
+from discovery_hub.pool import pool_stats
+
+
+class FakePool:
+    def get_stats(self):
+        return {
+            'pool_min': 2, 'pool_max': 10, 'pool_size': 4, 'pool_available': 1,
+            'requests_waiting': 2, 'requests_num': 50, 'requests_queued': 5,
+            'requests_wait_ms': 120, 'requests_errors': 1, 'connections_num': 6,
+        }
+
+
+class PoolStatsTests(TestCase):
+    def test_unpooled_alias(self):
+        self.assertIsNone(pool_stats()['default'])
+
+    def test_pooled_alias(self):
+        with mock.patch.object(connections['default'], 'pool', FakePool(), create=True):
+            stats = pool_stats()['default']
+        self.assertEqual(stats['in_use'], 3)
+        self.assertEqual(stats['available'], 1)
+        self.assertEqual(stats['waiting'], 2)
+        self.assertEqual(stats['wait_ms_total'], 120)
+        self.assertEqual(stats['wait_ms_mean'], 24.0)
+        self.assertEqual(stats['timeouts'], 1)
+        self.assertEqual(stats['connections_lost'], 0)
+
+
+class PoolStatsViewTests(TestCase):
+    def setUp(self):
+        User.objects.create_superuser(username='admin', email='admin@example.com', password='password123')
+        User.objects.create_user(username='ada', email='ada@example.com', password='password123')
+
+    def test_staff_only(self):
+        self.client.login(email='ada@example.com', password='password123')
+        response = self.client.get(reverse('db_pool_stats'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_reports_every_alias(self):
+        self.client.login(email='admin@example.com', password='password123')
+        response = self.client.get(reverse('db_pool_stats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertEqual(response.json()['pools'], {alias: None for alias in connections})
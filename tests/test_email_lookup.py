@@ -0,0 +1,96 @@
+from django.contrib.auth import authenticate
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.forms import CustomPasswordResetForm
+from accounts.models import User
+
+INDEX = 'accounts_user_email_lower_uniq'
+
+
+def query_plan(sql):
+    """The database's plan for ``sql``, as one string."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # The test tables are tiny; make the planner show whether it
+            # *can* use the index rather than whether it's worth it.
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('EXPLAIN ' + sql)
+        else:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+        return '\n'.join(str(row) for row in cursor.fetchall())
+
+
+def email_lookups(captured):
+    return [
+        q['sql'] for q in captured.captured_queries
+        if q['sql'].startswith('SELECT') and 'LOWER(' in q['sql'].upper() and 'accounts_user' in q['sql']
+    ]
+
+
+class CaseInsensitiveEmailTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='mixedcase',
+            email='Mixed.Case@Example.com',
+            password='password123',
+            user_type=User.UserType.COMPANY
+        )
+
+    def test_authenticate_ignores_case(self):
+        self.assertEqual(authenticate(email='mixed.case@example.com', password='password123'), self.user)
+        self.assertEqual(authenticate(email='MIXED.CASE@EXAMPLE.COM', password='password123'), self.user)
+        self.assertIsNone(authenticate(email='mixed.case@example.com', password='wrong'))
+
+    def test_login_view_ignores_case(self):
+        response = self.client.post(
+            reverse('login'), {'username': 'mixed.case@EXAMPLE.com', 'password': 'password123'},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(int(self.client.session['_auth_user_id']), self.user.pk)
+
+    def test_password_reset_ignores_case(self):
+        form = CustomPasswordResetForm({'email': 'mixed.case@example.com'})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(list(form.get_users(form.cleaned_data['email'])), [self.user])
+
+    def test_emails_differing_only_in_case_are_rejected(self):
+        with self.assertRaises(ValidationError):
+            User(username='other', email='MIXED.case@example.com').validate_constraints()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create_user(username='other', email='mixed.case@example.com', password='password123')
+
+
+class EmailIndexPlanTests(TestCase):
+    """The login and password reset lookups are served by the lower(email) index."""
+
+    def setUp(self):
+        User.objects.create_user(
+            username='planuser',
+            email='Plan.User@example.com',
+            password='password123',
+            user_type=User.UserType.UNIVERSITY
+        )
+
+    def assertUsesEmailIndex(self, captured):
+        lookups = email_lookups(captured)
+        self.assertTrue(lookups)
+        for sql in lookups:
+            plan = query_plan(sql)
+            self.assertIn(INDEX, plan)
+            self.assertNotIn('SCAN accounts_user', plan)
+            self.assertNotIn('Seq Scan', plan)
+
+    def test_login_uses_index(self):
+        with CaptureQueriesContext(connection) as captured:
+            self.assertTrue(self.client.login(email='plan.user@EXAMPLE.com', password='password123'))
+        self.assertUsesEmailIndex(captured)
+
+    def test_password_reset_uses_index(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.post(reverse('password_reset'), {'email': 'PLAN.USER@example.com'})
+        self.assertEqual(response.status_code, 302)
+        self.assertUsesEmailIndex(captured)
@@ -0,0 +1,111 @@
+import csv
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts import exporter
+from accounts.models import TTOProfile, User
+
+
+class ExportAccountsTests(TestCase):
+    def setUp(self):
+        self.university = User.objects.create_user(
+            username='tto', email='tto@uni.example', password='password123',
+            first_name='Tess', user_type=User.UserType.UNIVERSITY,
+        )
+        TTOProfile.objects.create(
+            user=self.university, institution_name='North University',
+            therapeutic_focus_tags=['Oncology', 'Cardiology'],
+            trl_range_interest_min=3, trl_range_interest_max=6,
+        )
+        self.company = User.objects.create_user(
+            username='corp', email='corp@corp.example', password='password123', user_type=User.UserType.COMPANY,
+        )
+
+    def test_csv_lines(self):
+        rows = list(csv.DictReader(io.StringIO(''.join(exporter.export_lines(format='csv')))))
+
+        self.assertEqual([row['email'] for row in rows], ['tto@uni.example', 'corp@corp.example'])
+        self.assertEqual(rows[0]['institution_name'], 'North University')
+        self.assertEqual(rows[0]['therapeutic_focus_tags'], 'Oncology, Cardiology')
+        self.assertEqual(rows[0]['trl_range_interest_min'], '3')
+        self.assertEqual(rows[1]['institution_name'], '')
+        self.assertNotIn('password', rows[0])
+
+    def test_admin_action_streams(self):
+        User.objects.create_superuser(username='admin', email='admin@example.com', password='password123')
+        self.client.login(email='admin@example.com', password='password123')
+
+        response = self.client.post(reverse('admin:accounts_user_changelist'), {
+            'action': 'export_jsonl', '_selected_action': [self.university.pk, self.company.pk],
+        })
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertIn('attachment; filename="accounts-', response['Content-Disposition'])
+        records = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([record['email'] for record in records], ['tto@uni.example', 'corp@corp.example'])
+        self.assertEqual(records[0]['therapeutic_focus_tags'], ['Oncology', 'Cardiology'])
+        self.assertIsNone(records[1]['therapeutic_focus_tags'])
+
+    def test_command_stdout_filters_by_type(self):
+        out = io.StringIO()
+        call_command('export_accounts', '--user-type', 'company', stdout=out)
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual([row['email'] for row in rows], ['corp@corp.example'])
+
+    @override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+    def test_round_trip_through_import(self):
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        call_command('export_accounts', '--output', path, '--chunk-size', '1', stderr=io.StringIO())
+        User.objects.all().delete()
+
+        call_command('import_accounts', path, '--workers', '0', stdout=io.StringIO(), stderr=io.StringIO())
+
+        profile = TTOProfile.objects.get(user__email='tto@uni.example')
+        self.assertEqual(profile.institution_name, 'North University')
+        self.assertEqual(profile.therapeutic_focus_tags, ['Oncology', 'Cardiology'])
+        self.assertEqual(User.objects.get(email='corp@corp.example').user_type, User.UserType.COMPANY)
+
+    def spreadsheet_unsafe_user(self):
+        user = User.objects.create_user(
+            username='evil', email='evil@uni.example', password='password123',
+            last_name='=HYPERLINK("http://evil.example")', user_type=User.UserType.UNIVERSITY,
+        )
+        TTOProfile.objects.create(
+            user=user, institution_name='@SUM(A1)', office_name='-',
+            therapeutic_focus_tags=['Cell, gene therapy', 'Oncology'],
+        )
+
+    def test_csv_escapes_formulas_and_quotes_tags(self):
+        self.spreadsheet_unsafe_user()
+        rows = list(csv.DictReader(io.StringIO(''.join(exporter.export_lines(format='csv')))))
+        row = rows[-1]
+        self.assertEqual(row['last_name'], '\'=HYPERLINK("http://evil.example")')
+        self.assertEqual(row['institution_name'], "'@SUM(A1)")
+        self.assertEqual(row['office_name'], "'-")
+        self.assertEqual(row['therapeutic_focus_tags'], '"Cell, gene therapy", Oncology')
+
+    @override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+    def test_escaped_values_round_trip(self):
+        self.spreadsheet_unsafe_user()
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        call_command('export_accounts', '--output', path, stderr=io.StringIO())
+        User.objects.all().delete()
+
+        call_command('import_accounts', path, '--workers', '0', stdout=io.StringIO(), stderr=io.StringIO())
+
+        user = User.objects.select_related('ttoprofile').get(email='evil@uni.example')
+        self.assertEqual(user.last_name, '=HYPERLINK("http://evil.example")')
+        self.assertEqual(user.ttoprofile.institution_name, '@SUM(A1)')
+        self.assertEqual(user.ttoprofile.office_name, '-')
+        self.assertEqual(user.ttoprofile.therapeutic_focus_tags, ['Cell, gene therapy', 'Oncology'])
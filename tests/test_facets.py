@@ -0,0 +1,68 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import User
+from pages.models import Project
+
+
+class ProjectFacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Project.objects.all().delete()
+        Project.objects.create(title='Solar Grid', field='Energy', description='', trl=4, country='DE')
+        Project.objects.create(title='Wind Farm', field='Energy', description='', trl=7, country='DK')
+        Project.objects.create(title='Gene Panel', field='Biology', description='', trl=4, country='DE')
+        Project.objects.create(title='Lab Robot', field='Robotics', description='')
+
+    def test_counts_per_dimension(self):
+        facets = Project.objects.facet_counts()
+        self.assertEqual(facets['field'], [('Biology', 1), ('Energy', 2), ('Robotics', 1)])
+        self.assertEqual(facets['trl'], [('4', 2), ('7', 1)])
+        self.assertEqual(facets['country'], [('DE', 2), ('DK', 1)])
+
+    def test_counts_follow_the_queryset(self):
+        facets = Project.objects.filter(field='Energy').facet_counts(['country'])
+        self.assertEqual(facets, {'country': [('DE', 1), ('DK', 1)]})
+
+    def test_single_query(self):
+        with self.assertNumQueries(1):
+            Project.objects.facet_counts()
+
+
+class CompanyHomeFacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(
+            username='companyuser',
+            email='company@example.com',
+            password='password123',
+            user_type=User.UserType.COMPANY
+        )
+        self.client.login(email='company@example.com', password='password123')
+        self.url = reverse('company_home')
+
+    def field_counts(self, **params):
+        return dict(self.client.get(self.url, params).context['field_facets'])
+
+    def test_dropdown_shows_counts(self):
+        Project.objects.create(title='Another Chain', field='Blockchain', description='')
+        response = self.client.get(self.url)
+        expected = Project.objects.filter(field='Blockchain').count()
+        self.assertContains(response, f'Blockchain ({expected})')
+
+    def test_counts_ignore_the_field_filter(self):
+        unfiltered = self.field_counts()
+        self.assertEqual(self.field_counts(field='Blockchain'), unfiltered)
+
+    def test_facets_are_cached_and_invalidated(self):
+        before = self.field_counts()
+        # A cached request only pays for the session, user and the page of projects.
+        self.client.get(self.url)
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+
+        Project.objects.create(title='Fresh Idea', field='Quantum', description='')
+        after = self.field_counts()
+        self.assertNotIn('Quantum', before)
+        self.assertEqual(after['Quantum'], 1)
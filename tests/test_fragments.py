@@ -0,0 +1,55 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import User
+from pages import fragments
+
+
+class RolePartialCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def login(self, username, user_type):
+        User.objects.create_user(
+            username=username,
+            email=f'{username}@example.com',
+            password='password123',
+            user_type=user_type
+        )
+        self.client.login(email=f'{username}@example.com', password='password123')
+
+    def test_each_role_gets_its_partial(self):
+        for screen in ('screen2', 'screen3'):
+            for user_type in User.UserType.values:
+                with self.subTest(screen=screen, user_type=user_type):
+                    self.login(f'{screen}{user_type}', user_type)
+                    response = self.client.get(reverse(screen))
+                    self.assertContains(response, f'<h1>S{screen[-1]} {user_type.title()}</h1>', html=True)
+
+    def test_partial_rendered_once_per_role(self):
+        with mock.patch.object(fragments, 'render_to_string', wraps=fragments.render_to_string) as render:
+            self.login('first', User.UserType.COMPANY)
+            self.client.get(reverse('screen1'))
+            self.login('second', User.UserType.COMPANY)
+            response = self.client.get(reverse('screen1'))
+        self.assertEqual(render.call_count, 1)
+        # The per-user header still renders on every request.
+        self.assertContains(response, 'Hello second')
+        self.assertContains(response, 'S1 Company')
+
+    def test_invalidation(self):
+        with mock.patch.object(fragments, 'render_to_string', return_value='<p>old</p>'):
+            self.assertEqual(fragments.render_role_partial('s2', 'investor'), '<p>old</p>')
+        self.assertEqual(fragments.render_role_partial('s2', 'investor'), '<p>old</p>')
+
+        call_command('invalidate_fragments', stdout=mock.Mock())
+        self.assertIn('S2 Investor', fragments.render_role_partial('s2', 'investor'))
+
+    def test_key_follows_template_source(self):
+        key = fragments.fragment_key('s3', 'university')
+        with mock.patch.object(fragments, 'template_version', return_value='edited'):
+            self.assertNotEqual(fragments.fragment_key('s3', 'university'), key)
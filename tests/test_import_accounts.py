@@ -0,0 +1,95 @@
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from accounts.importer import Importer
+from accounts.models import TTOProfile, User
+
+CSV = """email,password,first_name,last_name,user_type,institution_name,therapeutic_focus_tags,trl_range_interest_min,trl_range_interest_max
+alice@uni.example,alice-pass,Alice,Ng,university,North University,"Oncology, Cardiology",3,6
+bob@corp.example,bob-pass,Bob,Li,company,,,,
+carol@uni.example,,Carol,,,South Institute,,,
+not-an-email,x,,,university,,,,
+dave@uni.example,x,,,university,,,7,2
+ALICE@uni.example,again,,,university,,,,
+"""
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ImportAccountsTests(TestCase):
+    def write(self, suffix, content):
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def run_command(self, path, *args):
+        out, err = io.StringIO(), io.StringIO()
+        call_command('import_accounts', path, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_csv(self):
+        out, err = self.run_command(self.write('.csv', CSV), '--workers', '0', '--batch-size', '2')
+
+        self.assertIn('Created 3 accounts (2 TTO profiles)', out)
+        self.assertIn('skipped 1 existing or repeated, 2 invalid', out)
+        self.assertIn('/s', out)
+        self.assertIn('line 5:', err)
+        self.assertIn('line 6:', err)
+
+        alice = User.objects.get(email='alice@uni.example')
+        self.assertEqual(alice.username, 'alice@uni.example')
+        self.assertTrue(alice.check_password('alice-pass'))
+        self.assertEqual(alice.ttoprofile.institution_name, 'North University')
+        self.assertEqual(alice.ttoprofile.therapeutic_focus_tags, ['Oncology', 'Cardiology'])
+        self.assertEqual((alice.ttoprofile.trl_range_interest_min, alice.ttoprofile.trl_range_interest_max), (3, 6))
+
+        bob = User.objects.get(email='bob@corp.example')
+        self.assertEqual(bob.user_type, User.UserType.COMPANY)
+        self.assertFalse(TTOProfile.objects.filter(user=bob).exists())
+
+        carol = User.objects.get(email='carol@uni.example')
+        self.assertEqual(carol.user_type, User.UserType.UNIVERSITY)
+        self.assertFalse(carol.has_usable_password())
+
+    def test_jsonl_with_process_pool(self):
+        lines = [
+            {'email': f'user{i}@uni.example', 'password': f'pass-{i}', 'therapeutic_focus_tags': ['Neurology']}
+            for i in range(10)
+        ]
+        path = self.write('.jsonl', '\n'.join(json.dumps(line) for line in lines) + '\n')
+
+        out, _ = self.run_command(path, '--workers', '2', '--batch-size', '4')
+
+        self.assertIn('Created 10 accounts (10 TTO profiles)', out)
+        user = User.objects.get(email='user7@uni.example')
+        self.assertTrue(user.check_password('pass-7'))
+        self.assertEqual(user.ttoprofile.therapeutic_focus_tags, ['Neurology'])
+
+    def test_rerun_skips_existing_without_hashing(self):
+        User.objects.create_user(username='taken', email='Alice@Uni.example', password='password123')
+        importer = Importer(workers=0)
+        rows = enumerate([{'email': 'alice@uni.example', 'password': 'x'}], 2)
+
+        with mock.patch('accounts.importer.hash_passwords') as hash_passwords:
+            result = importer.run(rows)
+
+        self.assertEqual((result.created, result.skipped), (0, 1))
+        hash_passwords.assert_not_called()
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_bad_json_lines_are_invalid_rows(self):
+        path = self.write(
+            '.jsonl', '{"email": "a@uni.example"}\n{nope\n[1]\n"x"\n{"email": "b@uni.example"}\n',
+        )
+        out, err = self.run_command(path, '--workers', '0')
+        self.assertIn('Created 2 accounts', out)
+        self.assertIn('3 invalid', out)
+        self.assertIn('line 2:', err)
+        self.assertIn('line 3: expected a JSON object, got list', err)
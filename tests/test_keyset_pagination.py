@@ -0,0 +1,77 @@
+from django.test import TestCase
+from django.urls import reverse
+from accounts.models import User
+from pages.models import Company, Project
+from pages.pagination import paginate
+from pages.views import PROJECTS_PER_PAGE
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        Project.objects.bulk_create(
+            Project(title=f'Sensor array {i}', field='Manufacturing', description='Industrial sensing.')
+            for i in range(30)
+        )
+
+    def walk(self, queryset, per_page):
+        seen, token, pages = [], None, 0
+        while True:
+            page = paginate(queryset, token, per_page)
+            seen.extend(p.pk for p in page)
+            pages += 1
+            if not page.has_next:
+                return seen, pages
+            token = page.next_token
+
+    def test_walks_every_row_once_in_order(self):
+        queryset = Project.objects.all()
+        seen, pages = self.walk(queryset, 7)
+        self.assertEqual(seen, list(queryset.values_list('pk', flat=True)))
+        self.assertEqual(pages, 6)
+
+    def test_descending_key_with_ties(self):
+        queryset = Company.objects.order_by('-name')
+        Company.objects.bulk_create(Company(name='Same Name') for _ in range(5))
+        seen, _ = self.walk(queryset, 2)
+        self.assertEqual(seen, list(queryset.order_by('-name', 'pk').values_list('pk', flat=True)))
+
+    def test_deep_page_is_one_query(self):
+        page = paginate(Project.objects.all(), None, 5)
+        for _ in range(4):
+            page = paginate(Project.objects.all(), page.next_token, 5)
+        with self.assertNumQueries(1):
+            paginate(Project.objects.all(), page.next_token, 5)
+
+    def test_bad_or_foreign_token_restarts(self):
+        first = paginate(Project.objects.all(), None, 5)
+        self.assertEqual(paginate(Project.objects.all(), 'garbage', 5).items, first.items)
+        other = paginate(Company.objects.all(), None, 1).next_token
+        self.assertEqual(paginate(Project.objects.all(), other, 5).items, first.items)
+
+
+class CompanyHomePaginationTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(
+            username='companyuser',
+            email='company@example.com',
+            password='password123',
+            user_type=User.UserType.COMPANY
+        )
+        self.client.login(email='company@example.com', password='password123')
+        Project.objects.bulk_create(
+            Project(title=f'Grid storage {i}', field='Renewable Energy') for i in range(PROJECTS_PER_PAGE + 3)
+        )
+
+    def test_next_link_carries_filters(self):
+        url = reverse('company_home')
+        response = self.client.get(url, {'field': 'Renewable Energy'})
+        self.assertEqual(len(response.context['projects']), PROJECTS_PER_PAGE)
+        next_url = response.context['next_page_url']
+        self.assertIn('field=Renewable+Energy', next_url)
+        self.assertIn('after=', next_url)
+        self.assertContains(response, 'rel="next"')
+
+        response = self.client.get(next_url)
+        # 15 new projects plus the seeded "Sustainable Energy Management System".
+        self.assertEqual(len(response.context['projects']), 4)
+        self.assertEqual(response.context['next_page_url'], '')
@@ -0,0 +1,80 @@
+import random
+
+from django.test import SimpleTestCase, TestCase
+from accounts.models import User, TTOProfile
+from pages.matching import DEFAULT_WEIGHTS, encode, top_k, top_project_matches
+from pages.models import Project
+
+TAGS = ['Oncology', 'Neurology', 'Cardiology', 'Immunology', 'Genomics']
+COUNTRIES = ['USA', 'UK', 'Germany', '']
+
+
+def pair_score(profile, project):
+    _, tags, low, high, country = profile
+    _, field, trl, project_country = project
+    score = DEFAULT_WEIGHTS['tags'] * (field.casefold() in {t.casefold() for t in tags})
+    if trl is not None and (low is None or low <= trl) and (high is None or trl <= high):
+        score += DEFAULT_WEIGHTS['trl']
+    if country and country.casefold() == project_country.casefold():
+        score += DEFAULT_WEIGHTS['country']
+    return score
+
+
+class VectorizedScorerTests(SimpleTestCase):
+    def setUp(self):
+        rng = random.Random(42)
+        self.profile_rows = []
+        for i in range(60):
+            low = rng.choice([None, 1, 3, 5])
+            high = rng.choice([None, 6, 9])
+            self.profile_rows.append((i, rng.sample(TAGS, rng.randint(0, 3)), low, high, rng.choice(COUNTRIES)))
+        self.project_rows = [
+            (1000 + j, rng.choice(TAGS), rng.choice([None, *range(1, 10)]), rng.choice(COUNTRIES))
+            for j in range(45)
+        ]
+
+    def test_matches_per_pair_loop(self):
+        profiles, projects = encode(self.profile_rows, self.project_rows)
+        # A tiny block size exercises the blocking logic.
+        indexes, scores = top_k(profiles, projects, k=5, block_rows=7)
+        for i, profile in enumerate(self.profile_rows):
+            expected = sorted(
+                (pair_score(profile, project) for project in self.project_rows), reverse=True
+            )[:5]
+            self.assertEqual(len(scores[i]), 5)
+            for got, want in zip(scores[i], expected):
+                self.assertAlmostEqual(float(got), want, places=5)
+            for j, score in zip(indexes[i], scores[i]):
+                self.assertAlmostEqual(pair_score(profile, self.project_rows[j]), float(score), places=5)
+
+    def test_k_larger_than_projects(self):
+        profiles, projects = encode(self.profile_rows[:3], self.project_rows[:2])
+        indexes, scores = top_k(profiles, projects, k=10)
+        self.assertEqual(indexes.shape, (3, 2))
+
+    def test_empty_sides(self):
+        profiles, projects = encode([], self.project_rows)
+        self.assertEqual(top_k(profiles, projects)[0].shape, (0, 10))
+        profiles, projects = encode(self.profile_rows, [])
+        self.assertEqual(top_k(profiles, projects)[0].shape, (60, 0))
+
+
+class TopProjectMatchesTests(TestCase):
+    def test_loads_from_database(self):
+        user = User.objects.create_user(
+            username='uni',
+            email='uni@example.edu',
+            password='testpassword123',
+            user_type=User.UserType.UNIVERSITY
+        )
+        profile = TTOProfile.objects.create(
+            user=user, country='USA', therapeutic_focus_tags=['Oncology'],
+            trl_range_interest_min=3, trl_range_interest_max=6,
+        )
+        best = Project.objects.create(title='Tumor assay', field='Oncology', trl=4, country='USA')
+        Project.objects.create(title='Heart valve', field='Cardiology', trl=8, country='UK')
+
+        matches = top_project_matches(k=3)
+        self.assertEqual(matches[profile.pk][0][0], best.pk)
+        self.assertAlmostEqual(matches[profile.pk][0][1], 1.0, places=5)
+        self.assertNotIn(best.pk, [pk for pk, _ in matches[profile.pk][1:]])
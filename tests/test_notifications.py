@@ -0,0 +1,247 @@
+import asyncio
+import io
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from accounts.models import TTOProfile, User
+from pages import notifications
+from pages.broker import InProcessBroker, get_broker, reset_broker
+from pages.models import Notification
+from pages.sse import NotificationStreamRouter, authenticated_user_id
+
+
+class NotificationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='companyuser',
+            email='company@example.com',
+            password='password123',
+            user_type=User.UserType.COMPANY
+        )
+        self.other = User.objects.create_user(
+            username='otheruser',
+            email='other@example.com',
+            password='password123',
+            user_type=User.UserType.COMPANY
+        )
+        self.client.login(email='company@example.com', password='password123')
+
+    def unread_count(self, user=None):
+        return User.objects.get(pk=(user or self.user).pk).unread_notifications
+
+    def test_notify_bumps_the_counter(self):
+        notifications.notify(self.user, 'First')
+        notifications.notify(self.user, 'Second')
+        notifications.notify(self.other, 'Elsewhere')
+        self.assertEqual(self.unread_count(), 2)
+        self.assertEqual(self.unread_count(self.other), 1)
+
+    def test_badge_in_nav(self):
+        notifications.notify(self.user, 'Hello')
+        response = self.client.get(reverse('screen2'))
+        self.assertContains(response, '<span class="badge">1</span>', html=True)
+        notifications.mark_all_read(self.user)
+        response = self.client.get(reverse('screen2'))
+        self.assertContains(response, '<span class="badge" hidden>0</span>', html=True)
+
+    def test_page_lists_unread_then_read(self):
+        first = notifications.notify(self.user, 'Old news')
+        notifications.notify(self.user, 'Fresh news')
+        notifications.mark_read(self.user, [first.pk])
+        response = self.client.get(reverse('notifications'))
+        self.assertEqual([n.message for n in response.context['current_notifications']], ['Fresh news'])
+        self.assertEqual([n.message for n in response.context['previous_notifications']], ['Old news'])
+        self.assertEqual(self.unread_count(), 1)
+
+    def test_read_notifications_are_paginated(self):
+        for i in range(notifications.READ_PER_PAGE + 5):
+            notifications.notify(self.user, f'Message {i}')
+        notifications.mark_all_read(self.user)
+        response = self.client.get(reverse('notifications'))
+        first_page = response.context['previous_notifications']
+        self.assertEqual(len(first_page), notifications.READ_PER_PAGE)
+        self.assertEqual(first_page.items[0].message, f'Message {notifications.READ_PER_PAGE + 4}')
+
+        response = self.client.get(response.context['next_page_url'])
+        self.assertEqual(
+            [n.message for n in response.context['previous_notifications']],
+            [f'Message {i}' for i in range(4, -1, -1)],
+        )
+
+    def test_mark_all_read_is_one_update(self):
+        for i in range(30):
+            notifications.notify(self.user, f'Message {i}')
+        notifications.notify(self.other, 'Untouched')
+        # One UPDATE of the notifications and one of the counter (plus the
+        # savepoint pair, since the test itself runs in a transaction).
+        with self.assertNumQueries(4):
+            self.assertEqual(notifications.mark_all_read(self.user), 30)
+        self.assertEqual(self.unread_count(), 0)
+        self.assertEqual(self.unread_count(self.other), 1)
+        self.assertFalse(Notification.objects.filter(recipient=self.user, is_read=False).exists())
+
+    def test_mark_all_read_view(self):
+        notifications.notify(self.user, 'Hello')
+        self.assertEqual(self.client.get(reverse('mark_notifications_read')).status_code, 405)
+        response = self.client.post(reverse('mark_notifications_read'))
+        self.assertRedirects(response, reverse('notifications'))
+        self.assertEqual(self.unread_count(), 0)
+
+    def test_cannot_mark_someone_elses(self):
+        theirs = notifications.notify(self.other, 'Private')
+        self.assertEqual(notifications.mark_read(self.user, [theirs.pk]), 0)
+        self.assertEqual(self.unread_count(self.other), 1)
+
+
+class BrokerTests(TestCase):
+    async def test_publish_reaches_only_the_users_subscriptions(self):
+        broker = InProcessBroker()
+        async with broker.subscribe(1) as mine, broker.subscribe(2) as theirs:
+            self.assertEqual(broker.subscriber_count(), 2)
+            # Publishing from another thread, as sync request code does.
+            delivered = await sync_to_async(broker.publish, thread_sensitive=False)(1, {'id': 7})
+            self.assertEqual(delivered, 1)
+            self.assertEqual(await asyncio.wait_for(mine.get(), 1), {'id': 7})
+            self.assertTrue(theirs.queue.empty())
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    async def test_slow_subscriber_keeps_the_newest(self):
+        broker = InProcessBroker()
+        async with broker.subscribe(1) as subscription:
+            for i in range(150):
+                broker.publish(1, {'id': i})
+            await asyncio.sleep(0)
+            self.assertEqual((await subscription.get())['id'], 50)
+
+
+def scope(path, cookie=''):
+    return {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'query_string': b'', 'root_path': '', 'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+        'headers': [(b'host', b'testserver'), (b'cookie', cookie.encode())],
+    }
+
+
+# Committed rows: the session is read on another thread's connection.
+class NotificationStreamTests(TransactionTestCase):
+    def setUp(self):
+        reset_broker()
+        self.user = User.objects.create_user(
+            username='streamuser',
+            email='stream@example.com',
+            password='password123',
+            user_type=User.UserType.INVESTOR
+        )
+        self.client.login(email='stream@example.com', password='password123')
+        self.session_cookie = f'{settings.SESSION_COOKIE_NAME}={self.client.cookies[settings.SESSION_COOKIE_NAME].value}'
+        self.app = NotificationStreamRouter(get_asgi_application())
+
+    def tearDown(self):
+        reset_broker()
+
+    def open(self, path, cookie=''):
+        incoming, sent = asyncio.Queue(), asyncio.Queue()
+        incoming.put_nowait({'type': 'http.request', 'body': b'', 'more_body': False})
+        task = asyncio.ensure_future(self.app(scope(path, cookie), incoming.get, sent.put))
+        return task, incoming, sent
+
+    async def test_stream_pushes_new_notifications(self):
+        task, incoming, sent = self.open(reverse('notification_stream'), self.session_cookie)
+        start = await asyncio.wait_for(sent.get(), 2)
+        self.assertEqual(start['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream'), start['headers'])
+        self.assertTrue((await sent.get())['body'].startswith(b'retry:'))
+        while not get_broker().subscriber_count():
+            await asyncio.sleep(0.01)
+
+        notification = await sync_to_async(notifications.notify)(self.user, 'Live update')
+        event = (await asyncio.wait_for(sent.get(), 2))['body']
+        self.assertIn(f'id: {notification.pk}\nevent: notification\n'.encode(), event)
+        self.assertIn(b'Live update', event)
+
+        incoming.put_nowait({'type': 'http.disconnect'})
+        await asyncio.wait_for(task, 2)
+        self.assertEqual(get_broker().subscriber_count(), 0)
+
+    async def test_stream_requires_login(self):
+        task, _, sent = self.open(reverse('notification_stream'))
+        start = await asyncio.wait_for(sent.get(), 2)
+        await task
+        self.assertEqual(start['status'], 302)
+        self.assertIn((b'location', b'/accounts/login/?next=%2Fnotifications%2Fstream%2F'), start['headers'])
+
+    async def test_other_paths_go_to_django(self):
+        task, _, sent = self.open(reverse('notifications'), self.session_cookie)
+        start = await asyncio.wait_for(sent.get(), 5)
+        self.assertEqual(start['status'], 200)
+        await asyncio.wait_for(task, 5)
+
+    def test_session_lookup(self):
+        self.assertEqual(authenticated_user_id(self.client.cookies[settings.SESSION_COOKIE_NAME].value), self.user.pk)
+        self.assertIsNone(authenticated_user_id('no-such-session'))
+        self.assertIsNone(authenticated_user_id(None))
+
+
+class StreamSubscriptionTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(username='streamuser', email='stream@example.com', password='password123')
+
+    async def test_pages_subscribe_under_asgi(self):
+        await self.async_client.alogin(email='stream@example.com', password='password123')
+        response = await self.async_client.get(reverse('notifications'))
+        self.assertContains(response, 'data-stream-url=')
+        self.assertContains(response, 'js/notifications.js')
+
+    def test_no_stream_under_wsgi(self):
+        # WSGI can't send an endless async body; pages don't subscribe and
+        # the stream answers 204 so EventSource won't retry.
+        self.client.login(email='stream@example.com', password='password123')
+        response = self.client.get(reverse('notifications'))
+        self.assertNotContains(response, 'data-stream-url=')
+        self.assertNotContains(response, 'js/notifications.js')
+        self.assertEqual(self.client.get(reverse('notification_stream')).status_code, 204)
+
+
+class FanOutTests(TestCase):
+    def setUp(self):
+        self.users = []
+        for i, tags in enumerate([['Oncology'], ['Oncology', 'Cardiology'], ['Neurology'], []]):
+            user = User.objects.create_user(
+                username=f'tto{i}',
+                email=f'tto{i}@example.com',
+                password='password123',
+                user_type=User.UserType.UNIVERSITY
+            )
+            TTOProfile.objects.create(user=user, therapeutic_focus_tags=tags)
+            self.users.append(user)
+
+    def test_recipients_by_tag(self):
+        ids = set(notifications.recipients_for_tags(['Oncology', 'Neurology']))
+        self.assertEqual(ids, {u.pk for u in self.users[:3]})
+
+    def test_fan_out_in_batches(self):
+        # One INSERT and one counter UPDATE per batch of two, plus the read
+        # and a savepoint pair per batch.
+        with self.assertNumQueries(1 + 2 * 4):
+            result = notifications.fan_out(
+                notifications.recipients_for_tags(['Oncology', 'Neurology']),
+                'New oncology grant', url='/funding/1/', batch_size=2,
+            )
+        self.assertEqual(result.recipients, 3)
+        for user in self.users[:3]:
+            user.refresh_from_db()
+            self.assertEqual(user.unread_notifications, 1)
+            self.assertEqual(list(user.notifications.values_list('message', flat=True)), ['New oncology grant'])
+        self.assertFalse(self.users[3].notifications.exists())
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('notify_funding_update', 'Cardiology call', '--tag', 'Cardiology', stdout=out)
+        self.assertIn('Sent 1 notifications', out.getvalue())
+        self.assertEqual(Notification.objects.get().recipient, self.users[1])
@@ -0,0 +1,188 @@
+import socketserver
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from pages import outbox
+from pages.models import OutgoingEmail
+
+
+class StubSMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: records each message, can refuse them."""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.reply('220 stub ESMTP')
+        while True:
+            line = self.rfile.readline().decode().strip()
+            if not line:
+                return
+            command = line.split(' ', 1)[0].upper()
+            if command in ('EHLO', 'HELO'):
+                self.reply('250 stub')
+            elif command in ('MAIL', 'RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif command == 'RCPT':
+                self.reply('550 No thanks' if server.refuse else '250 OK')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                while (data := self.rfile.readline()) not in (b'.\r\n', b''):
+                    lines.append(data)
+                server.messages.append(b''.join(lines))
+                self.reply('250 Queued')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Not implemented')
+
+
+class StubSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubSMTPHandler)
+        self.messages = []
+        self.connections = 0
+        self.refuse = False
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.smtp = StubSMTPServer()
+        threading.Thread(target=self.smtp.serve_forever, daemon=True).start()
+        smtp_settings = override_settings(
+            EMAIL_BACKEND='pages.outbox.OutboxBackend',
+            OUTBOX_DELIVERY_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST='127.0.0.1',
+            EMAIL_PORT=self.smtp.server_address[1],
+            EMAIL_USE_TLS=False,
+            EMAIL_HOST_USER='',
+        )
+        smtp_settings.enable()
+        self.addCleanup(smtp_settings.disable)
+
+    def tearDown(self):
+        self.smtp.shutdown()
+        self.smtp.server_close()
+
+    def queue(self, count):
+        for i in range(count):
+            mail.send_mail(f'Subject {i}', 'Body', 'hub@example.com', [f'user{i}@example.com'])
+
+    def test_send_mail_only_queues(self):
+        self.queue(2)
+        self.assertEqual(OutgoingEmail.objects.filter(status=OutgoingEmail.Status.PENDING).count(), 2)
+        self.assertEqual(self.smtp.messages, [])
+
+    def test_password_reset_is_queued(self):
+        User.objects.create_user(username='reset', email='reset@example.com', password='password123')
+        response = self.client.post(reverse('password_reset'), {'email': 'reset@example.com'})
+        self.assertEqual(response.status_code, 302)
+        queued = OutgoingEmail.objects.get()
+        self.assertEqual(queued.to, ['reset@example.com'])
+        self.assertIn('Password reset', queued.subject)
+
+    def test_worker_reuses_one_connection_across_batches(self):
+        self.queue(5)
+        worker = outbox.Worker(batch_size=2)
+        while worker.run_once():
+            pass
+        worker.close()
+        self.assertEqual(len(self.smtp.messages), 5)
+        self.assertEqual(self.smtp.connections, 1)
+        self.assertEqual(worker.sent, 5)
+        self.assertEqual(len(worker.latencies), 5)
+        sent = OutgoingEmail.objects.filter(status=OutgoingEmail.Status.SENT)
+        self.assertEqual(sent.count(), 5)
+        self.assertTrue(all(row.delivery_latency >= timedelta(0) for row in sent))
+
+    def test_rows_are_claimed_while_sending(self):
+        self.queue(2)
+        worker = outbox.Worker()
+        due = []
+
+        def send_messages(messages):
+            due.append(
+                OutgoingEmail.objects.filter(
+                    status=OutgoingEmail.Status.PENDING, next_attempt_at__lte=timezone.now(),
+                ).count()
+            )
+            return len(messages)
+
+        with mock.patch.object(worker.connection, 'open'), \
+                mock.patch.object(worker.connection, 'send_messages', side_effect=send_messages):
+            self.assertEqual(worker.run_once(), 2)
+        # Another worker finds nothing due while the batch is out.
+        self.assertEqual(due, [0, 0])
+        self.assertEqual(OutgoingEmail.objects.filter(status=OutgoingEmail.Status.SENT).count(), 2)
+
+    def test_latency_samples_are_bounded(self):
+        self.queue(3)
+        with mock.patch.object(outbox, 'LATENCY_SAMPLES', 2):
+            worker = outbox.Worker()
+        while worker.run_once():
+            pass
+        worker.close()
+        self.assertEqual(worker.sent, 3)
+        self.assertEqual(len(worker.latencies), 2)
+
+    def test_failures_back_off_then_give_up(self):
+        self.queue(1)
+        self.smtp.refuse = True
+        worker = outbox.Worker()
+        with self.assertLogs('pages.outbox', 'WARNING'):
+            self.assertEqual(worker.run_once(), 1)
+        row = OutgoingEmail.objects.get()
+        self.assertEqual((row.status, row.attempts), (OutgoingEmail.Status.PENDING, 1))
+        self.assertIn('SMTPRecipientsRefused', row.last_error)
+        self.assertGreater(row.next_attempt_at, timezone.now() + timedelta(seconds=outbox.BACKOFF_BASE - 5))
+        # Not due yet.
+        self.assertEqual(worker.run_once(), 0)
+
+        with self.assertLogs('pages.outbox', 'WARNING') as logs:
+            for attempt in range(2, outbox.MAX_ATTEMPTS + 1):
+                OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+                worker.run_once()
+        self.assertIn('Giving up', logs.output[-1])
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), (OutgoingEmail.Status.FAILED, outbox.MAX_ATTEMPTS))
+        worker.close()
+
+    def test_recovers_when_server_comes_back(self):
+        self.queue(1)
+        self.smtp.refuse = True
+        worker = outbox.Worker()
+        with self.assertLogs('pages.outbox', 'WARNING'):
+            worker.run_once()
+        self.smtp.refuse = False
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        worker.run_once()
+        worker.close()
+        self.assertEqual(OutgoingEmail.objects.get().status, OutgoingEmail.Status.SENT)
+        self.assertEqual(len(self.smtp.messages), 1)
+
+    def test_backoff_doubles_and_caps(self):
+        self.assertEqual([outbox.backoff(n) for n in (1, 2, 3)], [30, 60, 120])
+        self.assertEqual(outbox.backoff(20), outbox.BACKOFF_MAX)
+
+    def test_command_reports(self):
+        self.queue(3)
+        out = mock.Mock()
+        call_command('send_outbox', '--once', stdout=out)
+        report = out.write.call_args[0][0]
+        self.assertIn('Sent 3', report)
+        self.assertIn('1 connection(s)', report)
@@ -0,0 +1,101 @@
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from accounts.models import TTOProfile, User
+from pages import cache as page_cache
+from pages import views
+
+
+class ProfileCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='acme',
+            email='acme@example.com',
+            password='password123',
+            user_type=User.UserType.COMPANY
+        )
+        self.client.login(email='acme@example.com', password='password123')
+
+    def get_profile(self):
+        return self.client.get(reverse('company_profile'))
+
+    def test_data_built_once_until_profile_saves(self):
+        with mock.patch.object(views, '_company_profile_data', wraps=views._company_profile_data) as build:
+            self.get_profile()
+            response = self.get_profile()
+            self.assertEqual(build.call_count, 1)
+            self.assertContains(response, 'Acme')
+
+            self.user.username = 'globex'
+            self.user.save()
+            response = self.get_profile()
+        self.assertEqual(build.call_count, 2)
+        self.assertContains(response, 'Globex')
+
+    def test_cache_is_per_user(self):
+        self.get_profile()
+        User.objects.create_user(
+            username='initech',
+            email='initech@example.com',
+            password='password123',
+            user_type=User.UserType.COMPANY
+        )
+        self.client.login(email='initech@example.com', password='password123')
+        response = self.get_profile()
+        self.assertContains(response, 'Initech')
+        self.assertNotContains(response, 'Acme')
+
+    def test_tto_profile_save_bumps_university_version(self):
+        university = User.objects.create_user(
+            username='uni',
+            email='uni@example.com',
+            password='password123',
+            user_type=User.UserType.UNIVERSITY
+        )
+        name = page_cache.profile_version_name(university.pk)
+        before = page_cache.get_version(name)
+        TTOProfile.objects.create(user=university)
+        self.assertGreater(page_cache.get_version(name), before)
+
+
+class GetOrBuildTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_stale_entry_rebuilt_by_one_caller(self):
+        cache.set('k', (0, 'stale'), 60)
+        cache.add('k:lock', 1)
+        # Another caller holds the lock: serve the stale value without building.
+        self.assertEqual(page_cache.get_or_build('k', lambda: 'fresh', 60), 'stale')
+        cache.delete('k:lock')
+        self.assertEqual(page_cache.get_or_build('k', lambda: 'fresh', 60), 'fresh')
+        self.assertEqual(page_cache.get_or_build('k', lambda: 'newer', 60), 'fresh')
+
+    def test_concurrent_misses_build_once(self):
+        calls = []
+        started = threading.Event()
+
+        def build():
+            calls.append(1)
+            started.set()
+            threading.Event().wait(0.1)
+            return 'value'
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(page_cache.get_or_build('key', build, 60)))
+            for _ in range(8)
+        ]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['value'] * 8)
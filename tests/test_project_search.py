@@ -0,0 +1,42 @@
+from django.test import TestCase
+from django.urls import reverse
+from accounts.models import User
+from pages.models import Project
+
+
+class ProjectSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='companyuser',
+            email='company@example.com',
+            password='password123',
+            user_type=User.UserType.COMPANY
+        )
+        self.client.login(email='company@example.com', password='password123')
+        self.url = reverse('company_home')
+
+    def test_seeded_projects_are_listed(self):
+        """
+        The projects that used to be hardcoded in the view are seeded by a data migration.
+        """
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Smart City Traffic Management')
+        self.assertEqual(len(response.context['projects']), Project.objects.count())
+
+    def test_search_matches_title_and_description(self):
+        Project.objects.create(title='Protein Folding Toolkit', field='Biology', description='Structure prediction for enzymes.')
+        response = self.client.get(self.url, {'q': 'folding'})
+        self.assertEqual([p.title for p in response.context['projects']], ['Protein Folding Toolkit'])
+
+        response = self.client.get(self.url, {'q': 'enzymes'})
+        self.assertEqual([p.title for p in response.context['projects']], ['Protein Folding Toolkit'])
+
+    def test_field_filter_and_available_fields(self):
+        response = self.client.get(self.url, {'field': 'Blockchain'})
+        self.assertEqual([p.field for p in response.context['projects']], ['Blockchain'])
+        fields = list(response.context['available_fields'])
+        self.assertEqual(fields, sorted(set(Project.objects.values_list('field', flat=True))))
+
+    def test_search_runs_a_single_query(self):
+        with self.assertNumQueries(1):
+            list(Project.objects.search('energy').in_field('Renewable Energy'))
@@ -0,0 +1,89 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import TTOProfile, User
+from pages import urls as page_urls
+from pages.typeahead import typeahead
+
+# Route -> (role that can see it, queries on a repeat visit). Every
+# authenticated request pays one query for the session and one for the
+# user, which carries their TTOProfile along.
+ROUTE_QUERIES = {
+    # Static page; never reads the session.
+    'welcome': (User.UserType.COMPANY, 0),
+    'screen1': (User.UserType.COMPANY, 2),
+    'screen2': (User.UserType.UNIVERSITY, 2),
+    'screen3': (User.UserType.INVESTOR, 2),
+    # + the newest unread and one page of read notifications
+    'notifications': (User.UserType.COMPANY, 4),
+    # + the page of projects (facet counts are cached)
+    'company_home': (User.UserType.COMPANY, 3),
+    # + the page of companies and the stored recommendations
+    'university_home': (User.UserType.UNIVERSITY, 4),
+    'company_profile': (User.UserType.COMPANY, 2),
+    'investor_profile': (User.UserType.INVESTOR, 2),
+    'university_profile': (User.UserType.UNIVERSITY, 2),
+    'suggest': (User.UserType.COMPANY, 2),
+}
+
+# Open-ended event streams, covered in test_notifications.
+STREAM_ROUTES = {'notification_stream'}
+
+# POST-only routes -> (role, queries).
+POST_ROUTE_QUERIES = {
+    # + one UPDATE of the notifications (none of the counter when nothing
+    # changed) and the savepoint pair around it
+    'mark_notifications_read': (User.UserType.COMPANY, 5),
+}
+
+
+class RouteQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for user_type in User.UserType.values:
+            User.objects.create_user(
+                username=f'{user_type}user',
+                email=f'{user_type}@example.com',
+                password='password123',
+                user_type=user_type
+            )
+        TTOProfile.objects.create(
+            user=User.objects.get(user_type=User.UserType.UNIVERSITY),
+            institution_name='Drew University',
+        )
+
+    def setUp(self):
+        cache.clear()
+        typeahead.reset()
+
+    def tearDown(self):
+        typeahead.reset()
+
+    def test_every_route_is_counted(self):
+        names = {pattern.name for pattern in page_urls.urlpatterns}
+        self.assertEqual(names, set(ROUTE_QUERIES) | set(POST_ROUTE_QUERIES) | STREAM_ROUTES)
+
+    def test_queries_per_route(self):
+        for name, (user_type, expected) in ROUTE_QUERIES.items():
+            with self.subTest(route=name):
+                self.client.login(email=f'{user_type}@example.com', password='password123')
+                url = reverse(name)
+                self.client.get(url)
+                with self.assertNumQueries(expected):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+    def test_queries_per_post_route(self):
+        for name, (user_type, expected) in POST_ROUTE_QUERIES.items():
+            with self.subTest(route=name):
+                self.client.login(email=f'{user_type}@example.com', password='password123')
+                with self.assertNumQueries(expected):
+                    response = self.client.post(reverse(name))
+                self.assertEqual(response.status_code, 302)
+
+    def test_profile_comes_with_the_user(self):
+        self.client.login(email='university@example.com', password='password123')
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('university_profile'))
+        self.assertContains(response, 'Drew University')
@@ -0,0 +1,96 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from accounts.models import User, TTOProfile
+from pages.models import Project, Recommendation
+from pages import recommendations
+
+
+@override_settings(RECOMMENDATIONS_REFRESH_DELAY=0)
+class RecommendationRefreshTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='uni',
+            email='uni@example.edu',
+            password='testpassword123',
+            user_type=User.UserType.UNIVERSITY
+        )
+
+    def create_profile(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return TTOProfile.objects.create(user=self.user, **kwargs)
+
+    def create_project(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Project.objects.create(**kwargs)
+
+    def recommended(self):
+        return [r.project.title for r in Recommendation.objects.for_user(self.user)]
+
+    def test_profile_save_computes_recommendations(self):
+        self.create_project(title='Tumor assay', field='Oncology', trl=4)
+        self.create_profile(therapeutic_focus_tags=['Oncology'], trl_range_interest_min=3, trl_range_interest_max=6)
+        self.assertEqual(self.recommended()[0], 'Tumor assay')
+
+    def test_new_project_enters_list(self):
+        self.create_profile(therapeutic_focus_tags=['Oncology'], trl_range_interest_min=3, trl_range_interest_max=6)
+        self.assertNotIn('Tumor assay', self.recommended())
+        self.create_project(title='Tumor assay', field='Oncology', trl=4)
+        self.assertEqual(self.recommended()[0], 'Tumor assay')
+
+    def test_project_delete_refills_list(self):
+        self.create_profile(therapeutic_focus_tags=['Oncology'], trl_range_interest_min=3, trl_range_interest_max=6)
+        project = self.create_project(title='Tumor assay', field='Oncology', trl=4)
+        with self.captureOnCommitCallbacks(execute=True):
+            project.delete()
+        self.assertNotIn('Tumor assay', self.recommended())
+
+    def test_project_delete_rescores_only_its_users(self):
+        self.create_profile(therapeutic_focus_tags=['Oncology'], trl_range_interest_min=3, trl_range_interest_max=6)
+        other = User.objects.create_user(
+            username='other', email='other@example.edu', password='testpassword123',
+            user_type=User.UserType.UNIVERSITY,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            # Free slots, but never recommended the deleted project.
+            TTOProfile.objects.create(
+                user=other, therapeutic_focus_tags=['Cardiology'], trl_range_interest_min=8, trl_range_interest_max=9,
+            )
+        project = self.create_project(title='Tumor assay', field='Oncology', trl=4)
+        with mock.patch.object(recommendations, 'rescore', wraps=recommendations.rescore) as rescore:
+            with self.captureOnCommitCallbacks(execute=True):
+                project.delete()
+        rescore.assert_called_once()
+        self.assertEqual([p.user_id for p in rescore.call_args.args[0]], [self.user.pk])
+
+    def test_profile_delete_clears_rows(self):
+        profile = self.create_profile(therapeutic_focus_tags=['Oncology'])
+        self.create_project(title='Tumor assay', field='Oncology', trl=4)
+        self.assertTrue(Recommendation.objects.filter(user=self.user).exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.delete()
+        self.assertFalse(Recommendation.objects.filter(user=self.user).exists())
+
+    def test_unrelated_project_does_not_rescore(self):
+        self.create_profile(therapeutic_focus_tags=['Oncology'], trl_range_interest_min=3, trl_range_interest_max=3)
+        for i in range(recommendations.RECOMMENDATIONS_PER_USER):
+            self.create_project(title=f'Onco {i}', field='Oncology', trl=3)
+        unrelated = Project.objects.create(title='Bridge sensor', field='Civil Engineering', trl=8)
+        self.assertEqual(recommendations.refresh(project_ids=[unrelated.pk]), 0)
+
+    def test_rebuild_command(self):
+        TTOProfile.objects.create(user=self.user, therapeutic_focus_tags=['Oncology'])
+        Project.objects.create(title='Tumor assay', field='Oncology', trl=4)
+        self.assertEqual(self.recommended(), [])
+        call_command('rebuild_recommendations', stdout=StringIO())
+        self.assertEqual(self.recommended()[0], 'Tumor assay')
+
+    def test_dashboard_reads_table(self):
+        self.create_project(title='Tumor assay', field='Oncology', trl=4)
+        self.create_profile(therapeutic_focus_tags=['Oncology'])
+        self.client.login(email='uni@example.edu', password='testpassword123')
+        response = self.client.get(reverse('university_home'))
+        self.assertContains(response, 'Tumor assay')
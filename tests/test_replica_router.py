@@ -0,0 +1,110 @@
+from django.core.cache import cache
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import User
+from discovery_hub.routers import STICKY_COOKIE, RequestState, _state, primary_reads, used_replica
+from pages.models import Project
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRouterTests(TestCase):
+    databases = {'default', 'replica'}
+
+    def in_request(self, **state):
+        token = _state.set(RequestState(**state))
+        self.addCleanup(_state.reset, token)
+        return _state.get()
+
+    def test_outside_a_request_everything_uses_the_primary(self):
+        self.assertEqual(Project.objects.all().db, 'default')
+
+    def test_replica_reads_in_opted_in_views(self):
+        self.in_request(replica_reads=True)
+        self.assertEqual(Project.objects.all().db, 'replica')
+
+    def test_reads_without_opt_in_use_the_primary(self):
+        self.in_request()
+        self.assertEqual(Project.objects.all().db, 'default')
+
+    def test_write_pins_the_rest_of_the_request(self):
+        state = self.in_request(replica_reads=True)
+        self.assertEqual(Project.objects.all().db, 'replica')
+        Project.objects.create(title='Pinned', field='Biology')
+        self.assertTrue(state.wrote)
+        self.assertEqual(Project.objects.all().db, 'default')
+
+    def test_sticky_window_uses_the_primary(self):
+        self.in_request(replica_reads=True, pinned=True)
+        self.assertEqual(Project.objects.all().db, 'default')
+
+    def test_primary_reads_block(self):
+        self.in_request(replica_reads=True)
+        with primary_reads():
+            self.assertEqual(Project.objects.all().db, 'default')
+        self.assertFalse(used_replica())
+        self.assertEqual(Project.objects.all().db, 'replica')
+        self.assertTrue(used_replica())
+
+    def test_sessions_never_read_from_a_replica(self):
+        from django.contrib.sessions.models import Session
+
+        self.in_request(replica_reads=True)
+        self.assertEqual(Session.objects.all().db, 'default')
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], DATABASE_REPLICA_STICKY_SECONDS=30)
+class ReplicaViewTests(TestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(
+            username='companyuser',
+            email='company@example.com',
+            password='password123',
+            user_type=User.UserType.COMPANY
+        )
+        self.client.login(email='company@example.com', password='password123')
+
+    def test_dashboard_reads_from_replica_without_writing(self):
+        with CaptureQueriesContext(connections['replica']) as replica, \
+                CaptureQueriesContext(connections['default']) as primary:
+            response = self.client.get(reverse('company_home'))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+        self.assertTrue(any('pages_project' in q['sql'] for q in replica.captured_queries))
+        # The facet counts get cached, so they are counted on the primary.
+        self.assertFalse(any('UNION' in q['sql'] for q in replica.captured_queries))
+        self.assertTrue(any('UNION' in q['sql'] for q in primary.captured_queries))
+        # A client holding an ETag for replica data could be sent 304 on
+        # it after the replica catches up.
+        self.assertFalse(response.has_header('ETag'))
+        # The session and the user still come from the primary.
+        self.assertTrue(any('django_session' in q['sql'] for q in primary.captured_queries))
+
+    def test_reads_stick_to_primary_after_a_write(self):
+        # The test replica never receives the primary's rows, so only a
+        # read from the primary shows the new project.
+        Project.objects.create(title='Fresh Project', field='Biology')
+        self.assertNotContains(self.client.get(reverse('company_home')), 'Fresh Project')
+
+        response = self.client.post(reverse('mark_notifications_read'))
+        self.assertIn(STICKY_COOKIE, response.cookies)
+        self.assertEqual(response.cookies[STICKY_COOKIE]['max-age'], 30)
+
+        with CaptureQueriesContext(connections['replica']) as replica:
+            response = self.client.get(reverse('company_home'))
+        self.assertContains(response, 'Fresh Project')
+        self.assertEqual(replica.captured_queries, [])
+        self.assertTrue(response.has_header('ETag'))
+
+    def test_cached_facets_come_from_the_primary(self):
+        # Only on the primary, like a write the replica hasn't applied yet.
+        Project.objects.create(title='Fresh Project', field='Biology')
+        response = self.client.get(reverse('company_home'))
+        self.assertNotContains(response, 'Fresh Project')
+        counts = dict(response.context['facets']['field'])
+        self.assertEqual(counts['Biology'], Project.objects.filter(field='Biology').count())
@@ -0,0 +1,54 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import User
+
+
+def session_queries(captured):
+    return [q['sql'] for q in captured.captured_queries if 'django_session' in q['sql']]
+
+
+class SessionWriteTests(TestCase):
+    def test_login_page_saves_selected_type_once(self):
+        url = reverse('login')
+        self.client.get(url, {'type': 'company'})
+        self.assertEqual(self.client.session['selected_user_type'], 'company')
+
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(url, {'type': 'company'})
+        self.assertFalse([sql for sql in session_queries(captured) if not sql.startswith('SELECT')])
+
+        self.client.get(url, {'type': 'investor'})
+        self.assertEqual(self.client.session['selected_user_type'], 'investor')
+
+
+class SessionModeTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(
+            username='companyuser',
+            email='company@example.com',
+            password='password123',
+            user_type=User.UserType.COMPANY
+        )
+
+    def dashboard_session_queries(self):
+        self.client.login(email='company@example.com', password='password123')
+        self.client.get(reverse('screen2'))
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse('screen2'))
+        self.assertEqual(response.status_code, 200)
+        return session_queries(captured)
+
+    def test_db_sessions_read_the_table(self):
+        with override_settings(SESSION_ENGINE='django.contrib.sessions.backends.db'):
+            self.assertEqual(len(self.dashboard_session_queries()), 1)
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+    def test_cached_db_sessions_skip_the_table(self):
+        self.assertEqual(self.dashboard_session_queries(), [])
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+    def test_signed_cookie_sessions_skip_the_table(self):
+        self.assertEqual(self.dashboard_session_queries(), [])
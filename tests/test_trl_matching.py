@@ -0,0 +1,73 @@
+import random
+
+from django.test import SimpleTestCase, TestCase
+from accounts.models import User, TTOProfile
+from pages.intervals import IntervalTree
+from pages.matching import match_projects_by_trl
+from pages.models import Project
+
+
+class IntervalTreeTests(SimpleTestCase):
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        intervals = []
+        for i in range(500):
+            low = rng.choice([None, *range(1, 10)])
+            high = rng.choice([None, *range(low or 1, 10)])
+            intervals.append((low, high, i))
+        tree = IntervalTree(intervals)
+
+        def brute(a, b):
+            return {
+                i for low, high, i in intervals
+                if (low is None or low <= b) and (high is None or high >= a)
+            }
+
+        for a in range(0, 11):
+            for b in range(a, 11):
+                self.assertEqual(set(tree.overlap(a, b)), brute(a, b))
+
+    def test_empty_tree(self):
+        self.assertEqual(IntervalTree([]).stab(3), [])
+
+
+class TRLMatchingTests(TestCase):
+    def setUp(self):
+        self.profiles = {}
+        for name, low, high in [('early', 1, 3), ('mid', 4, 7), ('late', 7, 9), ('open', None, None)]:
+            user = User.objects.create_user(
+                username=name,
+                email=f'{name}@example.edu',
+                password='testpassword123',
+                user_type=User.UserType.UNIVERSITY
+            )
+            self.profiles[name] = TTOProfile.objects.create(
+                user=user, institution_name=name,
+                trl_range_interest_min=low, trl_range_interest_max=high,
+            )
+
+    def names(self, queryset):
+        return set(queryset.values_list('institution_name', flat=True))
+
+    def test_with_trl(self):
+        self.assertEqual(self.names(TTOProfile.objects.with_trl(7)), {'mid', 'late', 'open'})
+        self.assertEqual(self.names(TTOProfile.objects.with_trl(2)), {'early', 'open'})
+
+    def test_overlapping_trl(self):
+        self.assertEqual(self.names(TTOProfile.objects.overlapping_trl(3, 4)), {'early', 'mid', 'open'})
+
+    def test_project_matching_profiles(self):
+        project = Project.objects.create(title='Assay', field='Biology', trl=8)
+        self.assertEqual(self.names(project.matching_profiles()), {'late', 'open'})
+        project.trl = None
+        self.assertEqual(self.names(project.matching_profiles()), set())
+
+    def test_batch_matching_agrees_with_queryset(self):
+        projects = [Project.objects.create(title=f'P{trl}', field='Biology', trl=trl) for trl in range(1, 10)]
+        with self.assertNumQueries(1):
+            matches = match_projects_by_trl(projects)
+        for project in projects:
+            self.assertEqual(
+                set(matches[project.pk]),
+                set(project.matching_profiles().values_list('pk', flat=True)),
+            )
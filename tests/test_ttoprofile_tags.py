@@ -0,0 +1,53 @@
+from django.test import TestCase
+from accounts.models import User, TTOProfile
+
+
+class TTOProfileTagQueryTests(TestCase):
+    def setUp(self):
+        for name, tags in [
+            ('onco', ['Oncology', 'Immunology']),
+            ('neuro', ['Neurology']),
+            ('both', ['Oncology', 'Neurology']),
+            ('cardio', ['Cardiology']),
+            ('none', []),
+        ]:
+            user = User.objects.create_user(
+                username=name,
+                email=f'{name}@example.edu',
+                password='testpassword123',
+                user_type=User.UserType.UNIVERSITY
+            )
+            TTOProfile.objects.create(user=user, institution_name=name, therapeutic_focus_tags=tags)
+
+    def names(self, queryset):
+        return set(queryset.values_list('institution_name', flat=True))
+
+    def test_tags_round_trip(self):
+        self.assertEqual(
+            TTOProfile.objects.get(institution_name='both').therapeutic_focus_tags,
+            ['Oncology', 'Neurology'],
+        )
+
+    def test_with_any_tags(self):
+        self.assertEqual(
+            self.names(TTOProfile.objects.with_any_tags(['Oncology', 'Neurology'])),
+            {'onco', 'neuro', 'both'},
+        )
+        self.assertEqual(self.names(TTOProfile.objects.with_any_tags([])), set())
+
+    def test_with_all_tags(self):
+        self.assertEqual(
+            self.names(TTOProfile.objects.with_all_tags(['Oncology', 'Neurology'])),
+            {'both'},
+        )
+        self.assertEqual(self.names(TTOProfile.objects.with_all_tags(['Oncology'])), {'onco', 'both'})
+
+    def test_tag_facets_respect_filters(self):
+        self.assertEqual(
+            TTOProfile.objects.tag_facets(),
+            [('Neurology', 2), ('Oncology', 2), ('Cardiology', 1), ('Immunology', 1)],
+        )
+        self.assertEqual(
+            TTOProfile.objects.with_any_tags(['Neurology']).tag_facets(),
+            [('Neurology', 2), ('Oncology', 1)],
+        )
@@ -0,0 +1,127 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import User
+from pages.models import Company, Project
+from pages.cache import get_version
+from pages.typeahead import COMPANY, TAG, PrefixIndex, Typeahead, typeahead
+
+
+class PrefixIndexTests(TestCase):
+    def setUp(self):
+        self.index = PrefixIndex()
+        self.index.load([
+            (COMPANY, 1, 'NeuroGen Labs'),
+            (COMPANY, 2, 'Gen Therapeutics'),
+            (COMPANY, 3, 'Solar Works'),
+            (TAG, 'Genomics', 'Genomics'),
+        ])
+
+    def test_prefix_of_any_word(self):
+        labels = [label for _, _, label in self.index.suggest('lab')]
+        self.assertEqual(labels, ['NeuroGen Labs'])
+
+    def test_leading_matches_rank_first(self):
+        labels = [label for _, _, label in self.index.suggest('GEN')]
+        self.assertEqual(labels, ['Genomics', 'Gen Therapeutics'])
+
+    def test_multi_word_prefix(self):
+        self.assertEqual(self.index.suggest('gen ther'), [(COMPANY, 2, 'Gen Therapeutics')])
+
+    def test_kind_filter_and_blank_query(self):
+        self.assertEqual(self.index.suggest('gen', kinds={COMPANY}), [(COMPANY, 2, 'Gen Therapeutics')])
+        self.assertEqual(self.index.suggest('  '), [])
+
+    def test_replace_and_shared_tags(self):
+        self.index.replace([], [(COMPANY, 4, 'Genomics Co'), (TAG, 'Genomics', 'Genomics')])
+        self.index.replace([(TAG, 'Genomics', 'Genomics')], [])
+        self.assertIn((TAG, 'Genomics', 'Genomics'), self.index.suggest('genom'))
+
+        self.index.replace([(COMPANY, 3, 'Solar Works')], [(COMPANY, 3, 'Lunar Works')])
+        self.assertEqual(self.index.suggest('solar'), [])
+        self.assertEqual(self.index.suggest('lunar'), [(COMPANY, 3, 'Lunar Works')])
+
+
+class SuggestEndpointTests(TestCase):
+    def setUp(self):
+        typeahead.reset()
+        User.objects.create_user(
+            username='uniuser',
+            email='uni@example.com',
+            password='password123',
+            user_type=User.UserType.UNIVERSITY
+        )
+        self.client.login(email='uni@example.com', password='password123')
+        self.url = reverse('suggest')
+
+    def tearDown(self):
+        typeahead.reset()
+
+    def labels(self, **params):
+        return [result['label'] for result in self.client.get(self.url, params).json()['results']]
+
+    def test_requires_login(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url, {'q': 'bio'}).status_code, 302)
+
+    def test_suggests_companies_and_tags(self):
+        Company.objects.create(name='Helix Biologics', focus=['Biotechnology'])
+        labels = self.labels(q='bio', type='company')
+        self.assertEqual(labels[0], 'Biotechnology')
+        self.assertIn('Helix Biologics', labels)
+
+    def test_type_filters_projects(self):
+        Project.objects.create(title='Biofilm Sensors', field='Materials', description='')
+        labels = self.labels(q='bio', type='project')
+        self.assertIn('Biofilm Sensors', labels)
+        self.assertNotIn('Helix Biologics', labels)
+
+    def test_lookups_do_not_query_the_database(self):
+        typeahead.ensure_loaded()
+        with self.assertNumQueries(0):
+            typeahead.suggest('quantum')
+
+    def test_index_follows_saves_and_deletes(self):
+        self.labels(q='x')  # load the index
+        with self.captureOnCommitCallbacks(execute=True):
+            company = Company.objects.create(name='Zephyr Robotics', focus=[])
+        self.assertEqual(self.labels(q='zeph'), ['Zephyr Robotics'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            company.name = 'Aurora Robotics'
+            company.save()
+        self.assertEqual(self.labels(q='zeph'), [])
+        self.assertEqual(self.labels(q='auro'), ['Aurora Robotics'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            company.delete()
+        self.assertEqual(self.labels(q='auro'), [])
+
+
+class TypeaheadVersionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_unloaded_process_still_bumps_the_version(self):
+        index = Typeahead()
+        before = get_version(Typeahead.VERSION_KEY)
+        index.update((COMPANY, 1), [(COMPANY, 1, 'Zephyr Robotics')])
+        self.assertEqual(get_version(Typeahead.VERSION_KEY), before + 1)
+        self.assertIsNone(index._version)
+
+    def test_missed_write_from_another_process_triggers_reload(self):
+        index = Typeahead()
+        index.ensure_loaded()
+        loaded = index._version
+        index.update((COMPANY, 1), [(COMPANY, 1, 'Zephyr Robotics')])
+        self.assertEqual(index._version, loaded + 1)
+
+        Typeahead().update((COMPANY, 2), [])  # another process
+        index.update((COMPANY, 1), [])
+        self.assertEqual(index._version, loaded + 1)
+
+    def test_warm_up_loads_in_the_background(self):
+        index = Typeahead()
+        index.warm_up().join(5)
+        self.assertIsNotNone(index._version)
@@ -0,0 +1,62 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import User
+from discovery_hub.db import EstimatedCountPaginator
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        for i in range(3):
+            User.objects.create_user(username=f'user{i}', email=f'user{i}@example.com', password='password123')
+
+    def count(self, queryset, estimate):
+        with mock.patch('discovery_hub.db.is_postgres', return_value=True), \
+                mock.patch('discovery_hub.db.estimated_row_count', return_value=estimate) as estimated:
+            return EstimatedCountPaginator(queryset, 100).count, estimated
+
+    def test_large_table_uses_estimate(self):
+        count, estimated = self.count(User.objects.order_by('email'), 2_000_000)
+        self.assertEqual(count, 2_000_000)
+        estimated.assert_called_once_with(User, 'default')
+
+    def test_small_or_unanalyzed_table_is_counted(self):
+        self.assertEqual(self.count(User.objects.order_by('email'), 50)[0], 3)
+        self.assertEqual(self.count(User.objects.order_by('email'), None)[0], 3)
+
+    def test_filtered_queryset_is_counted(self):
+        count, estimated = self.count(User.objects.filter(email__icontains='user1').order_by('email'), 2_000_000)
+        self.assertEqual(count, 1)
+        estimated.assert_not_called()
+
+    def test_exact_count_off_postgres(self):
+        self.assertEqual(EstimatedCountPaginator(User.objects.order_by('email'), 100).count, 3)
+
+
+class UserAdminTests(TestCase):
+    def setUp(self):
+        User.objects.create_superuser(username='admin', email='admin@example.com', password='password123')
+        User.objects.create_user(
+            username='ada', email='ada@lab.example', password='password123', first_name='Ada', last_name='Lovelace',
+        )
+        self.client.login(email='admin@example.com', password='password123')
+
+    def test_search(self):
+        response = self.client.get(reverse('admin:accounts_user_changelist'), {'q': 'LOVEL'})
+        self.assertContains(response, 'ada@lab.example')
+        self.assertNotContains(response, 'admin@example.com</a>')
+
+    def test_changelist_counts_once(self):
+        url = reverse('admin:accounts_user_changelist')
+        self.client.get(url, {'q': 'ada'})
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url, {'q': 'ada'})
+        self.assertEqual(response.status_code, 200)
+        counts = [query['sql'] for query in captured.captured_queries if 'COUNT(' in query['sql']]
+        # Only the matches are counted, not the whole table.
+        self.assertEqual(len(counts), 1)
+        self.assertIn('LIKE', counts[0])